@@ -11,6 +11,14 @@ Core features
   • annotate: write a numbered copy with a consistent prefix format.
   • strip: remove previously added numbers safely.
   • map: export a JSON line-map (line → SHA-256 of raw content) for sanity checks.
+    Maps ending in .jsonl (or --format jsonl) are streamed one record per line.
+  • verify: compare FILE against an existing map in one streaming pass and report
+    changed / added / removed line ranges (exit 1 when anything differs).
+
+Large inputs
+  annotate needs the total line count up front (prefix width). Regular files are
+  counted with a fast binary newline scan; stdin is spooled to a temp file while
+  counting. The --map is hashed during the same annotate pass.
 
 Format
   Default each line is prefixed as:  "{LN:>W}│ "  (e.g., "   42│ ") where the bar is U+2502.
@@ -27,8 +35,10 @@ import re
 import sys
 import hashlib
 import ast
+import tempfile
 from dataclasses import dataclass
-from typing import Iterable, Tuple, Any, Dict
+from itertools import zip_longest
+from typing import Iterable, Iterator, Tuple, Any, Dict, Optional
 
 # ----------------------------
 # Core formatting primitives
@@ -79,15 +89,59 @@ def create_text_maybe(path: str) -> io.TextIOBase:
     os.makedirs(os.path.dirname(os.path.abspath(path)) or ".", exist_ok=True)
     return open(path, "w", encoding="utf-8", newline="")
 
+READ_CHUNK = 1 << 20
+
+class LineCounter:
+    """
+    Counts lines from raw byte chunks exactly as text iteration with newline=""
+    splits them (\n, \r\n and lone \r all end a line), without decoding.
+    """
+    def __init__(self) -> None:
+        self.breaks = 0
+        self._prev_cr = False
+        self._last = b""
+
+    def feed(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self.breaks += chunk.count(b"\n") + chunk.count(b"\r") - chunk.count(b"\r\n")
+        if self._prev_cr and chunk[:1] == b"\n":
+            self.breaks -= 1  # \r\n split across two chunks
+        self._prev_cr = chunk[-1:] == b"\r"
+        self._last = chunk[-1:]
+
+    @property
+    def total(self) -> int:
+        unterminated = self._last not in (b"", b"\n", b"\r")
+        return self.breaks + (1 if unterminated else 0)
+
+def open_counted(path: str) -> Tuple[io.TextIOBase, int]:
+    """
+    Return a text handle at the start of PATH plus its line count. Files are
+    counted with a binary newline scan; stdin can't be re-read, so it is spooled
+    to a temp file while counting.
+    """
+    counter = LineCounter()
+    if path != "-":
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(READ_CHUNK), b""):
+                counter.feed(chunk)
+        return open_text_maybe(path), counter.total
+
+    spool = tempfile.TemporaryFile()
+    for chunk in iter(lambda: sys.stdin.buffer.read(READ_CHUNK), b""):
+        counter.feed(chunk)
+        spool.write(chunk)
+    spool.seek(0)
+    return io.TextIOWrapper(spool, encoding="utf-8", newline=""), counter.total
+
 # ----------------------------
 # Core operations
 # ----------------------------
 
 def detect_total_lines(path: str) -> int:
-    total = 0
-    with open_text_maybe(path) as fh:
-        for _ in fh:
-            total += 1
+    fh, total = open_counted(path)
+    fh.close()
     return total
 
 def annotate_lines(lines: Iterable[str], start: int, width: int, style: PrefixStyle) -> Iterable[str]:
@@ -116,6 +170,128 @@ def build_map(lines: Iterable[str]) -> Tuple[int, list]:
         entries.append({"n": ln, "hash": line_hash(line)})
     return total, entries
 
+MAP_JSONL_FORMAT = "linenumberizer.map/jsonl"
+
+def map_format_for(path: str, fmt: str = "auto") -> str:
+    if fmt != "auto":
+        return fmt
+    return "jsonl" if path.lower().endswith(".jsonl") else "json"
+
+class MapWriter:
+    """
+    Streams {n, hash} entries to a line map without holding them in memory.
+      json  — byte-for-byte the classic indent=2 document; header must carry total_lines.
+      jsonl — a header record, one {"n", "hash"} record per line, then {"end": true, "total_lines": N}.
+    """
+    def __init__(self, out: io.TextIOBase, fmt: str, header: Dict[str, Any]):
+        self.out = out
+        self.fmt = fmt
+        self.count = 0
+        if fmt == "jsonl":
+            out.write(json.dumps({"format": MAP_JSONL_FORMAT, **header}) + "\n")
+        else:
+            out.write("{\n")
+            for key, value in header.items():
+                out.write(f"  {json.dumps(key)}: {json.dumps(value)},\n")
+            out.write('  "lines": ')
+
+    def add(self, digest: str) -> None:
+        self.count += 1
+        if self.fmt == "jsonl":
+            self.out.write(f'{{"n": {self.count}, "hash": "{digest}"}}\n')
+        else:
+            self.out.write("[\n" if self.count == 1 else ",\n")
+            self.out.write(f'    {{\n      "n": {self.count},\n      "hash": "{digest}"\n    }}')
+
+    def tap(self, lines: Iterable[str], strip_prefix: bool = True) -> Iterator[str]:
+        """Pass lines through unchanged, recording each one's hash (prefix-stripped unless told otherwise)."""
+        for line in lines:
+            m = strip_prefix and (PIPE_RE.match(line) or COLON_RE.match(line) or BRACK_RE.match(line))
+            self.add(line_hash(line[m.end("prefix"):] if m else line))
+            yield line
+
+    def close(self) -> None:
+        if self.fmt == "jsonl":
+            self.out.write(json.dumps({"end": True, "total_lines": self.count}) + "\n")
+        else:
+            self.out.write("\n  ]\n}" if self.count else "[]\n}")
+
+def open_map(path: str) -> Tuple[Dict[str, Any], Iterator[str]]:
+    """
+    Return a map's header and an iterator over its line hashes, in order. JSONL
+    maps are streamed; classic JSON maps are a single document and get loaded whole.
+    """
+    fh = open_text_maybe(path)
+    first = fh.readline()
+    try:
+        header = json.loads(first)
+    except json.JSONDecodeError:
+        header = None
+    if isinstance(header, dict) and header.get("format") == MAP_JSONL_FORMAT:
+        def stream() -> Iterator[str]:
+            with fh:
+                for line in fh:
+                    record = json.loads(line)
+                    if "hash" in record:
+                        yield record["hash"]
+        return header, stream()
+    with fh:
+        payload = json.loads(first + fh.read())
+    header = {key: value for key, value in payload.items() if key != "lines"}
+    return header, (entry["hash"] for entry in payload.get("lines", []))
+
+def iter_map_hashes(path: str) -> Iterator[str]:
+    return open_map(path)[1]
+
+def map_hashed_text(header: Dict[str, Any]) -> str:
+    """
+    "stripped" — hashed after prefix-like text was stripped ('map');
+    "raw"      — hashed from the unannotated input ('annotate --map').
+    Maps written before the key existed: annotate maps are the ones naming an output.
+    """
+    return header.get("hashed") or ("raw" if "annotated" in header else "stripped")
+
+def strip_annotation(lines: Iterable[str], style: PrefixStyle, width: int, start: int) -> Iterator[str]:
+    """Remove exactly the prefix annotate wrote for each line position; any other text is content."""
+    for n, line in enumerate(lines, start=start):
+        prefix = style.make(n, width)
+        yield line[len(prefix):] if line.startswith(prefix) else line
+
+def verify_lines(lines: Iterable[str], header: Dict[str, Any], raw: bool = False) -> Iterable[str]:
+    """Normalize FILE's lines the way the map's hashes were taken."""
+    if raw:
+        return lines
+    if map_hashed_text(header) == "stripped":
+        return strip_prefix_for_map(lines)
+    style = STYLES.get(header.get("style"))
+    if style is None:
+        return lines
+    return strip_annotation(lines, style, int(header.get("width", 0)), int(header.get("start", 1)))
+
+def diff_against_map(lines: Iterable[str], map_hashes: Iterable[str]) -> Iterator[Tuple[str, int, int]]:
+    """
+    Positional compare of LINES (already normalized with verify_lines) against
+    stored hashes; yields coalesced (kind, first, last) ranges where kind is
+    "changed", "added" (only in the file) or "removed" (only in the map).
+    """
+    current: Optional[list] = None
+    hashes = (line_hash(line) for line in lines)
+    for n, (expected, actual) in enumerate(zip_longest(map_hashes, hashes), start=1):
+        if expected == actual:
+            if current:
+                yield tuple(current)
+                current = None
+            continue
+        kind = "added" if expected is None else "removed" if actual is None else "changed"
+        if current and current[0] == kind:
+            current[2] = n
+        else:
+            if current:
+                yield tuple(current)
+            current = [kind, n, n]
+    if current:
+        yield tuple(current)
+
 # ----------------------------
 # Python AST export
 # ----------------------------
@@ -271,12 +447,26 @@ def build_semantic_model(text: str, depth: str) -> Dict[str, Any]:
 
 def cmd_annotate(args: argparse.Namespace) -> int:
     style = STYLES[args.style]
-    total = detect_total_lines(args.file)
+    inp, total = open_counted(args.file)
     width = max(args.width or 0, len(str(args.start + total - 1)), 3)
 
     out_path = args.out or suggest_out_path(args.file, suffix=numbered_suffix(args.style))
-    with open_text_maybe(args.file) as inp:
-        processed = annotate_lines(inp, start=args.start, width=width, style=style)
+    map_out = map_writer = None
+    if args.map:
+        # Hashed from the raw input during the annotate pass (what stripping the
+        # annotated output would give back) instead of re-reading the output.
+        map_out = create_text_maybe(args.map)
+        map_writer = MapWriter(map_out, map_format_for(args.map, args.map_format), {
+            "source": os.path.abspath(args.file),
+            "annotated": os.path.abspath(out_path if not args.inplace else args.file),
+            "style": args.style,
+            "width": width,
+            "start": args.start,
+            "hashed": "raw",
+            "total_lines": total,
+        })
+    with inp:
+        processed = annotate_lines(map_writer.tap(inp, strip_prefix=False) if map_writer else inp, start=args.start, width=width, style=style)
         if args.dry_run:
             for chunk in processed:
                 sys.stdout.write(chunk)
@@ -294,20 +484,9 @@ def cmd_annotate(args: argparse.Namespace) -> int:
                         out.write(chunk)
                 print(f"Annotated → {out_path} (style={args.style}, width={width})")
 
-    if args.map:
-        with open_text_maybe(out_path if not args.inplace else args.file) as fh:
-            total2, entries = build_map(strip_prefix_for_map(fh))
-        payload = {
-            "source": os.path.abspath(args.file),
-            "annotated": os.path.abspath(out_path if not args.inplace else args.file),
-            "style": args.style,
-            "width": width,
-            "start": args.start,
-            "total_lines": total2,
-            "lines": entries,
-        }
-        with create_text_maybe(args.map) as m:
-            json.dump(payload, m, indent=2)
+    if map_writer:
+        map_writer.close()
+        map_out.close()
         print(f"Map written → {args.map}")
 
     return 0
@@ -342,20 +521,38 @@ def cmd_strip(args: argparse.Namespace) -> int:
 
 
 def cmd_map(args: argparse.Namespace) -> int:
-    with open_text_maybe(args.file) as fh:
-        total, entries = build_map(strip_prefix_for_map(fh))
-    payload = {
-        "source": os.path.abspath(args.file),
-        "total_lines": total,
-        "lines": entries,
-    }
-    out_path = args.out or suggest_out_path(args.file, suffix=".linemap.json")
-    with create_text_maybe(out_path) as out:
-        json.dump(payload, out, indent=2)
+    fmt = map_format_for(args.out or "", args.format)
+    out_path = args.out or suggest_out_path(args.file, suffix=f".linemap.{fmt}")
+    header: Dict[str, Any] = {"source": os.path.abspath(args.file), "hashed": "stripped"}
+    if fmt == "jsonl":
+        inp = open_text_maybe(args.file)
+    else:
+        # The classic document lists total_lines before the entries.
+        inp, header["total_lines"] = open_counted(args.file)
+    with inp, create_text_maybe(out_path) as out:
+        writer = MapWriter(out, fmt, header)
+        for _ in writer.tap(inp):
+            pass
+        writer.close()
     print(f"Map written → {out_path}")
     return 0
 
 
+def cmd_verify(args: argparse.Namespace) -> int:
+    ranges = lines_off = 0
+    header, map_hashes = open_map(args.map)
+    with open_text_maybe(args.file) as fh:
+        for kind, first, last in diff_against_map(verify_lines(fh, header, raw=args.raw), map_hashes):
+            ranges += 1
+            lines_off += last - first + 1
+            print(f"{kind:<8} {first}-{last}" if last != first else f"{kind:<8} {first}")
+    if ranges:
+        print(f"MISMATCH: {args.file} differs from {args.map} ({ranges} range(s), {lines_off} line(s))")
+        return 1
+    print(f"OK: {args.file} matches {args.map}")
+    return 0
+
+
 def cmd_ast(args: argparse.Namespace) -> int:
     """Export a Python AST as JSON. Gracefully handles non-Python inputs."""
     try:
@@ -438,6 +635,7 @@ def build_parser() -> argparse.ArgumentParser:
     a.add_argument("--start", type=int, default=1, help="Starting line number (default: 1)")
     a.add_argument("--width", type=int, default=0, help="Minimum number width (auto if 0)")
     a.add_argument("--map", help="Also write a JSON line map to this path")
+    a.add_argument("--map-format", choices=("auto", "json", "jsonl"), default="auto", help="Map format (auto: jsonl if --map ends in .jsonl)")
     a.add_argument("--dry-run", action="store_true", help="Write to stdout instead of a file")
     a.add_argument("--inplace", action="store_true", help="Replace FILE in-place (writes to temp and moves over)")
     a.set_defaults(func=cmd_annotate)
@@ -453,9 +651,17 @@ def build_parser() -> argparse.ArgumentParser:
     # map
     m = sub.add_parser("map", help="Emit a JSON line→hash map for the (raw) content")
     m.add_argument("file", help="Path to input file or '-' for stdin")
-    m.add_argument("--out", "-o", help="Output path (default: FILE.linemap.json)")
+    m.add_argument("--out", "-o", help="Output path (default: FILE.linemap.json / .jsonl)")
+    m.add_argument("--format", choices=("auto", "json", "jsonl"), default="auto", help="Map format (auto: jsonl if --out ends in .jsonl)")
     m.set_defaults(func=cmd_map)
 
+    # verify
+    v = sub.add_parser("verify", help="Report line ranges where FILE no longer matches MAP")
+    v.add_argument("file", help="Path to input file (raw or annotated) or '-' for stdin")
+    v.add_argument("map", help="Line map written by 'map' or 'annotate --map' (.json or .jsonl)")
+    v.add_argument("--raw", action="store_true", help="Hash FILE's lines as-is; never strip number prefixes")
+    v.set_defaults(func=cmd_verify)
+
     # ast (Python)
     astd = sub.add_parser("ast", help="Export a Python AST (JSON)")
     astd.add_argument("file", help="Path to input file (Python .py recommended)")
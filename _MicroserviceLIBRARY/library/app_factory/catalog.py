@@ -5,11 +5,14 @@ from __future__ import annotations
 import ast
 import hashlib
 import json
+import os
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from .constants import (
     APP_FACTORY_VERSION,
@@ -154,12 +157,20 @@ def sanitize_text_list(value: Any) -> List[str]:
     return [text] if text else []
 
 
+def _parse_module_in_worker(library_root: str, path: str) -> ParsedModule:
+    return CatalogBuilder(library_root=Path(library_root))._parse_module(Path(path))
+
+
 class CatalogBuilder:
-    def __init__(self, library_root: Path | None=None, catalog_db_path: Path | None=None, mapping_report_path: Path | None=None):
+    # Below this many changed modules a process pool costs more than it saves.
+    PARALLEL_PARSE_MIN_MODULES = 16
+
+    def __init__(self, library_root: Path | None=None, catalog_db_path: Path | None=None, mapping_report_path: Path | None=None, parse_workers: Optional[int]=None):
         self.library_root = Path(library_root or LIBRARY_ROOT).resolve()
         self.workspace_root = self.library_root.parent
         self.catalog_db_path = Path(catalog_db_path or DEFAULT_CATALOG_DB_PATH).resolve()
         self.mapping_report_path = Path(mapping_report_path or DEFAULT_MAPPING_REPORT_PATH).resolve()
+        self.parse_workers = parse_workers if parse_workers is not None else (os.cpu_count() or 1)
 
     def build(self, incremental: bool=True) -> Dict[str, Any]:
         self.catalog_db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -174,23 +185,43 @@ class CatalogBuilder:
                     'INSERT OR REPLACE INTO artifacts (artifact_id, parent_artifact_id, source_path, kind, import_key, file_cid, size_bytes, mtime_ns, is_deleted) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)',
                     (row['artifact_id'], row['parent_artifact_id'], row['source_path'], row['kind'], row['import_key'], row['file_cid'], row['size_bytes'], row['mtime_ns']),
                 )
-            current_modules = self._discover_modules()
-            existing_modules = {row['source_path']: dict(row) for row in conn.execute("SELECT artifact_id, source_path, file_cid FROM artifacts WHERE kind='module'")}
-            current_paths = {module.source_path for module in current_modules}
+            module_paths = self._discover_module_paths()
+            existing_modules = {row['source_path']: dict(row) for row in conn.execute("SELECT artifact_id, source_path, file_cid, size_bytes, mtime_ns, is_deleted FROM artifacts WHERE kind='module'")}
+            current_paths = {str(path.resolve()) for path in module_paths}
             changed_count = 0
             unchanged_count = 0
-            for parsed_module in current_modules:
+            # Stat-first precheck: a live module whose size and mtime match the
+            # catalog row is skipped without being read, hashed or parsed.
+            to_parse: List[Path] = []
+            for path in module_paths:
+                existing = existing_modules.get(str(path.resolve()))
+                if incremental and existing and not existing['is_deleted']:
+                    stat = path.stat()
+                    if existing['size_bytes'] == stat.st_size and existing['mtime_ns'] == stat.st_mtime_ns:
+                        unchanged_count += 1
+                        continue
+                to_parse.append(path)
+            affected_artifact_ids: Set[str] = set()
+            resolvers_before = self._dependency_resolvers(conn) if incremental else None
+            for parsed_module in self._parse_modules(to_parse):
                 existing = existing_modules.get(parsed_module.source_path)
-                if incremental and existing and existing['file_cid'] == parsed_module.file_cid:
+                if incremental and existing and not existing['is_deleted'] and existing['file_cid'] == parsed_module.file_cid:
+                    conn.execute('UPDATE artifacts SET size_bytes = ?, mtime_ns = ? WHERE artifact_id = ?', (parsed_module.size_bytes, parsed_module.mtime_ns, existing['artifact_id']))
                     unchanged_count += 1
                     continue
                 changed_count += 1
+                affected_artifact_ids.add(parsed_module.artifact_id)
                 self._upsert_module(conn, parsed_module)
             deleted_paths = [path for path in existing_modules.keys() if path not in current_paths]
             for deleted_path in deleted_paths:
+                if not existing_modules[deleted_path]['is_deleted']:
+                    affected_artifact_ids.add(existing_modules[deleted_path]['artifact_id'])
                 self._tombstone_module(conn, deleted_path)
             self._upsert_packs(conn)
-            self._re_resolve_dependencies(conn)
+            if not incremental:
+                self._re_resolve_dependencies(conn)
+            elif affected_artifact_ids:
+                self._re_resolve_dependencies(conn, affected_artifact_ids, resolvers_before)
             self._write_mapping_report()
             services_indexed = conn.execute('SELECT COUNT(*) FROM services').fetchone()[0]
             endpoints_indexed = conn.execute('SELECT COUNT(*) FROM endpoints').fetchone()[0]
@@ -199,7 +230,7 @@ class CatalogBuilder:
             report = CatalogBuildReport(
                 build_id=build_id,
                 catalog_db_path=str(self.catalog_db_path),
-                scanned_modules=len(current_modules),
+                scanned_modules=len(module_paths),
                 changed_modules=changed_count,
                 unchanged_modules=unchanged_count,
                 deleted_modules=len(deleted_paths),
@@ -249,13 +280,18 @@ class CatalogBuilder:
             })
         return packages
 
-    def _discover_modules(self) -> List[ParsedModule]:
-        modules: List[ParsedModule] = []
-        for path in self.library_root.rglob('*.py'):
-            if path.name == '__init__.py' or self._should_skip_path(path):
-                continue
-            modules.append(self._parse_module(path))
-        return sorted(modules, key=lambda item: item.source_path)
+    def _discover_module_paths(self) -> List[Path]:
+        paths = [path for path in self.library_root.rglob('*.py') if path.name != '__init__.py' and not self._should_skip_path(path)]
+        return sorted(paths, key=lambda item: str(item.resolve()))
+
+    def _parse_modules(self, paths: List[Path]) -> List[ParsedModule]:
+        if self.parse_workers <= 1 or len(paths) < self.PARALLEL_PARSE_MIN_MODULES:
+            return [self._parse_module(path) for path in paths]
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.parse_workers, len(paths))) as pool:
+                return list(pool.map(_parse_module_in_worker, [str(self.library_root)] * len(paths), [str(path) for path in paths], chunksize=8))
+        except (OSError, BrokenProcessPool):
+            return [self._parse_module(path) for path in paths]
 
     def _should_skip_path(self, path: Path) -> bool:
         parts = path.relative_to(self.library_root).parts
@@ -270,6 +306,7 @@ class CatalogBuilder:
         return False
 
     def _parse_module(self, path: Path) -> ParsedModule:
+        stat = path.stat()
         payload = path.read_bytes()
         text = payload.decode('utf-8', errors='ignore')
         tree = ast.parse(text, filename=str(path))
@@ -281,8 +318,8 @@ class CatalogBuilder:
             relative_path=str(relative),
             import_key=module_import_key(path, self.workspace_root),
             file_cid=hash_bytes(payload),
-            size_bytes=path.stat().st_size,
-            mtime_ns=path.stat().st_mtime_ns,
+            size_bytes=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
             layer=self._service_layer_for_path(path),
         )
         for node in tree.body:
@@ -462,20 +499,58 @@ class CatalogBuilder:
                 (pack_id, pack['name'], pack['kind'], pack['version'], json_dumps(pack['manifest']), 'active'),
             )
 
-    def _re_resolve_dependencies(self, conn: sqlite3.Connection) -> None:
+    def _dependency_resolvers(self, conn: sqlite3.Connection) -> Dict[str, Dict[str, str]]:
+        """Name -> id maps a dependency ref is resolved against, in lookup order."""
         artifacts = conn.execute("SELECT artifact_id, source_path, import_key FROM artifacts WHERE kind='module' AND is_deleted = 0").fetchall()
         services = conn.execute('SELECT service_id, artifact_id, class_name, service_name FROM services').fetchall()
-        artifact_by_import: Dict[str, str] = {}
-        artifact_by_stem: Dict[str, str] = {}
+        resolvers: Dict[str, Dict[str, str]] = {'service_class': {}, 'service_name': {}, 'artifact_import': {}, 'artifact_stem': {}}
         for row in artifacts:
-            artifact_by_import[row['import_key']] = row['artifact_id']
-            artifact_by_stem.setdefault(Path(row['source_path']).stem, row['artifact_id'])
-        service_by_class: Dict[str, str] = {}
-        service_by_name: Dict[str, str] = {}
+            resolvers['artifact_import'][row['import_key']] = row['artifact_id']
+            resolvers['artifact_stem'].setdefault(Path(row['source_path']).stem, row['artifact_id'])
         for row in services:
-            service_by_class.setdefault(row['class_name'], row['service_id'])
-            service_by_name.setdefault(row['service_name'], row['service_id'])
-        dependency_rows = conn.execute('SELECT dependency_id, evidence_json, external_name, pack_name FROM dependencies').fetchall()
+            resolvers['service_class'].setdefault(row['class_name'], row['service_id'])
+            resolvers['service_name'].setdefault(row['service_name'], row['service_id'])
+        return resolvers
+
+    def _re_resolve_dependencies(self, conn: sqlite3.Connection, artifact_ids: Optional[Set[str]]=None, resolvers_before: Optional[Dict[str, Dict[str, str]]]=None) -> None:
+        """
+        Resolve dependency refs to services/artifacts. With artifact_ids, only
+        rows that can have changed are revisited: rows owned by those modules
+        (or their services), rows pointing at them, rows still unresolved, and
+        rows whose ref is a name that now maps elsewhere than in
+        resolvers_before (e.g. a new service claiming a name that used to
+        resolve by file stem). Without resolvers_before every row is revisited.
+        """
+        resolvers = self._dependency_resolvers(conn)
+        service_by_class = resolvers['service_class']
+        service_by_name = resolvers['service_name']
+        artifact_by_import = resolvers['artifact_import']
+        artifact_by_stem = resolvers['artifact_stem']
+        if artifact_ids is None or resolvers_before is None:
+            dependency_rows = conn.execute('SELECT dependency_id, evidence_json, external_name, pack_name FROM dependencies').fetchall()
+        else:
+            moved_refs = {
+                name
+                for kind, mapping in resolvers.items()
+                for name in set(mapping) | set(resolvers_before[kind])
+                if mapping.get(name) != resolvers_before[kind].get(name)
+            }
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS affected_artifacts (artifact_id TEXT PRIMARY KEY)')
+            conn.execute('DELETE FROM affected_artifacts')
+            conn.executemany('INSERT OR IGNORE INTO affected_artifacts (artifact_id) VALUES (?)', [(item,) for item in artifact_ids])
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS moved_refs (ref TEXT PRIMARY KEY)')
+            conn.execute('DELETE FROM moved_refs')
+            conn.executemany('INSERT OR IGNORE INTO moved_refs (ref) VALUES (?)', [(item,) for item in moved_refs])
+            dependency_rows = conn.execute('''
+                SELECT dependency_id, evidence_json, external_name, pack_name FROM dependencies
+                WHERE is_resolved = 0
+                   OR src_artifact_id IN (SELECT artifact_id FROM affected_artifacts)
+                   OR dst_artifact_id IN (SELECT artifact_id FROM affected_artifacts)
+                   OR src_service_id IN (SELECT service_id FROM services WHERE artifact_id IN (SELECT artifact_id FROM affected_artifacts))
+                   OR dst_service_id IS NOT NULL AND dst_service_id NOT IN (SELECT service_id FROM services)
+                   OR dst_service_id IN (SELECT service_id FROM services WHERE artifact_id IN (SELECT artifact_id FROM affected_artifacts))
+                   OR TRIM(CAST(json_extract(evidence_json, '$.ref') AS TEXT)) IN (SELECT ref FROM moved_refs)
+            ''').fetchall()
         for row in dependency_rows:
             if row['external_name'] or row['pack_name']:
                 conn.execute('UPDATE dependencies SET is_resolved = 1 WHERE dependency_id = ?', (row['dependency_id'],))
@@ -8,6 +8,7 @@ import os
 import py_compile
 import shutil
 import sqlite3
+import stat
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -25,14 +26,53 @@ from .models import AppBlueprintManifest, ResolvedArtifact, StamperValidationRes
 from .query import LibraryQueryService
 from .ui_schema import UiSchemaCommitService, UiSchemaPreviewService
 
+STAMP_MANIFEST_NAME = '.stamp_manifest.json'
+STAMP_MANIFEST_VERSION = 1
+CAS_BLOB_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def _unlink(path: Path) -> None:
+    """unlink() that also removes read-only files (hardlinked CAS blobs on Windows)."""
+    try:
+        path.unlink()
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        path.unlink()
+
+
+def _replace(src: Path, dst: Path) -> None:
+    """os.replace() that also works when `dst` is read-only (Windows refuses to replace those)."""
+    try:
+        os.replace(src, dst)
+    except PermissionError:
+        if not dst.exists():
+            raise
+        os.chmod(dst, stat.S_IWRITE | stat.S_IREAD)
+        os.replace(src, dst)
+
 
 class AppStamper:
-    def __init__(self, query_service: Optional[LibraryQueryService]=None):
+    """
+    Resolves a blueprint and materializes it into an app directory.
+
+    Stamps are incremental: `.stamp_manifest.json` records, per stamped file,
+    the source and content hash (cid) plus the destination stat. A restamp
+    rewrites only files whose content changed, removes files that are no
+    longer selected, and recompiles only what it rewrote. With `cas_dir` set,
+    vendored sources are stored once in a content-addressed cache and
+    hardlinked into apps when the filesystem allows (copied otherwise).
+    Blobs are read-only and re-checked against their hash before reuse, so
+    a vendored file edited in place is repaired on the next stamp; edit
+    library sources rather than vendored copies.
+    """
+
+    def __init__(self, query_service: Optional[LibraryQueryService]=None, cas_dir: Optional[Path | str]=None):
         self.query_service = query_service or LibraryQueryService()
         self.ui_preview = UiSchemaPreviewService()
         self.ui_commit = UiSchemaCommitService()
         self.library_root = Path(LIBRARY_ROOT).resolve()
         self.workspace_root = Path(WORKSPACE_ROOT).resolve()
+        self.cas_dir = Path(cas_dir).resolve() if cas_dir else None
 
     def stamp(self, manifest_input: AppBlueprintManifest | Dict[str, Any], ui_schema_override: Optional[Dict[str, Any]]=None) -> Dict[str, Any]:
         manifest = manifest_input if isinstance(manifest_input, AppBlueprintManifest) else AppBlueprintManifest.from_dict(manifest_input)
@@ -52,10 +92,13 @@ class AppStamper:
         resolved = self._resolve_manifest(manifest)
         app_dir = Path(manifest.destination).resolve()
         app_dir.mkdir(parents=True, exist_ok=True)
-        self._cleanup_previous_stamp(app_dir, manifest.vendor_mode)
+        previous_entries = self._load_stamp_manifest(app_dir)
+        if previous_entries is None:
+            self._cleanup_previous_stamp(app_dir, manifest.vendor_mode)
+        state = {'app_dir': app_dir, 'previous': previous_entries or {}, 'current': {}, 'changed': []}
         written_files: List[str] = []
         if manifest.vendor_mode == 'static' and resolved['validation'].ok():
-            written_files.extend(self._copy_static_vendor_tree(app_dir, resolved))
+            written_files.extend(self._copy_static_vendor_tree(app_dir, resolved, state))
         settings_path = app_dir / 'settings.json'
         manifest_path = app_dir / 'app_manifest.json'
         requirements_path = app_dir / 'requirements.txt'
@@ -63,31 +106,43 @@ class AppStamper:
         env_path = app_dir / '.env'
         settings_payload = self._build_settings_payload(manifest, resolved, app_dir)
         settings_payload = self._merge_existing_settings(app_dir, settings_payload)
-        manifest_path.write_text(json.dumps(manifest.to_dict(), indent=2), encoding='utf-8')
-        settings_path.write_text(json.dumps(settings_payload, indent=2), encoding='utf-8')
-        requirements_path.write_text('\n'.join(sorted(resolved['external_dependencies'])) + ('\n' if resolved['external_dependencies'] else ''), encoding='utf-8')
-        pyright_path.write_text(json.dumps({'extraPaths': settings_payload['compat_paths']}, indent=2), encoding='utf-8')
-        env_path.write_text('PYTHONPATH=' + os.pathsep.join(settings_payload['compat_paths']) + '\n', encoding='utf-8')
+        self._stamp_text(state, manifest_path, json.dumps(manifest.to_dict(), indent=2))
+        self._stamp_text(state, settings_path, json.dumps(settings_payload, indent=2))
+        self._stamp_text(state, requirements_path, '\n'.join(sorted(resolved['external_dependencies'])) + ('\n' if resolved['external_dependencies'] else ''))
+        self._stamp_text(state, pyright_path, json.dumps({'extraPaths': settings_payload['compat_paths']}, indent=2))
+        self._stamp_text(state, env_path, 'PYTHONPATH=' + os.pathsep.join(settings_payload['compat_paths']) + '\n')
         written_files.extend([str(manifest_path), str(settings_path), str(requirements_path), str(pyright_path), str(env_path)])
-        (app_dir / 'backend.py').write_text(self._build_backend_py(manifest, resolved), encoding='utf-8')
-        (app_dir / 'ui.py').write_text(self._build_ui_py(manifest, resolved), encoding='utf-8')
-        (app_dir / 'app.py').write_text(self._build_app_py(), encoding='utf-8')
+        self._stamp_text(state, app_dir / 'backend.py', self._build_backend_py(manifest, resolved))
+        self._stamp_text(state, app_dir / 'ui.py', self._build_ui_py(manifest, resolved))
+        self._stamp_text(state, app_dir / 'app.py', self._build_app_py())
         written_files.extend([str(app_dir / 'backend.py'), str(app_dir / 'ui.py'), str(app_dir / 'app.py')])
         schema = ui_schema_override if ui_schema_override is not None else self.ui_preview.default_schema(manifest.ui_pack)
-        self.ui_commit.commit(schema, app_dir)
+        if not self._ui_schema_matches(app_dir, schema):
+            self.ui_commit.commit(schema, app_dir)
+            state['changed'].append(str(app_dir / 'ui_schema.json'))
         written_files.append(str(app_dir / 'ui_schema.json'))
-        compile_results = self._compile_tree(app_dir)
+        removed_files = self._remove_deselected(state)
+        compile_results = self._compile_tree(app_dir, state)
         resolved['validation'].compile_results = compile_results
         if resolved['validation'].ok() and compile_results.get('errors'):
             resolved['validation'].errors.extend(compile_results['errors'])
-        lock_path = None
+        lock_path = app_dir / '.stamper_lock.json'
         if resolved['validation'].ok():
-            lock_path = app_dir / '.stamper_lock.json'
-            lock_path.write_text(json.dumps(self._build_lockfile(manifest, resolved, app_dir), indent=2), encoding='utf-8')
+            lock_payload = self._build_lockfile(manifest, resolved, app_dir)
+            if not self._lock_matches(lock_path, lock_payload):
+                lock_path.write_text(json.dumps(lock_payload, indent=2), encoding='utf-8')
+                state['changed'].append(str(lock_path))
             written_files.append(str(lock_path))
+        else:
+            if lock_path.exists():
+                lock_path.unlink()
+            lock_path = None
+        self._save_stamp_manifest(state)
         return {
             'app_dir': str(app_dir),
             'written_files': written_files,
+            'changed_files': state['changed'],
+            'removed_files': removed_files,
             'validation': resolved['validation'].to_dict(),
             'external_dependencies': sorted(resolved['external_dependencies']),
             'resolved_artifacts': [artifact.to_dict() for artifact in resolved['resolved_artifacts'].values()],
@@ -462,10 +517,11 @@ class AppStamper:
             return
         resolved_artifacts[artifact_id] = ResolvedArtifact(artifact_id=artifact_id, source_path=source_path, target_path='', file_cid=file_cid, materialization_mode=materialization_mode, import_key=import_key, class_name=class_name, service_name=service_name)
 
-    def _copy_static_vendor_tree(self, app_dir: Path, resolved: Dict[str, Any]) -> List[str]:
+    def _copy_static_vendor_tree(self, app_dir: Path, resolved: Dict[str, Any], state: Dict[str, Any]) -> List[str]:
         vendor_root = app_dir / 'vendor'
         written: List[str] = []
         support_files = self._required_static_support_files(resolved)
+        known_cids = {str(Path(item.source_path)): item.file_cid for item in resolved['resolved_artifacts'].values()}
         all_sources = support_files + [Path(item.source_path) for item in resolved['resolved_artifacts'].values()]
         seen: set[str] = set()
         for source in all_sources:
@@ -474,8 +530,7 @@ class AppStamper:
             seen.add(str(source))
             relative = source.relative_to(self.workspace_root)
             target = vendor_root / relative
-            target.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(source, target)
+            self._stamp_copy(state, source, target, known_cids.get(str(source), ''))
             written.append(str(target))
             if source.suffix == '.py' and str(source).startswith(str(self.library_root)):
                 for parent in source.parents:
@@ -486,8 +541,7 @@ class AppStamper:
                         seen.add(str(init_file))
                         rel_init = init_file.relative_to(self.workspace_root)
                         target_init = vendor_root / rel_init
-                        target_init.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(init_file, target_init)
+                        self._stamp_copy(state, init_file, target_init)
                         written.append(str(target_init))
         for artifact in resolved['resolved_artifacts'].values():
             relative = Path(artifact.source_path).relative_to(self.workspace_root)
@@ -495,6 +549,141 @@ class AppStamper:
             artifact.materialization_mode = 'static'
         return written
 
+    def _load_stamp_manifest(self, app_dir: Path) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Entries from the previous stamp, or None when the app predates stamp manifests."""
+        path = app_dir / STAMP_MANIFEST_NAME
+        if not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding='utf-8'))
+        except Exception:
+            return None
+        if payload.get('version') != STAMP_MANIFEST_VERSION or not isinstance(payload.get('files'), dict):
+            return None
+        return payload['files']
+
+    def _save_stamp_manifest(self, state: Dict[str, Any]) -> None:
+        payload = {'version': STAMP_MANIFEST_VERSION, 'files': dict(sorted(state['current'].items()))}
+        self._write_atomic(state['app_dir'] / STAMP_MANIFEST_NAME, json.dumps(payload, indent=2).encode('utf-8'))
+
+    def _destination_unchanged(self, entry: Optional[Dict[str, Any]], target: Path) -> bool:
+        if not entry:
+            return False
+        try:
+            stat = target.stat()
+        except OSError:
+            return False
+        return stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns')
+
+    def _record(self, state: Dict[str, Any], target: Path, entry: Dict[str, Any], changed: bool) -> None:
+        stat = target.stat()
+        entry.update({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+        if changed:
+            entry['compiled'] = False
+            state['changed'].append(str(target))
+        state['current'][target.relative_to(state['app_dir']).as_posix()] = entry
+
+    def _stamp_text(self, state: Dict[str, Any], target: Path, text: str) -> None:
+        """Writes generated content unless the previous stamp already left identical bytes there."""
+        data = text.encode('utf-8')
+        cid = hashlib.sha256(data).hexdigest()
+        previous = state['previous'].get(target.relative_to(state['app_dir']).as_posix())
+        if previous and previous.get('cid') == cid and self._destination_unchanged(previous, target):
+            self._record(state, target, dict(previous), changed=False)
+            return
+        self._write_atomic(target, data)
+        self._record(state, target, {'cid': cid, 'source': 'generated'}, changed=True)
+
+    def _stamp_copy(self, state: Dict[str, Any], source: Path, target: Path, source_cid: str='') -> None:
+        """Vendors `source` at `target`; skips the copy when the source cid and the destination are unchanged."""
+        source_stat = source.stat()
+        previous = state['previous'].get(target.relative_to(state['app_dir']).as_posix())
+        if previous and not source_cid and previous.get('source') == str(source) and previous.get('source_size') == source_stat.st_size and previous.get('source_mtime_ns') == source_stat.st_mtime_ns:
+            source_cid = previous.get('cid', '')
+        cid = source_cid or self._hash_file(source)
+        entry = {'cid': cid, 'source': str(source), 'source_size': source_stat.st_size, 'source_mtime_ns': source_stat.st_mtime_ns}
+        if previous and previous.get('cid') == cid and self._destination_unchanged(previous, target):
+            entry['compiled'] = previous.get('compiled', False)
+            self._record(state, target, entry, changed=False)
+            return
+        entry['link'] = self._materialize(source, cid, target)
+        self._record(state, target, entry, changed=True)
+
+    def _materialize(self, source: Path, cid: str, target: Path) -> str:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f'.{target.name}.stamp-tmp')
+        if self.cas_dir is not None:
+            blob = self._cas_blob(source, cid)
+            try:
+                if tmp.exists():
+                    _unlink(tmp)
+                os.link(blob, tmp)
+                _replace(tmp, target)
+                return 'hardlink'
+            except OSError:
+                source = blob
+        shutil.copy2(source, tmp)
+        _replace(tmp, target)
+        return 'copy'
+
+    def _cas_blob(self, source: Path, cid: str) -> Path:
+        """Read-only cache copy of `source`; a blob whose bytes no longer hash to `cid` is rewritten."""
+        blob = self.cas_dir / cid[:2] / cid
+        if not (blob.exists() and self._hash_file(blob) == cid):
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_name(f'{cid}.{os.getpid()}.tmp')
+            shutil.copyfile(source, tmp)
+            _replace(tmp, blob)
+        os.chmod(blob, CAS_BLOB_MODE)
+        return blob
+
+    def _write_atomic(self, target: Path, data: bytes) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f'.{target.name}.stamp-tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+    def _lock_matches(self, lock_path: Path, lock_payload: Dict[str, Any]) -> bool:
+        """True when the existing lock differs at most in catalog_build_id (a no-op catalog rebuild)."""
+        if not lock_path.exists():
+            return False
+        try:
+            existing = json.loads(lock_path.read_text(encoding='utf-8'))
+        except Exception:
+            return False
+        return {**existing, 'catalog_build_id': None} == {**lock_payload, 'catalog_build_id': None}
+
+    def _ui_schema_matches(self, app_dir: Path, schema: Dict[str, Any]) -> bool:
+        path = app_dir / 'ui_schema.json'
+        if not path.exists():
+            return False
+        try:
+            return json.loads(path.read_text(encoding='utf-8')) == schema
+        except Exception:
+            return False
+
+    def _remove_deselected(self, state: Dict[str, Any]) -> List[str]:
+        """Deletes files from the previous stamp that this stamp no longer produces, plus their bytecode."""
+        app_dir: Path = state['app_dir']
+        removed: List[str] = []
+        for relative in sorted(set(state['previous']) - set(state['current'])):
+            target = app_dir / relative
+            if target.exists():
+                _unlink(target)
+                removed.append(str(target))
+            pycache = target.parent / '__pycache__'
+            if target.suffix == '.py' and pycache.is_dir():
+                for compiled in pycache.glob(f'{target.stem}.*.pyc'):
+                    compiled.unlink()
+            parent = target.parent
+            while parent != app_dir and parent.is_dir():
+                leftovers = [child for child in parent.iterdir() if not (child.name == '__pycache__' and child.is_dir() and not any(child.iterdir()))]
+                if leftovers:
+                    break
+                shutil.rmtree(parent)
+                parent = parent.parent
+        return removed
+
     def _required_static_support_files(self, resolved: Dict[str, Any]) -> List[Path]:
         files = [self.library_root / '__init__.py', self.library_root / 'microservice_std_lib.py', self.library_root / 'base_service.py', self.library_root / 'document_utils.py']
         if any(service['layer'] == 'grouped' or service['class_name'] in {'Blake3HashMS', 'MerkleRootMS', 'VerbatimStoreMS', 'TemporalChainMS', 'DagOpsMS', 'IntervalIndexMS', 'DirectedFlowMS', 'SemanticSearchMS', 'LexicalIndexMS', 'OntologyMS', 'PropertyGraphMS', 'IdentityAnchorMS', 'LayerHealthMS', 'WalkerTraceMS', 'CrossLayerResolverMS', 'ManifoldProjectorMS', 'HypergraphMS'} for service in resolved['resolved_services'].values()):
@@ -576,13 +765,21 @@ class AppStamper:
             return ''
         return candidate
 
-    def _compile_tree(self, app_dir: Path) -> Dict[str, Any]:
+    def _compile_tree(self, app_dir: Path, state: Optional[Dict[str, Any]]=None) -> Dict[str, Any]:
+        """Byte-compiles the app; files the stamp manifest knows compiled cleanly and did not change are skipped."""
         compiled: List[str] = []
         errors: List[str] = []
+        entries = (state or {}).get('current', {})
         for path in app_dir.rglob('*.py'):
+            entry = entries.get(path.relative_to(app_dir).as_posix())
+            if entry is not None and entry.get('compiled'):
+                compiled.append(str(path))
+                continue
             try:
                 py_compile.compile(str(path), doraise=True)
                 compiled.append(str(path))
+                if entry is not None:
+                    entry['compiled'] = True
             except Exception as exc:
                 errors.append(f'{path}: {exc}')
         return {'compiled': compiled, 'errors': errors}
@@ -1,40 +1,27 @@
 """
 managers.py
 Six manager classes - one per group.
-Each manager owns a ServiceRegistry, instantiates its services, and registers them.
+Each manager owns a ServiceRegistry and registers its services as lazy proxies
+that import and construct the real service on first use.
 Managers are what the orchestrator layer talks to.
 """
 
+from __future__ import annotations
+
+import ast
 import time
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 
 try:
-    from ..orchestrators.microservice_std_lib_registry import ServiceRegistry
-    from ..microservices.grouped.storage_group import (
-        Blake3HashMS,
-        MerkleRootMS,
-        VerbatimStoreMS,
-        TemporalChainMS,
-    )
-    from ..microservices.grouped.structure_group import (
-        DagOpsMS,
-        IntervalIndexMS,
-        DirectedFlowMS,
-    )
-    from ..microservices.grouped.meaning_relation_observability_manifold_groups import (
-        SemanticSearchMS,
-        LexicalIndexMS,
-        OntologyMS,
-        PropertyGraphMS,
-        IdentityAnchorMS,
-        LayerHealthMS,
-        WalkerTraceMS,
-        CrossLayerResolverMS,
-        ManifoldProjectorMS,
-        HypergraphMS,
-    )
+    from ..orchestrators.microservice_std_lib_registry import LazyService, ServiceRegistry
+    _GROUPED_PACKAGE = __package__.rpartition(".")[0] + ".microservices.grouped"
 except ImportError:
-    from library.orchestrators.microservice_std_lib_registry import ServiceRegistry
+    from library.orchestrators.microservice_std_lib_registry import LazyService, ServiceRegistry
+    _GROUPED_PACKAGE = "library.microservices.grouped"
+
+if TYPE_CHECKING:
     from library.microservices.grouped.storage_group import (
         Blake3HashMS,
         MerkleRootMS,
@@ -59,19 +46,76 @@ except ImportError:
         HypergraphMS,
     )
 
+_STORAGE = "storage_group"
+_STRUCTURE = "structure_group"
+_GROUPS = "meaning_relation_observability_manifold_groups"
+_GROUPED_DIR = Path(__file__).resolve().parent.parent / "microservices" / "grouped"
+_LAZY_META_KEYS = ("version", "tags", "capabilities")
+
+
+@lru_cache(maxsize=None)
+def _static_service_metadata(module: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read each class's @service_metadata literals from a grouped module's source
+    without importing it, so lazy registry entries carry real version/tags.
+    """
+    try:
+        tree = ast.parse((_GROUPED_DIR / f"{module}.py").read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return {}
+    found: Dict[str, Dict[str, Any]] = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for deco in node.decorator_list:
+            if not (isinstance(deco, ast.Call) and getattr(deco.func, "id", None) == "service_metadata"):
+                continue
+            meta = {}
+            for kw in deco.keywords:
+                if kw.arg in _LAZY_META_KEYS:
+                    try:
+                        meta[kw.arg] = ast.literal_eval(kw.value)
+                    except ValueError:
+                        pass
+            found[node.name] = meta
+    return found
+
 
 class BaseManager:
-    """Shared base - all managers expose registry, health, and service lookup."""
+    """
+    Shared base - all managers expose registry, health, and service lookup.
+    Services are registered as LazyService proxies: nothing is imported or
+    constructed until a service is first used (or named in warm_up).
+    """
 
     GROUP_NAME = "base"
+    # (class name, module inside microservices.grouped)
+    SERVICES: Tuple[Tuple[str, str], ...] = ()
 
-    def __init__(self):
+    def __init__(self, warm_up: Optional[Iterable[str]] = None):
         self.start_time = time.time()
         self.registry = ServiceRegistry()
         self._boot()
+        if warm_up:
+            self.warm_up(warm_up)
 
     def _boot(self):
-        raise NotImplementedError
+        for class_name, module in self.SERVICES:
+            meta = _static_service_metadata(module).get(class_name, {})
+            self.registry.register_lazy(
+                class_name, f"{_GROUPED_PACKAGE}.{module}", group=self.GROUP_NAME, **meta
+            )
+
+    def warm_up(self, names: Iterable[str]) -> List[str]:
+        """Construct the named services now; returns the ones this manager owns."""
+        warmed = []
+        for name in names:
+            svc = self.get(name)
+            if isinstance(svc, LazyService):
+                svc.materialize()
+            if svc is not None:
+                warmed.append(name)
+        return warmed
 
     def get(self, name: str) -> Optional[Any]:
         return self.registry.get(name)
@@ -82,14 +126,18 @@ class BaseManager:
     def list_services(self) -> List[Dict[str, Any]]:
         return self.registry.list_all()
 
+    def startup_profile(self) -> List[Dict[str, Any]]:
+        return self.registry.startup_profile()
+
 
 class StorageManager(BaseManager):
     GROUP_NAME = "storage"
-
-    def _boot(self):
-        services = [Blake3HashMS(), MerkleRootMS(), VerbatimStoreMS(), TemporalChainMS()]
-        for svc in services:
-            svc.register(self.registry, group=self.GROUP_NAME)
+    SERVICES = (
+        ("Blake3HashMS", _STORAGE),
+        ("MerkleRootMS", _STORAGE),
+        ("VerbatimStoreMS", _STORAGE),
+        ("TemporalChainMS", _STORAGE),
+    )
 
     @property
     def hasher(self) -> Blake3HashMS:
@@ -110,11 +158,11 @@ class StorageManager(BaseManager):
 
 class StructureManager(BaseManager):
     GROUP_NAME = "structure"
-
-    def _boot(self):
-        services = [DagOpsMS(), IntervalIndexMS(), DirectedFlowMS()]
-        for svc in services:
-            svc.register(self.registry, group=self.GROUP_NAME)
+    SERVICES = (
+        ("DagOpsMS", _STRUCTURE),
+        ("IntervalIndexMS", _STRUCTURE),
+        ("DirectedFlowMS", _STRUCTURE),
+    )
 
     @property
     def dag(self) -> DagOpsMS:
@@ -131,11 +179,11 @@ class StructureManager(BaseManager):
 
 class MeaningManager(BaseManager):
     GROUP_NAME = "meaning"
-
-    def _boot(self):
-        services = [SemanticSearchMS(), LexicalIndexMS(), OntologyMS()]
-        for svc in services:
-            svc.register(self.registry, group=self.GROUP_NAME)
+    SERVICES = (
+        ("SemanticSearchMS", _GROUPS),
+        ("LexicalIndexMS", _GROUPS),
+        ("OntologyMS", _GROUPS),
+    )
 
     @property
     def semantic(self) -> SemanticSearchMS:
@@ -152,11 +200,10 @@ class MeaningManager(BaseManager):
 
 class RelationManager(BaseManager):
     GROUP_NAME = "relation"
-
-    def _boot(self):
-        services = [PropertyGraphMS(), IdentityAnchorMS()]
-        for svc in services:
-            svc.register(self.registry, group=self.GROUP_NAME)
+    SERVICES = (
+        ("PropertyGraphMS", _GROUPS),
+        ("IdentityAnchorMS", _GROUPS),
+    )
 
     @property
     def property_graph(self) -> PropertyGraphMS:
@@ -169,11 +216,10 @@ class RelationManager(BaseManager):
 
 class ObservabilityManager(BaseManager):
     GROUP_NAME = "observability"
-
-    def _boot(self):
-        services = [LayerHealthMS(), WalkerTraceMS()]
-        for svc in services:
-            svc.register(self.registry, group=self.GROUP_NAME)
+    SERVICES = (
+        ("LayerHealthMS", _GROUPS),
+        ("WalkerTraceMS", _GROUPS),
+    )
 
     @property
     def health_monitor(self) -> LayerHealthMS:
@@ -192,11 +238,11 @@ class ObservabilityManager(BaseManager):
 
 class ManifoldManager(BaseManager):
     GROUP_NAME = "manifold"
-
-    def _boot(self):
-        services = [CrossLayerResolverMS(), ManifoldProjectorMS(), HypergraphMS()]
-        for svc in services:
-            svc.register(self.registry, group=self.GROUP_NAME)
+    SERVICES = (
+        ("CrossLayerResolverMS", _GROUPS),
+        ("ManifoldProjectorMS", _GROUPS),
+        ("HypergraphMS", _GROUPS),
+    )
 
     @property
     def resolver(self) -> CrossLayerResolverMS:
@@ -4,9 +4,12 @@ ENTRY_POINT: _FingerprintScannerMS.py
 INTERNAL_DEPENDENCIES: microservice_std_lib
 EXTERNAL_DEPENDENCIES: None
 """
+import fnmatch
 import hashlib
 import os
 import logging
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any, Dict, List, Set, Optional, Tuple
 from microservice_std_lib import service_metadata, service_endpoint
@@ -15,16 +18,26 @@ DEFAULT_IGNORE_DIRS = {'node_modules', '.git', '__pycache__', '.venv', 'venv', '
 DEFAULT_IGNORE_FILES = {'.DS_Store', 'Thumbs.db', '*.log', '*.tmp', '*.lock'}
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 log = logging.getLogger('Fingerprint')
+HASH_BLOCK_SIZE = 1024 * 1024
 
-@service_metadata(name='FingerprintScannerMS', version='1.0.0', description='Scans a directory tree and generates a deterministic SHA-256 fingerprint.', tags=['scanning', 'integrity', 'hashing'], capabilities=['filesystem:read'], side_effects=['filesystem:read'], internal_dependencies=['microservice_std_lib'], external_dependencies=[])
+@service_metadata(name='FingerprintScannerMS', version='1.1.0', description='Scans a directory tree and generates a deterministic SHA-256 fingerprint.', tags=['scanning', 'integrity', 'hashing'], capabilities=['filesystem:read', 'db:sqlite'], side_effects=['filesystem:read', 'db:write'], internal_dependencies=['microservice_std_lib'], external_dependencies=[])
 class FingerprintScannerMS:
     """
     The Detective: Scans a directory tree and generates a deterministic
     'Fingerprint' (SHA-256 Merkle Root) representing its exact state.
+
+    Directories are listed and files hashed on a bounded thread pool
+    (config['max_workers']), reading HASH_BLOCK_SIZE blocks at a time.
+    With config['cache_db'] set, digests are kept in SQLite keyed by
+    (path, size, mtime_ns, inode); files whose stat still matches are not
+    read at all, so rescanning an unchanged tree costs one stat per file.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]]=None):
         self.config = config or {}
+        self.max_workers = self.config.get('max_workers', min(32, (os.cpu_count() or 1) * 4))
+        self.block_size = self.config.get('block_size', HASH_BLOCK_SIZE)
+        self.cache_db = self.config.get('cache_db')
 
     @service_endpoint(inputs={'root_path': 'str'}, outputs={'state': 'Dict[str, Any]'}, description='Scans the project and returns a comprehensive state object (hashes + Merkle root).', tags=['scanning', 'read'], side_effects=['filesystem:read'])
     def scan_project(self, root_path: str) -> Dict[str, Any]:
@@ -34,20 +47,63 @@ class FingerprintScannerMS:
         root = Path(root_path).resolve()
         if not root.exists():
             raise FileNotFoundError(f'Path not found: {root}')
+        cached = self._load_cache(root)
         file_map = {}
-        for path in sorted(root.rglob('*')):
-            if path.is_file():
-                if self._should_ignore(path, root):
-                    continue
-                rel_path = str(path.relative_to(root)).replace('\\', '/')
-                file_hash = self._hash_file(path)
+        fresh: List[Tuple[str, int, int, int, str]] = []
+        cache_hits = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            files = self._walk(root, pool)
+            to_hash = []
+            for abs_path, rel_path, stat in files:
+                key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+                hit = cached.get(abs_path)
+                if hit is not None and hit[0] == key:
+                    file_map[rel_path] = hit[1]
+                    cache_hits += 1
+                else:
+                    to_hash.append((abs_path, rel_path, key))
+            digests = pool.map(lambda item: self._hash_file(Path(item[0])), to_hash)
+            for (abs_path, rel_path, key), file_hash in zip(to_hash, digests):
                 if file_hash:
                     file_map[rel_path] = file_hash
+                    fresh.append((abs_path, *key, file_hash))
+        self._save_cache(root, fresh, {abs_path for abs_path, _, _ in files})
         sorted_hashes = [file_map[p] for p in sorted(file_map.keys())]
         combined_data = ''.join(sorted_hashes).encode('utf-8')
         project_fingerprint = hashlib.sha256(combined_data).hexdigest()
-        log.info(f'Scanned {len(file_map)} files. Fingerprint: {project_fingerprint[:8]}...')
-        return {'root': str(root), 'project_fingerprint': project_fingerprint, 'file_hashes': file_map, 'file_count': len(file_map)}
+        log.info(f'Scanned {len(file_map)} files ({cache_hits} cached, {len(to_hash)} hashed). Fingerprint: {project_fingerprint[:8]}...')
+        return {'root': str(root), 'project_fingerprint': project_fingerprint, 'file_hashes': file_map, 'file_count': len(file_map), 'cache_hits': cache_hits, 'hashed': len(to_hash)}
+
+    def _walk(self, root: Path, pool: ThreadPoolExecutor) -> List[Tuple[str, str, os.stat_result]]:
+        """Lists directories concurrently; ignored directories are pruned instead of walked."""
+        files: List[Tuple[str, str, os.stat_result]] = []
+        pending = {pool.submit(self._list_dir, str(root))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                subdirs, dir_files = future.result()
+                files.extend(dir_files)
+                pending.update(pool.submit(self._list_dir, subdir) for subdir in subdirs)
+        # join() adds a separator unless root already ends in one ('/' or 'C:\\').
+        root_prefix = len(os.path.join(str(root), ''))
+        return [(abs_path, abs_path[root_prefix:].replace('\\', '/'), stat) for abs_path, stat in files]
+
+    def _list_dir(self, path: str) -> Tuple[List[str], List[Tuple[str, os.stat_result]]]:
+        subdirs, files = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in DEFAULT_IGNORE_DIRS:
+                                subdirs.append(entry.path)
+                        elif entry.is_file() and not self._should_ignore_name(entry.name):
+                            files.append((entry.path, entry.stat()))
+                    except OSError:
+                        log.warning(f'Could not stat: {entry.path}')
+        except (PermissionError, OSError):
+            log.warning(f'Could not list: {path}')
+        return subdirs, files
 
     def _should_ignore(self, path: Path, root: Path) -> bool:
         """Checks path against exclusion lists."""
@@ -56,23 +112,61 @@ class FingerprintScannerMS:
             for part in rel_parts[:-1]:
                 if part in DEFAULT_IGNORE_DIRS:
                     return True
-            import fnmatch
-            name = path.name
-            if name in DEFAULT_IGNORE_FILES:
-                return True
-            if any((fnmatch.fnmatch(name, pat) for pat in DEFAULT_IGNORE_FILES)):
-                return True
-            return False
+            return self._should_ignore_name(path.name)
         except ValueError:
             return True
 
+    def _should_ignore_name(self, name: str) -> bool:
+        if name in DEFAULT_IGNORE_FILES:
+            return True
+        return any((fnmatch.fnmatch(name, pat) for pat in DEFAULT_IGNORE_FILES))
+
     def _hash_file(self, path: Path) -> Optional[str]:
         try:
-            content = path.read_bytes()
-            return hashlib.sha256(content).hexdigest()
+            digest = hashlib.sha256()
+            with open(path, 'rb') as handle:
+                for block in iter(lambda: handle.read(self.block_size), b''):
+                    digest.update(block)
+            return digest.hexdigest()
         except (PermissionError, OSError):
             log.warning(f'Could not read/hash: {path}')
             return None
+
+    def _cache_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.cache_db)
+        conn.execute('CREATE TABLE IF NOT EXISTS file_hashes (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, inode INTEGER NOT NULL, digest TEXT NOT NULL)')
+        return conn
+
+    @staticmethod
+    def _path_bounds(root: Path) -> Tuple[str, str]:
+        # os.path.join(root, '') adds a separator only when missing, so '/' stays '/'.
+        prefix = os.path.join(str(root), '')
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    def _load_cache(self, root: Path) -> Dict[str, Tuple[Tuple[int, int, int], str]]:
+        if not self.cache_db:
+            return {}
+        low, high = self._path_bounds(root)
+        conn = self._cache_conn()
+        try:
+            rows = conn.execute('SELECT path, size, mtime_ns, inode, digest FROM file_hashes WHERE path >= ? AND path < ?', (low, high))
+            return {path: ((size, mtime_ns, inode), digest) for path, size, mtime_ns, inode, digest in rows}
+        finally:
+            conn.close()
+
+    def _save_cache(self, root: Path, fresh: List[Tuple[str, int, int, int, str]], seen: Set[str]) -> None:
+        if not self.cache_db:
+            return
+        low, high = self._path_bounds(root)
+        conn = self._cache_conn()
+        try:
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, inode, digest) VALUES (?, ?, ?, ?, ?)', fresh)
+                stale = [(path,) for (path,) in conn.execute('SELECT path FROM file_hashes WHERE path >= ? AND path < ?', (low, high)) if path not in seen]
+                conn.executemany('DELETE FROM file_hashes WHERE path = ?', stale)
+        finally:
+            conn.close()
+
     @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float'}, description='Standardized health check for service status.', tags=['diagnostic', 'health'])
     def get_health(self):
         """Returns the operational status of the service."""
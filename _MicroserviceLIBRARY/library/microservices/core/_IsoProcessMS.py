@@ -1,56 +1,251 @@
 import multiprocessing as mp
 import logging
 import logging.handlers
+import os
+import threading
 import time
 import queue
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from microservice_std_lib import service_metadata, service_endpoint
 
+def _configure_worker_logging(log_queue: mp.Queue) -> logging.Logger:
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    for h in root.handlers[:]:
+        root.removeHandler(h)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    return logging.getLogger('IsoWorker')
+
+def _load_model(config: Dict[str, Any], log: logging.Logger) -> str:
+    """Stand-in for the expensive part of worker start-up (heavy imports + model load)."""
+    log.info('Loading heavy libraries (Torch/Transformers)...')
+    time.sleep(config.get('load_delay', 0.2))
+    model_name = config.get('model_name', 'default-model')
+    log.info(f"Initializing model '{model_name}'...")
+    return model_name
+
+def _run_payload(model_name: str, payload: Any, config: Dict[str, Any], log: logging.Logger) -> str:
+    for i in range(1, 4):
+        time.sleep(config.get('chunk_delay', 0.3))
+        log.info(f'Processing chunk {i}/3...')
+    return f'Processed({payload}) via {model_name}'
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size in MB, or None if it cannot be read (the RSS ceiling is then skipped)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        # Linux without psutil: resident pages are the second field of statm.
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
 def _isolated_worker(result_queue: mp.Queue, log_queue: mp.Queue, payload: Any, config: Dict[str, Any]):
     """
     Entry point for the child process.
     Configures a logging handler to send records back to the parent.
     Note: Must remain top-level for multiprocessing pickling compatibility.
     """
-    root = logging.getLogger()
-    root.setLevel(logging.INFO)
-    for h in root.handlers[:]:
-        root.removeHandler(h)
-    qh = logging.handlers.QueueHandler(log_queue)
-    root.addHandler(qh)
-    log = logging.getLogger('IsoWorker')
+    log = _configure_worker_logging(log_queue)
     try:
         log.info(f'Worker PID {mp.current_process().pid} started.')
-        log.info('Loading heavy libraries (Torch/Transformers)...')
-        time.sleep(0.2)
-        model_name = config.get('model_name', 'default-model')
-        log.info(f"Initializing model '{model_name}'...")
-        for i in range(1, 4):
-            time.sleep(0.3)
-            log.info(f'Processing chunk {i}/3...')
-        processed_data = f'Processed({payload}) via {model_name}'
+        model_name = _load_model(config, log)
+        processed_data = _run_payload(model_name, payload, config, log)
         log.info('Work complete. Returning result.')
         result_queue.put({'success': True, 'data': processed_data})
     except Exception as e:
         log.exception('Critical failure in worker process.')
         result_queue.put({'success': False, 'error': str(e)})
 
-@service_metadata(name='IsoProcess', version='1.0.0', description='Spawns isolated processes with real-time logging feedback.', tags=['process', 'isolation', 'safety'], capabilities=['process:spawn'], internal_dependencies=['microservice_std_lib'], external_dependencies=[], side_effects=['process:spawn'])
+def _pooled_worker(task_queue: mp.Queue, result_queue: mp.Queue, log_queue: mp.Queue):
+    """
+    Entry point for a warm pool worker. Loops over tasks until it receives
+    None, keeping loaded models (keyed by model_name) alive between payloads.
+    Note: Must remain top-level for multiprocessing pickling compatibility.
+    """
+    log = _configure_worker_logging(log_queue)
+    log.info(f'Pool worker PID {mp.current_process().pid} started.')
+    models: Dict[str, str] = {}
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        payload, config = task
+        try:
+            key = config.get('model_name', 'default-model')
+            if key not in models:
+                models[key] = _load_model(config, log)
+            packet = {'success': True, 'data': _run_payload(models[key], payload, config, log)}
+        except Exception as e:
+            log.exception('Task failed in pool worker.')
+            packet = {'success': False, 'error': str(e)}
+        packet['rss_mb'] = _rss_mb()
+        result_queue.put(packet)
+
+class _WarmWorker:
+    """One pooled child process with private task/result queues, so a stuck task can be killed without touching its siblings."""
+
+    def __init__(self, ctx, log_queue: mp.Queue):
+        self.task_queue = ctx.Queue()
+        self.result_queue = ctx.Queue()
+        self.process = ctx.Process(target=_pooled_worker, args=(self.task_queue, self.result_queue, log_queue), daemon=True)
+        self.process.start()
+        self.tasks_done = 0
+        self.rss_mb: Optional[float] = None
+
+    def stop(self, timeout: float=5.0):
+        if self.process.is_alive():
+            try:
+                self.task_queue.put(None)
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+class _WarmPool:
+    """N reusable isolated workers; recycled after max_tasks or above max_rss_mb."""
+
+    def __init__(self, size: int, max_tasks: int, max_rss_mb: Optional[float], log: logging.Logger):
+        self.ctx = mp.get_context('spawn')
+        self.size = size
+        self.max_tasks = max_tasks
+        self.max_rss_mb = max_rss_mb
+        self.log = log
+        self.log_queue = self.ctx.Queue()
+        self.listener = logging.handlers.QueueListener(self.log_queue, *logging.getLogger().handlers)
+        self.listener.start()
+        self.idle: 'queue.Queue[_WarmWorker]' = queue.Queue()
+        self.stats = {'spawned': 0, 'recycled': 0, 'killed': 0, 'tasks': 0}
+        self._lock = threading.Lock()
+        self._workers: 'set[_WarmWorker]' = set()
+        self._retiring: List[threading.Thread] = []
+        for _ in range(size):
+            self.idle.put(self._spawn())
+
+    def _spawn(self) -> _WarmWorker:
+        worker = _WarmWorker(self.ctx, self.log_queue)
+        with self._lock:
+            self.stats['spawned'] += 1
+            self._workers.add(worker)
+        return worker
+
+    def _forget(self, worker: _WarmWorker):
+        with self._lock:
+            self._workers.discard(worker)
+
+    def _retire(self, worker: _WarmWorker):
+        """Stop a recycled worker in the background so the caller does not wait on its join."""
+        self._forget(worker)
+        thread = threading.Thread(target=worker.stop, name='IsoPoolRetire', daemon=True)
+        with self._lock:
+            self._retiring = [t for t in self._retiring if t.is_alive()]
+            self._retiring.append(thread)
+        thread.start()
+
+    def run(self, payload: Any, config: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        worker = self.idle.get()
+        try:
+            worker.task_queue.put((payload, config))
+            packet = worker.result_queue.get(timeout=timeout)
+        except queue.Empty:
+            self.log.error('⏳ Pool worker timed out! Replacing it...')
+            self._forget(worker)
+            worker.kill()
+            with self._lock:
+                self.stats['killed'] += 1
+            self.idle.put(self._spawn())
+            raise TimeoutError(f'Task exceeded {timeout}s limit.')
+        except BaseException:
+            self._forget(worker)
+            worker.kill()
+            self.idle.put(self._spawn())
+            raise
+        worker.tasks_done += 1
+        worker.rss_mb = packet.pop('rss_mb', None)
+        with self._lock:
+            self.stats['tasks'] += 1
+        too_big = self.max_rss_mb is not None and worker.rss_mb is not None and worker.rss_mb > self.max_rss_mb
+        if worker.tasks_done >= self.max_tasks or too_big or not worker.process.is_alive():
+            self._retire(worker)
+            with self._lock:
+                self.stats['recycled'] += 1
+            worker = self._spawn()
+        self.idle.put(worker)
+        return packet
+
+    def close(self):
+        """Stop idle workers cleanly, kill workers still busy with a task, and wait for retiring ones."""
+        idle: List[_WarmWorker] = []
+        while True:
+            try:
+                idle.append(self.idle.get_nowait())
+            except queue.Empty:
+                break
+        for worker in idle:
+            self._forget(worker)
+            worker.stop()
+        with self._lock:
+            busy, self._workers = list(self._workers), set()
+            retiring, self._retiring = self._retiring, []
+        for worker in busy:
+            worker.kill()
+        for thread in retiring:
+            thread.join()
+        self.listener.stop()
+
+@service_metadata(name='IsoProcess', version='1.1.0', description='Spawns isolated processes (per call or from a warm worker pool) with real-time logging feedback.', tags=['process', 'isolation', 'safety'], capabilities=['process:spawn'], internal_dependencies=['microservice_std_lib'], external_dependencies=[], side_effects=['process:spawn'])
 class IsoProcessMS:
     """
     The Safety Valve: Spawns isolated processes with real-time logging feedback.
+
+    config['mode']:
+      'spawn' (default) -> fresh spawn-context process per payload.
+      'pool'            -> pool_size warm workers reused across payloads; a
+                           worker is recycled after max_tasks_per_worker tasks
+                           or once its RSS exceeds max_rss_mb, and a timed-out
+                           worker is killed and replaced on its own.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]]=None):
         self.config = config or {}
         self.timeout = self.config.get('timeout_seconds', 60)
+        self.mode = self.config.get('mode', 'spawn')
+        if self.mode not in ('spawn', 'pool'):
+            raise ValueError(f"Unknown IsoProcess mode: {self.mode!r}")
+        self._pool: Optional[_WarmPool] = None
+        self._pool_lock = threading.Lock()
         self.log = logging.getLogger('IsoParent')
         if not self.log.handlers:
             logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(name)s] %(message)s', datefmt='%H:%M:%S')
 
+    def _get_pool(self) -> _WarmPool:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = _WarmPool(
+                    size=int(self.config.get('pool_size', os.cpu_count() or 1)),
+                    max_tasks=int(self.config.get('max_tasks_per_worker', 100)),
+                    max_rss_mb=self.config.get('max_rss_mb'),
+                    log=self.log,
+                )
+            return self._pool
+
     @service_endpoint(inputs={'payload': 'Any', 'config': 'Dict'}, outputs={'result': 'Any'}, description='Executes a payload in an isolated child process.', tags=['process', 'execution'], side_effects=['process:spawn'])
     def execute(self, payload: Any, config: Optional[Dict[str, Any]]=None) -> Any:
         config = config or {}
+        if self.mode == 'pool':
+            result_packet = self._get_pool().run(payload, config, self.timeout)
+            if result_packet['success']:
+                return result_packet['data']
+            raise RuntimeError(f"Worker Error: {result_packet['error']}")
         ctx = mp.get_context('spawn')
         result_queue = ctx.Queue()
         log_queue = ctx.Queue()
@@ -73,6 +268,20 @@ class IsoProcessMS:
             raise TimeoutError(f'Task exceeded {self.timeout}s limit.')
         finally:
             listener.stop()
+
+    @service_endpoint(inputs={}, outputs={'stats': 'Dict'}, description='Returns warm pool counters (spawned, recycled, killed, tasks).', tags=['process', 'diagnostic'])
+    def pool_stats(self) -> Dict[str, Any]:
+        if self._pool is None:
+            return {'mode': self.mode, 'running': False}
+        return {'mode': self.mode, 'running': True, 'size': self._pool.size, **self._pool.stats}
+
+    @service_endpoint(inputs={}, outputs={}, description='Stops all warm pool workers.', tags=['process', 'lifecycle'], side_effects=['process:kill'])
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
     @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float'}, description='Standardized health check for service status.', tags=['diagnostic', 'health'])
     def get_health(self):
         """Returns the operational status of the service."""
@@ -6,15 +6,18 @@ EXTERNAL_DEPENDENCIES: None
 """
 import os
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Dict, List, Any, Optional
 from microservice_std_lib import service_metadata, service_endpoint
 from base_service import BaseService
 
-@service_metadata(name='ScannerMS', version='1.0.0', description='Recursively scans directories, filters junk, and detects binaries.', tags=['filesystem', 'scanner', 'tree'], capabilities=['filesystem:read'], side_effects=['filesystem:read'], internal_dependencies=['base_service', 'microservice_std_lib'], external_dependencies=[])
+@service_metadata(name='ScannerMS', version='1.1.0', description='Recursively scans directories, filters junk, and detects binaries.', tags=['filesystem', 'scanner', 'tree'], capabilities=['filesystem:read'], side_effects=['filesystem:read'], internal_dependencies=['base_service', 'microservice_std_lib'], external_dependencies=[])
 class ScannerMS(BaseService):
     """
     The Scanner: Walks the file system, filters junk, and detects binary files.
     Generates the tree structure used by the UI.
+    Directories are listed concurrently on a bounded thread pool
+    (config['max_workers']); the resulting tree is identical to a serial walk.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]]=None):
@@ -34,6 +37,22 @@ class ScannerMS(BaseService):
             return {}
         root_name = os.path.basename(path) or path
         tree = {'name': root_name, 'path': path, 'type': 'folder', 'children': []}
+        max_workers = self.config.get('max_workers', min(32, (os.cpu_count() or 1) * 4))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = {pool.submit(self._list_dir, path): tree}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = pending.pop(future)
+                    node['children'] = future.result()
+                    for child in node['children']:
+                        if child['type'] == 'folder':
+                            pending[pool.submit(self._list_dir, child['path'])] = child
+        return tree
+
+    def _list_dir(self, path: str) -> List[Dict[str, Any]]:
+        """One directory level: sorted folder stubs (children filled later) and file nodes."""
+        children = []
         try:
             with os.scandir(path) as it:
                 entries = sorted(it, key=lambda e: (not e.is_dir(), e.name.lower()))
@@ -41,17 +60,15 @@ class ScannerMS(BaseService):
                     if entry.name in self.IGNORE_DIRS:
                         continue
                     if entry.is_dir():
-                        child_tree = self.scan_directory(entry.path, depth + 1)
-                        if child_tree:
-                            tree['children'].append(child_tree)
+                        children.append({'name': entry.name, 'path': entry.path, 'type': 'folder', 'children': []})
                     elif entry.is_file():
                         _, ext = os.path.splitext(entry.name)
                         if ext.lower() in self.BINARY_EXTENSIONS:
                             continue
-                        tree['children'].append({'name': entry.name, 'path': entry.path, 'type': 'file', 'size': entry.stat().st_size})
+                        children.append({'name': entry.name, 'path': entry.path, 'type': 'file', 'size': entry.stat().st_size})
         except PermissionError:
             self.log_warning(f'Permission denied: {path}')
-        return tree
+        return children
 
     @service_endpoint(inputs={'tree_node': 'Dict'}, outputs={'files': 'List[str]'}, description='Flattens a tree node into a list of file paths.', tags=['filesystem', 'utility'], side_effects=[])
     def flatten_tree(self, tree_node: Dict[str, Any]) -> List[str]:
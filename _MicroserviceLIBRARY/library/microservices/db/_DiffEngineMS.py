@@ -7,8 +7,10 @@ EXTERNAL_DEPENDENCIES: None
 import sqlite3
 import difflib
 import datetime
+import json
 import uuid
 import logging
+import zlib
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple, Any
 from microservice_std_lib import service_metadata, service_endpoint
@@ -16,18 +18,52 @@ import time
 DB_PATH = Path(__file__).parent / 'diff_engine.db'
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 log = logging.getLogger('DiffEngine')
+DEFAULT_SNAPSHOT_INTERVAL = 50
 
-@service_metadata(name='DiffEngineMS', version='1.0.0', description='Implements hybrid versioning (Head + Diff History) for file content.', tags=['version-control', 'diff', 'db'], capabilities=['db:sqlite', 'filesystem:write'], side_effects=['db:read', 'db:write'], internal_dependencies=['microservice_std_lib'], external_dependencies=[])
+
+def make_delta(source: str, target: str) -> bytes:
+    """
+    Compressed line delta that rebuilds target from source: a JSON list of
+    [start, end] copies of source lines and literal inserted text.
+    """
+    src = source.splitlines(keepends=True)
+    tgt = target.splitlines(keepends=True)
+    ops: List[Any] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, src, tgt).get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(''.join(tgt[j1:j2]))
+    return zlib.compress(json.dumps(ops, separators=(',', ':')).encode('utf-8'))
+
+
+def apply_delta(source: str, delta: bytes) -> str:
+    src = source.splitlines(keepends=True)
+    out: List[str] = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, str):
+            out.append(op)
+        else:
+            out.extend(src[op[0]:op[1]])
+    return ''.join(out)
+
+@service_metadata(name='DiffEngineMS', version='1.1.0', description='Implements hybrid versioning (Head + reverse-delta revision chain with periodic snapshots) for file content.', tags=['version-control', 'diff', 'db'], capabilities=['db:sqlite', 'filesystem:write'], side_effects=['db:read', 'db:write'], internal_dependencies=['microservice_std_lib'], external_dependencies=[])
 class DiffEngineMS:
     """
     The Timekeeper: Implements a 'Hybrid' versioning architecture.
     1. HEAD: Stores full current content for fast read access (UI/RAG).
-    2. HISTORY: Stores diff deltas using difflib for audit trails.
+    2. HISTORY: One row per revision holding a compressed reverse delta
+       (this revision -> the previous one), plus a compressed full snapshot
+       every `snapshot_interval` revisions. Any revision is rebuilt from the
+       nearest later snapshot (or the head) by applying at most that many
+       deltas; unified diffs for the audit trail are derived on read.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]]=None):
         self.config = config or {}
         self.db_path = Path(self.config.get('db_path', DB_PATH))
+        self.snapshot_interval = max(1, int(self.config.get('snapshot_interval', DEFAULT_SNAPSHOT_INTERVAL)))
+        self.start_time = time.time()
         self._init_db()
 
     def _get_conn(self):
@@ -39,6 +75,18 @@ class DiffEngineMS:
         with self._get_conn() as conn:
             conn.execute('\n                CREATE TABLE IF NOT EXISTS files (\n                    id TEXT PRIMARY KEY,\n                    path TEXT UNIQUE NOT NULL,\n                    content TEXT,\n                    last_updated TIMESTAMP\n                )\n            ')
             conn.execute("\n                CREATE TABLE IF NOT EXISTS diff_log (\n                    id TEXT PRIMARY KEY,\n                    file_id TEXT NOT NULL,\n                    timestamp TIMESTAMP,\n                    change_type TEXT,  -- 'CREATE', 'EDIT', 'DELETE'\n                    diff_blob TEXT,    -- The text output of difflib\n                    author TEXT,\n                    FOREIGN KEY(file_id) REFERENCES files(id)\n                )\n            ")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS revisions (
+                    file_id     TEXT NOT NULL,
+                    rev         INTEGER NOT NULL,
+                    timestamp   TIMESTAMP,
+                    change_type TEXT,  -- 'CREATE', 'EDIT', 'BASELINE' (head inherited from a pre-1.1 database)
+                    author      TEXT,
+                    undo_delta  BLOB,  -- compressed make_delta(this revision -> rev - 1)
+                    snapshot    BLOB,  -- compressed full content, every snapshot_interval revisions
+                    PRIMARY KEY (file_id, rev)
+                )
+            ''')
 
     @service_endpoint(inputs={'path': 'str', 'new_content': 'str', 'author': 'str'}, outputs={'status': 'str', 'file_id': 'str'}, description='Updates a file, creating a diff history entry and updating the head state.', tags=['version-control', 'write'], side_effects=['db:write'])
     def update_file(self, path: str, new_content: str, author: str='agent') -> Dict[str, Any]:
@@ -52,29 +100,48 @@ class DiffEngineMS:
         path = str(Path(path).as_posix())
         now = datetime.datetime.utcnow()
         with self._get_conn() as conn:
-            row = conn.execute('SELECT id, content FROM files WHERE path = ?', (path,)).fetchone()
+            row = conn.execute('SELECT id, content, last_updated FROM files WHERE path = ?', (path,)).fetchone()
             if not row:
                 file_id = str(uuid.uuid4())
                 conn.execute('INSERT INTO files (id, path, content, last_updated) VALUES (?, ?, ?, ?)', (file_id, path, new_content, now))
-                self._log_diff(conn, file_id, 'CREATE', '[New File Created]', author, now)
+                self._add_revision(conn, file_id, 0, 'CREATE', author, now, None, new_content)
                 log.info(f'Created new file: {path}')
-                return {'status': 'created', 'file_id': file_id}
+                return {'status': 'created', 'file_id': file_id, 'rev': 0}
             file_id = row['id']
             old_content = row['content'] or ''
-            old_lines = old_content.splitlines(keepends=True)
-            new_lines = new_content.splitlines(keepends=True)
-            diff_gen = difflib.unified_diff(old_lines, new_lines, fromfile=f'a/{path}', tofile=f'b/{path}', lineterm='')
-            diff_text = ''.join(diff_gen)
-            if not diff_text:
+            if old_content == new_content:
                 return {'status': 'unchanged', 'file_id': file_id}
-            self._log_diff(conn, file_id, 'EDIT', diff_text, author, now)
+            head_rev = self._head_rev(conn, file_id)
+            if head_rev is None:
+                head_rev = 0
+                self._add_revision(conn, file_id, 0, 'BASELINE', None, row['last_updated'], None, old_content)
+            undo = make_delta(new_content, old_content)
+            self._add_revision(conn, file_id, head_rev + 1, 'EDIT', author, now, undo, new_content)
             conn.execute('UPDATE files SET content = ?, last_updated = ? WHERE id = ?', (new_content, now, file_id))
             log.info(f'Updated file: {path}')
-            return {'status': 'updated', 'file_id': file_id, 'diff_size': len(diff_text)}
+            return {'status': 'updated', 'file_id': file_id, 'rev': head_rev + 1, 'diff_size': len(undo)}
+
+    def _add_revision(self, conn, file_id, rev, change_type, author, timestamp, undo_delta, content):
+        snapshot = zlib.compress(content.encode('utf-8')) if rev % self.snapshot_interval == 0 else None
+        conn.execute('INSERT INTO revisions (file_id, rev, timestamp, change_type, author, undo_delta, snapshot) VALUES (?, ?, ?, ?, ?, ?, ?)', (file_id, rev, timestamp, change_type, author, undo_delta, snapshot))
 
-    def _log_diff(self, conn, file_id, change_type, diff_text, author, timestamp):
-        diff_id = str(uuid.uuid4())
-        conn.execute('INSERT INTO diff_log (id, file_id, timestamp, change_type, diff_blob, author) VALUES (?, ?, ?, ?, ?, ?)', (diff_id, file_id, timestamp, change_type, diff_text, author))
+    def _head_rev(self, conn, file_id) -> Optional[int]:
+        return conn.execute('SELECT MAX(rev) FROM revisions WHERE file_id = ?', (file_id,)).fetchone()[0]
+
+    def _reconstruct(self, conn, file_id: str, rev: int) -> Optional[str]:
+        """Content of `rev`: nearest snapshot at or after it (else the head), walked back through undo deltas."""
+        head = conn.execute('SELECT content FROM files WHERE id = ?', (file_id,)).fetchone()
+        head_rev = self._head_rev(conn, file_id)
+        if head is None or head_rev is None or not 0 <= rev <= head_rev:
+            return None
+        snap = conn.execute('SELECT rev, snapshot FROM revisions WHERE file_id = ? AND rev >= ? AND snapshot IS NOT NULL ORDER BY rev LIMIT 1', (file_id, rev)).fetchone()
+        if snap is not None:
+            start_rev, content = snap['rev'], zlib.decompress(snap['snapshot']).decode('utf-8')
+        else:
+            start_rev, content = head_rev, head['content'] or ''
+        for delta_row in conn.execute('SELECT undo_delta FROM revisions WHERE file_id = ? AND rev > ? AND rev <= ? ORDER BY rev DESC', (file_id, rev, start_rev)):
+            content = apply_delta(content, delta_row['undo_delta'])
+        return content
 
     @service_endpoint(inputs={'path': 'str'}, outputs={'content': 'Optional[str]'}, description='Fast retrieval of current content.', tags=['version-control', 'read'], side_effects=['db:read'])
     def get_head(self, path: str) -> Optional[str]:
@@ -83,23 +150,64 @@ class DiffEngineMS:
             row = conn.execute('SELECT content FROM files WHERE path = ?', (path,)).fetchone()
             return row['content'] if row else None
 
-    @service_endpoint(inputs={'path': 'str'}, outputs={'history': 'List[Dict]'}, description='Retrieves the full evolution history of a file.', tags=['version-control', 'read'], side_effects=['db:read'])
-    def get_history(self, path: str) -> List[Dict]:
-        """Retrieves the full evolution history of a file."""
+    @service_endpoint(inputs={'path': 'str', 'rev': 'int'}, outputs={'content': 'Optional[str]'}, description='Reconstructs the content of a file at a given revision number.', tags=['version-control', 'read'], side_effects=['db:read'])
+    def get_revision(self, path: str, rev: int) -> Optional[str]:
+        """Content at revision `rev` (0 = first stored), or None if unknown."""
         with self._get_conn() as conn:
             row = conn.execute('SELECT id FROM files WHERE path = ?', (path,)).fetchone()
+            return self._reconstruct(conn, row['id'], rev) if row else None
+
+    @service_endpoint(inputs={'path': 'str', 'limit': 'Optional[int]', 'offset': 'int', 'include_diffs': 'bool'}, outputs={'history': 'List[Dict]'}, description='Retrieves the evolution history of a file, newest first, one page at a time.', tags=['version-control', 'read'], side_effects=['db:read'])
+    def get_history(self, path: str, limit: Optional[int]=None, offset: int=0, include_diffs: bool=True) -> List[Dict]:
+        """
+        Retrieves the evolution history of a file, newest first. `limit` and
+        `offset` page through it (limit=None returns everything from offset).
+        Unified diffs are rebuilt from the delta chain for the requested page
+        only; include_diffs=False skips that work.
+        """
+        with self._get_conn() as conn:
+            row = conn.execute('SELECT id, path FROM files WHERE path = ?', (path,)).fetchone()
             if not row:
                 return []
-            rows = conn.execute('SELECT timestamp, change_type, diff_blob, author FROM diff_log WHERE file_id = ? ORDER BY timestamp DESC', (row['id'],)).fetchall()
-            return [dict(r) for r in rows]
+            file_id = row['id']
+            page_limit = -1 if limit is None else limit
+            rows = conn.execute('SELECT rev, timestamp, change_type, author, undo_delta FROM revisions WHERE file_id = ? ORDER BY rev DESC LIMIT ? OFFSET ?', (file_id, page_limit, offset)).fetchall()
+            history = []
+            content = self._reconstruct(conn, file_id, rows[0]['rev']) if rows and include_diffs else None
+            for r in rows:
+                entry = {'rev': r['rev'], 'timestamp': r['timestamp'], 'change_type': r['change_type'], 'author': r['author']}
+                if r['undo_delta'] is None:
+                    entry['diff_blob'] = '[New File Created]' if r['change_type'] == 'CREATE' else '[History baseline]'
+                elif include_diffs:
+                    previous = apply_delta(content, r['undo_delta'])
+                    entry['diff_blob'] = ''.join(difflib.unified_diff(previous.splitlines(keepends=True), content.splitlines(keepends=True), fromfile=f"a/{row['path']}", tofile=f"b/{row['path']}", lineterm=''))
+                    content = previous
+                history.append(entry)
+            if limit is None or len(history) < limit:
+                # diff_log rows written before revisions existed are older than every revision.
+                revision_count = conn.execute('SELECT COUNT(*) FROM revisions WHERE file_id = ?', (file_id,)).fetchone()[0]
+                legacy_offset = max(0, offset - revision_count)
+                legacy_limit = -1 if limit is None else limit - len(history)
+                legacy = conn.execute('SELECT timestamp, change_type, diff_blob, author FROM diff_log WHERE file_id = ? ORDER BY timestamp DESC LIMIT ? OFFSET ?', (file_id, legacy_limit, legacy_offset)).fetchall()
+                history.extend(dict(r) for r in legacy)
+            return history
+
+    @service_endpoint(inputs={'path': 'str'}, outputs={'stats': 'Dict'}, description='Revision count and stored bytes (deltas, snapshots, head) for a file.', tags=['version-control', 'read', 'diagnostic'], side_effects=['db:read'])
+    def storage_stats(self, path: str) -> Dict[str, Any]:
+        with self._get_conn() as conn:
+            row = conn.execute('SELECT id, LENGTH(CAST(content AS BLOB)) AS head_bytes FROM files WHERE path = ?', (path,)).fetchone()
+            if not row:
+                return {}
+            stats = conn.execute('SELECT COUNT(*) AS revisions, COUNT(snapshot) AS snapshots, COALESCE(SUM(LENGTH(undo_delta)), 0) AS delta_bytes, COALESCE(SUM(LENGTH(snapshot)), 0) AS snapshot_bytes FROM revisions WHERE file_id = ?', (row['id'],)).fetchone()
+            result = dict(stats)
+            result['head_bytes'] = row['head_bytes'] or 0
+            result['total_bytes'] = result['delta_bytes'] + result['snapshot_bytes'] + result['head_bytes']
+            return result
+
     @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float'}, description='Standardized health check for service status.', tags=['diagnostic', 'health'])
     def get_health(self):
         """Returns the operational status of the service."""
-        start = getattr(self, 'start_time', None)
-        if start is None:
-            start = time.time()
-            self.start_time = start
-        return {'status': 'online', 'uptime': time.time() - start}
+        return {'status': 'online', 'uptime': time.time() - self.start_time}
 
 if __name__ == '__main__':
     import os
@@ -116,9 +224,12 @@ if __name__ == '__main__':
     print('\n--- 3. Inspecting History ---')
     history = engine.get_history('notes.txt')
     for event in history:
-        print(f"\n[{event['timestamp']}] {event['change_type']} by {event['author']}")
+        print(f"\n[{event['timestamp']}] rev {event.get('rev')} {event['change_type']} by {event['author']}")
         print(f"Diff Preview:\n{event['diff_blob'].strip()}")
     print('\n--- 4. Inspecting Head (Cache) ---')
     print(engine.get_head('notes.txt'))
+    print('\n--- 5. Reconstructing Revision 0 ---')
+    print(engine.get_revision('notes.txt', 0))
+    print(engine.storage_stats('notes.txt'))
     if DB_PATH.exists():
         os.remove(DB_PATH)
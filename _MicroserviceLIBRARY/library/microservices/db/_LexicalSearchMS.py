@@ -4,9 +4,12 @@ import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from microservice_std_lib import service_metadata, service_endpoint
+import threading
 import time
+FTS_SYNC_TRIGGERS = {'doc_ai': '\n            CREATE TRIGGER IF NOT EXISTS doc_ai AFTER INSERT ON documents BEGIN\n                INSERT INTO documents_fts(rowid, content) VALUES (new.rowid, new.content);\n            END;\n        ', 'doc_ad': "\n            CREATE TRIGGER IF NOT EXISTS doc_ad AFTER DELETE ON documents BEGIN\n                INSERT INTO documents_fts(documents_fts, rowid, content) VALUES('delete', old.rowid, old.content);\n            END;\n        ", 'doc_au': "\n            CREATE TRIGGER IF NOT EXISTS doc_au AFTER UPDATE ON documents BEGIN\n                INSERT INTO documents_fts(documents_fts, rowid, content) VALUES('delete', old.rowid, old.content);\n                INSERT INTO documents_fts(rowid, content) VALUES (new.rowid, new.content);\n            END;\n        "}
+BULK_REBUILD_MIN_DOCS = 1000
 
-@service_metadata(name='LexicalSearch', version='1.0.0', description='Lightweight BM25 keyword search using SQLite FTS5 (No AI required).', tags=['search', 'index', 'sqlite'], capabilities=['db:sqlite', 'filesystem:read', 'filesystem:write'], internal_dependencies=['microservice_std_lib'], external_dependencies=[], side_effects=['db:write', 'db:read'])
+@service_metadata(name='LexicalSearch', version='1.1.0', description='Lightweight BM25 keyword search using SQLite FTS5 (No AI required).', tags=['search', 'index', 'sqlite'], capabilities=['db:sqlite', 'filesystem:read', 'filesystem:write'], internal_dependencies=['microservice_std_lib'], external_dependencies=[], side_effects=['db:write', 'db:read'])
 class LexicalSearchMS:
     """
     The Librarian's Index: A lightweight, AI-free search engine.
@@ -20,43 +23,109 @@ class LexicalSearchMS:
         self.config = config or {}
         default_db = str(Path(__file__).parent / 'lexical_index.db')
         self.db_path = self.config.get('db_path', default_db)
+        self.start_time = time.time()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
         self._init_db()
 
+    def _connection(self) -> sqlite3.Connection:
+        """
+        One long-lived connection per service instance (guarded by _lock).
+        recursive_triggers makes INSERT OR REPLACE fire the delete trigger,
+        so replaced documents leave no stale FTS rows behind.
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA recursive_triggers = ON')
+            if self.db_path != ':memory:':
+                conn.execute('PRAGMA journal_mode = WAL')
+                conn.execute('PRAGMA synchronous = NORMAL')
+            self._conn = conn
+        return self._conn
+
     def _init_db(self):
         """
         Sets up the schema. 
         Uses Triggers to automatically keep the FTS index in sync with the main table.
         """
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute('\n            CREATE TABLE IF NOT EXISTS documents (\n                id TEXT PRIMARY KEY,\n                content TEXT,\n                metadata TEXT  -- JSON blob for extra info (path, author, etc)\n            );\n        ')
-        cur.execute("\n            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(\n                content,\n                content='documents',\n                content_rowid='rowid'  -- Internal SQLite mapping\n            );\n        ")
-        cur.execute('\n            CREATE TRIGGER IF NOT EXISTS doc_ai AFTER INSERT ON documents BEGIN\n                INSERT INTO documents_fts(rowid, content) VALUES (new.rowid, new.content);\n            END;\n        ')
-        cur.execute("\n            CREATE TRIGGER IF NOT EXISTS doc_ad AFTER DELETE ON documents BEGIN\n                INSERT INTO documents_fts(documents_fts, rowid, content) VALUES('delete', old.rowid, old.content);\n            END;\n        ")
-        cur.execute("\n            CREATE TRIGGER IF NOT EXISTS doc_au AFTER UPDATE ON documents BEGIN\n                INSERT INTO documents_fts(documents_fts, rowid, content) VALUES('delete', old.rowid, old.content);\n                INSERT INTO documents_fts(rowid, content) VALUES (new.rowid, new.content);\n            END;\n        ")
-        conn.commit()
-        conn.close()
+        with self._lock:
+            conn = self._connection()
+            cur = conn.cursor()
+            cur.execute('\n            CREATE TABLE IF NOT EXISTS documents (\n                id TEXT PRIMARY KEY,\n                content TEXT,\n                metadata TEXT  -- JSON blob for extra info (path, author, etc)\n            );\n        ')
+            cur.execute("\n            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(\n                content,\n                content='documents',\n                content_rowid='rowid'  -- Internal SQLite mapping\n            );\n        ")
+            for ddl in FTS_SYNC_TRIGGERS.values():
+                cur.execute(ddl)
+            conn.commit()
 
     @service_endpoint(inputs={'doc_id': 'str', 'text': 'str', 'metadata': 'Dict'}, outputs={}, description='Adds or updates a document in the FTS index.', tags=['search', 'write'], side_effects=['db:write'])
     def add_document(self, doc_id: str, text: str, metadata: Optional[Dict[str, Any]]=None):
         """
         Adds or updates a document in the index.
         """
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
         meta_json = json.dumps(metadata or {})
-        cur.execute('\n            INSERT OR REPLACE INTO documents (id, content, metadata)\n            VALUES (?, ?, ?)\n        ', (doc_id, text, meta_json))
-        conn.commit()
-        conn.close()
+        with self._lock:
+            conn = self._connection()
+            conn.execute('\n            INSERT OR REPLACE INTO documents (id, content, metadata)\n            VALUES (?, ?, ?)\n        ', (doc_id, text, meta_json))
+            conn.commit()
+
+    @service_endpoint(inputs={'documents': 'List[Dict]', 'rebuild': 'Optional[bool]'}, outputs={'added': 'int', 'rebuilt': 'bool'}, description='Bulk-loads documents ({doc_id, text, metadata}) in one transaction, optionally with the FTS triggers suspended and a single index rebuild.', tags=['search', 'write', 'bulk'], side_effects=['db:write'])
+    def add_documents(self, documents: List[Dict[str, Any]], rebuild: Optional[bool]=None) -> Dict[str, Any]:
+        """
+        Bulk ingest. With rebuild=True the sync triggers are dropped for the
+        duration of the load and the FTS index is rebuilt once from the
+        documents table afterwards; with rebuild=False rows go through the
+        triggers as usual. rebuild=None rebuilds only when the batch is at
+        least as large as the existing corpus, since a rebuild rescans it all.
+        """
+        rows = [(d['doc_id'], d['text'], json.dumps(d.get('metadata') or {})) for d in documents]
+        if not rows:
+            return {'added': 0, 'rebuilt': False}
+        with self._lock:
+            conn = self._connection()
+            if rebuild is None:
+                existing = conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+                rebuild = len(rows) >= max(BULK_REBUILD_MIN_DOCS, existing)
+            try:
+                conn.execute('BEGIN')
+                if rebuild:
+                    for name in FTS_SYNC_TRIGGERS:
+                        conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+                conn.executemany('INSERT OR REPLACE INTO documents (id, content, metadata) VALUES (?, ?, ?)', rows)
+                if rebuild:
+                    conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')")
+                    for ddl in FTS_SYNC_TRIGGERS.values():
+                        conn.execute(ddl)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return {'added': len(rows), 'rebuilt': rebuild}
+
+    @service_endpoint(inputs={}, outputs={}, description='Merges the FTS index b-tree segments into one, speeding up subsequent queries.', tags=['search', 'maintenance'], side_effects=['db:write'])
+    def optimize(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('optimize')")
+            conn.commit()
+
+    def close(self):
+        """Closes the long-lived connection; the next call reopens it."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     @service_endpoint(inputs={'query': 'str', 'top_k': 'int'}, outputs={'results': 'List[Dict]'}, description='Performs a BM25 ranked keyword search.', tags=['search', 'read'], side_effects=['db:read'])
     def search(self, query: str, top_k: int=20) -> List[Dict[str, Any]]:
         """
         Performs a BM25 Ranked Search.
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
+        with self._lock:
+            return self._search(query, top_k)
+
+    def _search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        cur = self._connection().cursor()
         try:
             sql = "\n                SELECT \n                    d.id, \n                    d.content, \n                    d.metadata,\n                    snippet(documents_fts, 0, '<b>', '</b>', '...', 15) as preview,\n                    bm25(documents_fts) as score\n                FROM documents_fts \n                JOIN documents d ON d.rowid = documents_fts.rowid\n                WHERE documents_fts MATCH ? \n                ORDER BY score ASC\n                LIMIT ?\n            "
             safe_query = f'"{query}"'
@@ -69,15 +138,12 @@ class LexicalSearchMS:
             print(f'Search syntax error: {e}')
             return []
         finally:
-            conn.close()
+            cur.close()
+
     @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float'}, description='Standardized health check for service status.', tags=['diagnostic', 'health'])
     def get_health(self):
         """Returns the operational status of the service."""
-        start = getattr(self, 'start_time', None)
-        if start is None:
-            start = time.time()
-            self.start_time = start
-        return {'status': 'online', 'uptime': time.time() - start}
+        return {'status': 'online', 'uptime': time.time() - self.start_time}
 
 if __name__ == '__main__':
     import os
@@ -94,5 +160,6 @@ if __name__ == '__main__':
     for hit in hits:
         print(f"[{hit['score']:.4f}] {hit['id']} ({hit['metadata']['category']})")
         print(f"   Preview: {hit['preview']}")
+    engine.close()
     if os.path.exists(db_name):
         os.remove(db_name)
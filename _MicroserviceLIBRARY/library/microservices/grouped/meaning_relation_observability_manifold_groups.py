@@ -9,11 +9,13 @@ Four manager groups in one file:
 
 import json
 import math
+import re
 import sqlite3
+import string
 import struct
 import time
 from collections import defaultdict
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from microservice_std_lib import service_metadata, service_endpoint
 
@@ -87,48 +89,205 @@ class SemanticSearchMS:
 
 # ---------------------------------------------------------------------------
 
+# Terms are stored verbatim in the FTS body, joined by LEXICAL_TERM_SEPARATOR.
+# ASCII punctuation and spaces are token characters so a stored term such as
+# 'foo.bar' or 'c++' stays one FTS token; accents are kept so 'café' does not
+# also match 'cafe'.
+LEXICAL_TERM_SEPARATOR = '\x1f'
+LEXICAL_TOKENIZER = "unicode61 remove_diacritics 0 tokenchars '" + (string.punctuation + ' ').replace("'", "''") + "'"
+LEXICAL_TOKEN_RE = re.compile(r'\w+')
+# Sorts after every BMP/astral character, so [p, p + CEILING) is "starts with p".
+PREFIX_CEILING = '\U0010ffff'
+_FTS5_AVAILABLE: Optional[bool] = None
+
+
+def _fts5_available() -> bool:
+    global _FTS5_AVAILABLE
+    if _FTS5_AVAILABLE is None:
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.execute('CREATE VIRTUAL TABLE probe USING fts5(body)')
+            _FTS5_AVAILABLE = True
+        except sqlite3.OperationalError:
+            _FTS5_AVAILABLE = False
+        finally:
+            conn.close()
+    return _FTS5_AVAILABLE
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute('SELECT 1 FROM sqlite_master WHERE name = ?', (name,)).fetchone() is not None
+
+
+def _document_terms(doc: Dict[str, Any]) -> List[str]:
+    if 'terms' in doc:
+        return list(doc['terms'])
+    return LEXICAL_TOKEN_RE.findall(str(doc.get('text', '')).lower())
+
+
+def _fts_phrase(token: str) -> str:
+    return '"' + token.replace('"', '""') + '"'
+
+
 @service_metadata(
     name='LexicalIndexMS',
-    version='1.0.0',
-    description='Token-level surface form index. Prefix search and n-gram matching over stored terms.',
-    tags=['meaning', 'lexical', 'trie', 'ngram'],
+    version='1.1.0',
+    description='Token-level surface form index. BM25 full-text search, prefix search and n-gram matching over stored terms.',
+    tags=['meaning', 'lexical', 'trie', 'ngram', 'fts5', 'bm25'],
     capabilities=['compute', 'db:read', 'db:write'],
     side_effects=['db:write'],
     internal_dependencies=['microservice_std_lib'],
     external_dependencies=[],
 )
 class LexicalIndexMS:
-    def __init__(self):
+    """
+    A database holds its terms in exactly one store, chosen when it is first
+    opened and kept from then on:
+
+    engine='fts5'  -> lexical_fts: one FTS5 row per indexed document, with
+                      prefix indexes on 2/3-char prefixes. search() is BM25
+                      ranked; prefix_search() goes through the prefix index.
+                      A database that only has lexical_terms is moved over.
+    engine='table' -> lexical_terms: one row per (term, node_id) with its
+                      frequency. search() sums term frequencies.
+    engine='auto'  -> fts5 when the SQLite build has it, else table.
+
+    Terms are lower-cased and otherwise stored verbatim by both stores.
+    """
+
+    ENGINES = ('auto', 'fts5', 'table')
+
+    def __init__(self, engine: str = 'auto'):
+        if engine not in self.ENGINES:
+            raise ValueError(f'Unknown lexical engine: {engine!r} (expected one of {self.ENGINES})')
         self.start_time = time.time()
+        self.engine = engine if engine != 'auto' else ('fts5' if _fts5_available() else 'table')
+        if self.engine == 'fts5' and not _fts5_available():
+            raise RuntimeError('This SQLite build does not include FTS5')
 
-    def _open(self, db_path: str) -> sqlite3.Connection:
+    def _open(self, db_path: str) -> Tuple[sqlite3.Connection, bool]:
+        """Returns the connection and whether this database uses the FTS store."""
         conn = sqlite3.connect(db_path)
         conn.row_factory = sqlite3.Row
-        conn.execute('''CREATE TABLE IF NOT EXISTS lexical_terms (
-            term      TEXT PRIMARY KEY,
+        use_fts = _has_table(conn, 'lexical_fts')
+        if use_fts and not _fts5_available():
+            conn.close()
+            raise RuntimeError(f'{db_path} holds an FTS5 lexical index but this SQLite build does not include FTS5')
+        if not use_fts and self.engine == 'fts5':
+            tokenize = LEXICAL_TOKENIZER.replace('"', '""')
+            conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS lexical_fts USING fts5(node_id UNINDEXED, body, prefix='2 3', tokenize=\"{tokenize}\")")
+            if _has_table(conn, 'lexical_terms'):
+                self._migrate_terms(conn)
+            use_fts = True
+        if not use_fts:
+            self._ensure_terms_table(conn)
+        conn.commit()
+        return conn, use_fts
+
+    def _ensure_terms_table(self, conn: sqlite3.Connection) -> None:
+        key = [row['name'] for row in sorted(conn.execute('PRAGMA table_info(lexical_terms)'), key=lambda row: row['pk']) if row['pk']]
+        if key == ['term', 'node_id']:
+            return
+        conn.execute('''CREATE TABLE lexical_terms_new (
+            term      TEXT NOT NULL,
             node_id   TEXT,
-            frequency INTEGER DEFAULT 1
+            frequency INTEGER DEFAULT 1,
+            PRIMARY KEY (term, node_id)
         )''')
-        conn.commit()
-        return conn
+        if key:
+            # Databases from before (term, node_id) keying held one node per term.
+            conn.execute('INSERT INTO lexical_terms_new (term, node_id, frequency) SELECT term, node_id, frequency FROM lexical_terms')
+            conn.execute('DROP TABLE lexical_terms')
+        conn.execute('ALTER TABLE lexical_terms_new RENAME TO lexical_terms')
+
+    def _migrate_terms(self, conn: sqlite3.Connection) -> None:
+        # Move terms indexed before the FTS table existed into it; the FTS table
+        # is the only store from now on.
+        docs = defaultdict(list)
+        for row in conn.execute('SELECT term, node_id, frequency FROM lexical_terms'):
+            docs[row['node_id']].extend([row['term']] * max(1, row['frequency'] or 1))
+        conn.executemany('INSERT INTO lexical_fts (node_id, body) VALUES (?, ?)', ((node_id, LEXICAL_TERM_SEPARATOR.join(terms)) for node_id, terms in docs.items()))
+        conn.execute('DROP TABLE lexical_terms')
 
     @service_endpoint(inputs={'db_path': 'str', 'terms': 'list', 'node_id': 'str'}, outputs={'indexed': 'int'}, description='Index a list of terms for a node.', tags=['lexical', 'write'], side_effects=['db:write'])
     def index_terms(self, db_path: str, terms: List[str], node_id: str) -> int:
-        conn = self._open(db_path)
+        return self.index_many(db_path, [{'node_id': node_id, 'terms': terms}])
+
+    @service_endpoint(inputs={'db_path': 'str', 'documents': 'list'}, outputs={'indexed': 'int'}, description="Bulk-index documents ({'node_id', 'terms'} or {'node_id', 'text'}) in a single transaction. Returns the number of terms indexed.", tags=['lexical', 'write', 'bulk'], side_effects=['db:write'])
+    def index_many(self, db_path: str, documents: List[Dict[str, Any]]) -> int:
+        conn, use_fts = self._open(db_path)
         try:
-            for term in terms:
-                conn.execute('INSERT INTO lexical_terms (term, node_id, frequency) VALUES (?, ?, 1) ON CONFLICT(term) DO UPDATE SET frequency = frequency + 1', (term.lower(), node_id))
-            conn.commit()
-            return len(terms)
+            indexed = 0
+            with conn:
+                rows = []
+                for doc in documents:
+                    terms = [term.lower() for term in _document_terms(doc)]
+                    indexed += len(terms)
+                    if use_fts:
+                        rows.append((doc['node_id'], LEXICAL_TERM_SEPARATOR.join(terms)))
+                    else:
+                        rows.extend((term, doc['node_id']) for term in terms)
+                if use_fts:
+                    conn.executemany('INSERT INTO lexical_fts (node_id, body) VALUES (?, ?)', rows)
+                else:
+                    conn.executemany('INSERT INTO lexical_terms (term, node_id, frequency) VALUES (?, ?, 1) ON CONFLICT(term, node_id) DO UPDATE SET frequency = frequency + 1', rows)
+            return indexed
         finally:
             conn.close()
 
-    @service_endpoint(inputs={'db_path': 'str', 'prefix': 'str', 'limit': 'int'}, outputs={'matches': 'list'}, description='Prefix search over indexed terms.', tags=['lexical', 'search'])
+    @service_endpoint(inputs={'db_path': 'str', 'prefix': 'str', 'limit': 'int'}, outputs={'matches': 'list'}, description='Prefix search over indexed terms: one row per (term, node_id), most frequent first.', tags=['lexical', 'search'])
     def prefix_search(self, db_path: str, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
-        conn = self._open(db_path)
+        prefix = prefix.lower()
+        conn, use_fts = self._open(db_path)
         try:
-            rows = conn.execute('SELECT term, node_id, frequency FROM lexical_terms WHERE term LIKE ? ORDER BY frequency DESC LIMIT ?', (prefix.lower() + '%', limit)).fetchall()
-            return [dict(r) for r in rows]
+            if not use_fts:
+                rows = conn.execute('SELECT term, node_id, frequency FROM lexical_terms WHERE term >= ? AND term < ? ORDER BY frequency DESC LIMIT ?', (prefix, prefix + PREFIX_CEILING, limit)).fetchall()
+                return [dict(r) for r in rows]
+            # The prefix index narrows the documents; the verbatim body gives the terms.
+            if prefix:
+                docs = conn.execute('SELECT node_id, body FROM lexical_fts WHERE lexical_fts MATCH ?', (_fts_phrase(prefix) + '*',))
+            else:
+                docs = conn.execute('SELECT node_id, body FROM lexical_fts')
+            counts: Dict[Tuple[str, str], int] = defaultdict(int)
+            for row in docs:
+                for term in row['body'].split(LEXICAL_TERM_SEPARATOR):
+                    if term.startswith(prefix):
+                        counts[(term, row['node_id'])] += 1
+            ranked = sorted(counts.items(), key=lambda item: -item[1])[:limit]
+            return [{'term': term, 'node_id': node_id, 'frequency': frequency} for (term, node_id), frequency in ranked]
+        finally:
+            conn.close()
+
+    @service_endpoint(inputs={'db_path': 'str', 'query': 'str', 'limit': 'int', 'prefix': 'bool'}, outputs={'matches': 'list'}, description='Ranked full-text search: nodes containing every query token (prefix=True treats tokens as prefixes), best first. Scores are BM25 (fts5) or summed term frequency (table); higher is better.', tags=['lexical', 'search', 'bm25'])
+    def search(self, db_path: str, query: str, limit: int = 20, prefix: bool = False) -> List[Dict[str, Any]]:
+        tokens = list(dict.fromkeys(LEXICAL_TOKEN_RE.findall(query.lower())))
+        if not tokens:
+            return []
+        conn, use_fts = self._open(db_path)
+        try:
+            if use_fts:
+                # Space-separated phrases are ANDed by FTS5.
+                match = ' '.join(_fts_phrase(token) + ('*' if prefix else '') for token in tokens)
+                # A node indexed more than once scores by its best row, which is
+                # the first one seen in rank order; stop once `limit` nodes are in.
+                best: Dict[str, float] = {}
+                for row in conn.execute('SELECT node_id, rank FROM lexical_fts WHERE lexical_fts MATCH ? ORDER BY rank', (match,)):
+                    if row['node_id'] not in best:
+                        best[row['node_id']] = -row['rank']
+                        if len(best) >= limit:
+                            break
+                return [{'node_id': node_id, 'score': score} for node_id, score in best.items()]
+            # One branch per token; a node qualifies only if every token matched it.
+            clause = '(term >= ? AND term < ?)' if prefix else 'term = ?'
+            branch = f'SELECT node_id, SUM(frequency) AS score FROM lexical_terms WHERE {clause} GROUP BY node_id'
+            params: List[Any] = []
+            for token in tokens:
+                params.extend((token, token + PREFIX_CEILING) if prefix else (token,))
+            if len(tokens) == 1:
+                sql = f'{branch} ORDER BY score DESC LIMIT ?'
+            else:
+                sql = f"SELECT node_id, SUM(score) AS score FROM ({' UNION ALL '.join([branch] * len(tokens))}) GROUP BY node_id HAVING COUNT(*) = {len(tokens)} ORDER BY score DESC LIMIT ?"
+            return [dict(r) for r in conn.execute(sql, (*params, limit)).fetchall()]
         finally:
             conn.close()
 
@@ -143,7 +302,7 @@ class LexicalIndexMS:
 
     @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float'}, description='Health check.', tags=['diagnostic', 'health'])
     def get_health(self):
-        return {'status': 'online', 'uptime': time.time() - self.start_time}
+        return {'status': 'online', 'uptime': time.time() - self.start_time, 'engine': self.engine}
 
 
 # ---------------------------------------------------------------------------
@@ -388,25 +547,21 @@ class LayerHealthMS:
     def poll_all(self, registry) -> Dict[str, Any]:
         results = registry.health_all()
         online = sum(1 for v in results.values() if v.get('status') == 'online')
+        # Lazily registered services that have not been built yet are healthy, not degraded.
+        deferred = sum(1 for v in results.values() if v.get('status') == 'deferred')
         return {
             'total': len(results),
             'online': online,
-            'degraded': len(results) - online,
+            'deferred': deferred,
+            'degraded': len(results) - online - deferred,
             'services': results,
         }
 
     @service_endpoint(inputs={'registry': 'object', 'tag': 'str'}, outputs={'report': 'dict'}, description='Poll only services matching a tag.', tags=['health', 'monitor'])
     def poll_by_tag(self, registry, tag: str) -> Dict[str, Any]:
-        names = registry.list_by_tag(tag)
-        report = {}
-        for name in names:
-            inst = registry.get(name)
-            if inst:
-                try:
-                    report[name] = inst.get_health()
-                except Exception as e:
-                    report[name] = {'status': 'error', 'error': str(e)}
-        return report
+        names = set(registry.list_by_tag(tag))
+        # health_all() reports deferred services without constructing them.
+        return {name: status for name, status in registry.health_all().items() if name in names}
 
     def register(self, registry, group=None):
         meta = getattr(self, '_meta', {})
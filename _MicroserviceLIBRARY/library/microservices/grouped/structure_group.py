@@ -6,7 +6,11 @@ AST/tree-sitter services already exist as reference MSes — see
 _ReferencePythonAstChunkerMS, _ReferenceTreeSitterStrategyMS, _ReferenceTreeSitterQueryRegistryMS.
 """
 
+import bisect
+import json
+import os
 import sqlite3
+import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -150,9 +154,107 @@ class DagOpsMS:
 # IntervalIndexMS
 # ---------------------------------------------------------------------------
 
+_SPAN_FIELDS = ('span_id', 'node_id', 'line_start', 'line_end', 'label')
+
+
+class _IntervalTree:
+    """
+    In-memory augmented interval tree for one interval_index namespace.
+    Spans are kept sorted by (line_start, line_end) and viewed as an implicit
+    balanced BST (node = midpoint of its index range) where every node also
+    stores the max line_end of its subtree, so overlap queries prune whole
+    subtrees and run in O(log n + k).
+    Writes after the build land in a small pending buffer (plus tombstones
+    for replaced/deleted spans); the tree is rebuilt once the buffer grows
+    past ~sqrt(n), keeping inserts cheap without degrading queries.
+    """
+
+    def __init__(self, rows):
+        self.rows: Dict[str, Tuple] = {r[0]: tuple(r) for r in rows}
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        ordered = sorted(self.rows.values(), key=lambda r: (r[2], r[3]))
+        self.ids = [r[0] for r in ordered]
+        self.starts = [r[2] for r in ordered]
+        self.ends = [r[3] for r in ordered]
+        self.max_end = list(self.ends)
+        self.pending: Dict[str, Tuple] = {}
+        self.dead: set = set()
+        # Post-order fill of subtree max_end over the implicit tree.
+        stack = [(0, len(self.ids), False)]
+        while stack:
+            lo, hi, expanded = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if not expanded:
+                stack.append((lo, hi, True))
+                stack.append((lo, mid, False))
+                stack.append((mid + 1, hi, False))
+                continue
+            best = self.ends[mid]
+            if lo < mid:
+                best = max(best, self.max_end[(lo + mid) // 2])
+            if mid + 1 < hi:
+                best = max(best, self.max_end[(mid + 1 + hi) // 2])
+            self.max_end[mid] = best
+
+    def _maybe_rebuild(self) -> None:
+        if len(self.pending) + len(self.dead) > max(256, int(len(self.rows) ** 0.5)):
+            self._rebuild()
+
+    def upsert(self, row: Tuple) -> None:
+        span_id = row[0]
+        if span_id in self.rows and span_id not in self.pending:
+            self.dead.add(span_id)
+        self.rows[span_id] = row
+        self.pending[span_id] = row
+        self._maybe_rebuild()
+
+    def delete(self, span_id: str) -> None:
+        if span_id not in self.rows:
+            return
+        del self.rows[span_id]
+        if self.pending.pop(span_id, None) is None:
+            self.dead.add(span_id)
+        self._maybe_rebuild()
+
+    def overlapping(self, line_start: int, line_end: int) -> List[Tuple]:
+        ids, starts, ends, max_end = self.ids, self.starts, self.ends, self.max_end
+        hits = []
+        stack = [(0, len(ids))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if max_end[mid] < line_start:
+                continue
+            stack.append((lo, mid))
+            if starts[mid] <= line_end:
+                if ends[mid] >= line_start:
+                    hits.append(ids[mid])
+                stack.append((mid + 1, hi))
+        return self._collect(hits, lambda r: r[2] <= line_end and r[3] >= line_start)
+
+    def contained_by(self, line_start: int, line_end: int) -> List[Tuple]:
+        lo = bisect.bisect_left(self.starts, line_start)
+        hi = bisect.bisect_right(self.starts, line_end)
+        ends, ids = self.ends, self.ids
+        hits = [ids[i] for i in range(lo, hi) if ends[i] <= line_end]
+        return self._collect(hits, lambda r: r[2] >= line_start and r[3] <= line_end)
+
+    def _collect(self, hits: List[str], pending_match) -> List[Tuple]:
+        dead, rows = self.dead, self.rows
+        out = [rows[span_id] for span_id in hits if span_id not in dead]
+        out.extend(r for r in self.pending.values() if pending_match(r))
+        return out
+
+
 @service_metadata(
     name='IntervalIndexMS',
-    version='1.0.0',
+    version='1.1.0',
     description='Build and query a positional interval index over line spans. Find overlaps, containment, and point membership.',
     tags=['structure', 'positional', 'interval', 'range'],
     capabilities=['compute', 'db:read', 'db:write'],
@@ -161,8 +263,21 @@ class DagOpsMS:
     external_dependencies=[],
 )
 class IntervalIndexMS:
-    def __init__(self):
+    """
+    engine='sql'  -> every query is a range predicate against SQLite (default).
+    engine='tree' -> each db_path gets an in-memory _IntervalTree, loaded from
+                     SQLite on first query and kept in sync by upsert/delete.
+    """
+
+    ENGINES = ('sql', 'tree')
+
+    def __init__(self, engine: str = 'sql'):
+        if engine not in self.ENGINES:
+            raise ValueError(f'Unknown interval engine: {engine!r} (expected one of {self.ENGINES})')
         self.start_time = time.time()
+        self.engine = engine
+        self._trees: Dict[str, _IntervalTree] = {}
+        self._lock = threading.RLock()
 
     def _open(self, db_path: str) -> sqlite3.Connection:
         conn = sqlite3.connect(db_path)
@@ -177,6 +292,33 @@ class IntervalIndexMS:
         conn.commit()
         return conn
 
+    def _namespace(self, db_path: str) -> str:
+        return db_path if db_path == ':memory:' else os.path.abspath(db_path)
+
+    def _tree(self, db_path: str) -> _IntervalTree:
+        key = self._namespace(db_path)
+        tree = self._trees.get(key)
+        if tree is None:
+            conn = self._open(db_path)
+            try:
+                rows = conn.execute('SELECT span_id, node_id, line_start, line_end, label FROM interval_index').fetchall()
+            finally:
+                conn.close()
+            tree = _IntervalTree(tuple(r) for r in rows)
+            self._trees[key] = tree
+        return tree
+
+    def _query(self, db_path: str, tree_query: str, line_start: int, line_end: int, sql: str, params: Tuple) -> List[Dict[str, Any]]:
+        if self.engine == 'tree':
+            with self._lock:
+                rows = getattr(self._tree(db_path), tree_query)(line_start, line_end)
+            return [dict(zip(_SPAN_FIELDS, r)) for r in rows]
+        conn = self._open(db_path)
+        try:
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+        finally:
+            conn.close()
+
     @service_endpoint(inputs={'db_path': 'str', 'span_id': 'str', 'node_id': 'str', 'line_start': 'int', 'line_end': 'int', 'label': 'str'}, outputs={'ok': 'bool'}, description='Insert or replace a span in the interval index.', tags=['interval', 'write'], side_effects=['db:write'])
     def upsert_span(self, db_path: str, span_id: str, node_id: str, line_start: int, line_end: int, label: str = '') -> bool:
         conn = self._open(db_path)
@@ -184,44 +326,55 @@ class IntervalIndexMS:
             conn.execute('INSERT OR REPLACE INTO interval_index (span_id, node_id, line_start, line_end, label) VALUES (?, ?, ?, ?, ?)',
                          (span_id, node_id, line_start, line_end, label))
             conn.commit()
-            return True
         finally:
             conn.close()
-
-    @service_endpoint(inputs={'db_path': 'str', 'line': 'int'}, outputs={'spans': 'list'}, description='Find all spans that contain a given line number.', tags=['interval', 'query'])
-    def spans_at_line(self, db_path: str, line: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            tree = self._trees.get(self._namespace(db_path))
+            if tree is not None:
+                tree.upsert((span_id, node_id, line_start, line_end, label))
+        return True
+
+    @service_endpoint(inputs={'db_path': 'str', 'span_id': 'str'}, outputs={'ok': 'bool'}, description='Remove a span from the interval index.', tags=['interval', 'write'], side_effects=['db:write'])
+    def delete_span(self, db_path: str, span_id: str) -> bool:
         conn = self._open(db_path)
         try:
-            rows = conn.execute('SELECT * FROM interval_index WHERE line_start <= ? AND line_end >= ?', (line, line)).fetchall()
-            return [dict(r) for r in rows]
+            deleted = conn.execute('DELETE FROM interval_index WHERE span_id = ?', (span_id,)).rowcount
+            conn.commit()
         finally:
             conn.close()
+        with self._lock:
+            tree = self._trees.get(self._namespace(db_path))
+            if tree is not None:
+                tree.delete(span_id)
+        return bool(deleted)
+
+    @service_endpoint(inputs={'db_path': 'str', 'line': 'int'}, outputs={'spans': 'list'}, description='Find all spans that contain a given line number.', tags=['interval', 'query'])
+    def spans_at_line(self, db_path: str, line: int) -> List[Dict[str, Any]]:
+        return self._query(db_path, 'overlapping', line, line,
+                           'SELECT * FROM interval_index WHERE line_start <= ? AND line_end >= ?', (line, line))
 
     @service_endpoint(inputs={'db_path': 'str', 'line_start': 'int', 'line_end': 'int'}, outputs={'spans': 'list'}, description='Find all spans that overlap with a given range.', tags=['interval', 'query'])
     def spans_overlapping(self, db_path: str, line_start: int, line_end: int) -> List[Dict[str, Any]]:
-        conn = self._open(db_path)
-        try:
-            rows = conn.execute('SELECT * FROM interval_index WHERE line_start <= ? AND line_end >= ?', (line_end, line_start)).fetchall()
-            return [dict(r) for r in rows]
-        finally:
-            conn.close()
+        return self._query(db_path, 'overlapping', line_start, line_end,
+                           'SELECT * FROM interval_index WHERE line_start <= ? AND line_end >= ?', (line_end, line_start))
 
     @service_endpoint(inputs={'db_path': 'str', 'line_start': 'int', 'line_end': 'int'}, outputs={'spans': 'list'}, description='Find all spans fully contained within a range.', tags=['interval', 'query'])
     def spans_contained_by(self, db_path: str, line_start: int, line_end: int) -> List[Dict[str, Any]]:
-        conn = self._open(db_path)
-        try:
-            rows = conn.execute('SELECT * FROM interval_index WHERE line_start >= ? AND line_end <= ?', (line_start, line_end)).fetchall()
-            return [dict(r) for r in rows]
-        finally:
-            conn.close()
+        return self._query(db_path, 'contained_by', line_start, line_end,
+                           'SELECT * FROM interval_index WHERE line_start >= ? AND line_end <= ?', (line_start, line_end))
+
+    @service_endpoint(inputs={'db_path': 'str'}, outputs={'ok': 'bool'}, description='Drop the in-memory tree for a namespace so the next query reloads it from SQLite.', tags=['interval', 'cache'])
+    def invalidate(self, db_path: str) -> bool:
+        with self._lock:
+            return self._trees.pop(self._namespace(db_path), None) is not None
 
     def register(self, registry, group=None):
         meta = getattr(self, '_meta', {})
         registry.register(name=meta.get('name', self.__class__.__name__), version=meta.get('version', '0.0.0'), tags=meta.get('tags', []), capabilities=meta.get('capabilities', []), instance=self, group=group)
 
-    @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float'}, description='Health check.', tags=['diagnostic', 'health'])
+    @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float', 'engine': 'str', 'namespaces': 'int'}, description='Health check.', tags=['diagnostic', 'health'])
     def get_health(self):
-        return {'status': 'online', 'uptime': time.time() - self.start_time}
+        return {'status': 'online', 'uptime': time.time() - self.start_time, 'engine': self.engine, 'namespaces': len(self._trees)}
 
 
 # ---------------------------------------------------------------------------
@@ -230,7 +383,7 @@ class IntervalIndexMS:
 
 @service_metadata(
     name='DirectedFlowMS',
-    version='1.0.0',
+    version='1.1.0',
     description='Typed directed graph for causality, dependency, and dataflow. Upstream/downstream walk, cycle detection.',
     tags=['structure', 'directional', 'flow', 'dependency'],
     capabilities=['db:read', 'db:write'],
@@ -252,6 +405,8 @@ class DirectedFlowMS:
             flow_type TEXT DEFAULT 'DEPENDS_ON',
             weight    REAL DEFAULT 1.0
         )''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_flow_edges_src ON flow_edges (src, dst)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_flow_edges_dst ON flow_edges (dst, src)')
         conn.commit()
         return conn
 
@@ -267,37 +422,54 @@ class DirectedFlowMS:
         finally:
             conn.close()
 
-    @service_endpoint(inputs={'db_path': 'str', 'node_id': 'str'}, outputs={'upstream': 'list'}, description='Walk all upstream nodes (what this node depends on).', tags=['flow', 'query'])
-    def upstream(self, db_path: str, node_id: str) -> List[str]:
+    def _walk(self, db_path: str, roots: List[str], follow: str, max_depth: Optional[int]) -> Dict[str, List[str]]:
+        """
+        Single WITH RECURSIVE traversal from every root at once.
+        follow='dst' walks downstream (src -> dst), follow='src' walks upstream.
+        UNION (not UNION ALL) de-duplicates visited (root, node[, depth]) rows,
+        which is what stops the recursion on cycles.
+        """
+        here, there = ('src', 'dst') if follow == 'dst' else ('dst', 'src')
+        if max_depth is None:
+            sql = f'''WITH RECURSIVE walk(root, node) AS (
+                    SELECT r.value, e.{there} FROM json_each(?) r JOIN flow_edges e ON e.{here} = r.value
+                    UNION
+                    SELECT w.root, e.{there} FROM walk w JOIN flow_edges e ON e.{here} = w.node
+                ) SELECT root, node FROM walk'''
+            params: Tuple = (json.dumps(roots),)
+        else:
+            sql = f'''WITH RECURSIVE walk(root, node, depth) AS (
+                    SELECT r.value, e.{there}, 1 FROM json_each(?) r JOIN flow_edges e ON e.{here} = r.value
+                    WHERE ? >= 1
+                    UNION
+                    SELECT w.root, e.{there}, w.depth + 1 FROM walk w JOIN flow_edges e ON e.{here} = w.node
+                    WHERE w.depth < ?
+                ) SELECT DISTINCT root, node FROM walk'''
+            params = (json.dumps(roots), max_depth, max_depth)
+        result: Dict[str, List[str]] = {root: [] for root in roots}
         conn = self._open(db_path)
-        visited, queue = set(), [node_id]
         try:
-            while queue:
-                current = queue.pop()
-                rows = conn.execute('SELECT src FROM flow_edges WHERE dst = ?', (current,)).fetchall()
-                for r in rows:
-                    if r['src'] not in visited:
-                        visited.add(r['src'])
-                        queue.append(r['src'])
-            return list(visited)
+            for r in conn.execute(sql, params):
+                result[r['root']].append(r['node'])
+            return result
         finally:
             conn.close()
 
-    @service_endpoint(inputs={'db_path': 'str', 'node_id': 'str'}, outputs={'downstream': 'list'}, description='Walk all downstream nodes (what depends on this node).', tags=['flow', 'query'])
-    def downstream(self, db_path: str, node_id: str) -> List[str]:
-        conn = self._open(db_path)
-        visited, queue = set(), [node_id]
-        try:
-            while queue:
-                current = queue.pop()
-                rows = conn.execute('SELECT dst FROM flow_edges WHERE src = ?', (current,)).fetchall()
-                for r in rows:
-                    if r['dst'] not in visited:
-                        visited.add(r['dst'])
-                        queue.append(r['dst'])
-            return list(visited)
-        finally:
-            conn.close()
+    @service_endpoint(inputs={'db_path': 'str', 'node_id': 'str', 'max_depth': 'Optional[int]'}, outputs={'upstream': 'list'}, description='Walk all upstream nodes (what this node depends on).', tags=['flow', 'query'])
+    def upstream(self, db_path: str, node_id: str, max_depth: Optional[int] = None) -> List[str]:
+        return self._walk(db_path, [node_id], 'src', max_depth)[node_id]
+
+    @service_endpoint(inputs={'db_path': 'str', 'node_id': 'str', 'max_depth': 'Optional[int]'}, outputs={'downstream': 'list'}, description='Walk all downstream nodes (what depends on this node).', tags=['flow', 'query'])
+    def downstream(self, db_path: str, node_id: str, max_depth: Optional[int] = None) -> List[str]:
+        return self._walk(db_path, [node_id], 'dst', max_depth)[node_id]
+
+    @service_endpoint(inputs={'db_path': 'str', 'node_ids': 'list', 'max_depth': 'Optional[int]'}, outputs={'upstream': 'dict'}, description='Upstream walk for many roots in one statement. Returns {root: [nodes]}.', tags=['flow', 'query', 'batch'])
+    def upstream_many(self, db_path: str, node_ids: List[str], max_depth: Optional[int] = None) -> Dict[str, List[str]]:
+        return self._walk(db_path, list(dict.fromkeys(node_ids)), 'src', max_depth)
+
+    @service_endpoint(inputs={'db_path': 'str', 'node_ids': 'list', 'max_depth': 'Optional[int]'}, outputs={'downstream': 'dict'}, description='Downstream walk (impact analysis) for many roots in one statement. Returns {root: [nodes]}.', tags=['flow', 'query', 'batch'])
+    def downstream_many(self, db_path: str, node_ids: List[str], max_depth: Optional[int] = None) -> Dict[str, List[str]]:
+        return self._walk(db_path, list(dict.fromkeys(node_ids)), 'dst', max_depth)
 
     @service_endpoint(inputs={'db_path': 'str', 'node_id': 'str'}, outputs={'has_cycle': 'bool', 'cycle_path': 'list'}, description='Detect if node participates in a cycle.', tags=['flow', 'cycle'])
     def detect_cycle(self, db_path: str, node_id: str) -> Dict[str, Any]:
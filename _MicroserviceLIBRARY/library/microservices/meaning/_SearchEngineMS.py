@@ -6,7 +6,9 @@ import struct
 import requests
 import os
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 import time
 REQUIRED = ['requests', 'sqlite_vec']
 MISSING = []
@@ -23,7 +25,69 @@ from microservice_std_lib import service_metadata, service_endpoint
 DEFAULT_OLLAMA_URL = 'http://localhost:11434/api'
 logger = logging.getLogger('SearchEngine')
 
-@service_metadata(name='SearchEngine', version='1.0.0', description='The Oracle: Performs Hybrid Search (Vector Similarity + Keyword Matching) on SQLite databases.', tags=['search', 'vector', 'hybrid', 'rag'], capabilities=['db:sqlite', 'network:outbound', 'compute'], internal_dependencies=['microservice_std_lib'], external_dependencies=['requests', 'sqlite_vec'], side_effects=['db:read', 'network:outbound'])
+
+def normalize_query(text: str) -> str:
+    """Cache key form of a query: trimmed, with internal whitespace collapsed."""
+    return ' '.join(text.split())
+
+
+class QueryEmbeddingCache:
+    """
+    (model, normalized_text) -> vector. A bounded in-memory LRU in front of
+    an optional SQLite table, so vectors survive restarts when db_path is set.
+    """
+
+    def __init__(self, max_entries: int=512, db_path: Optional[str]=None):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._lru: 'OrderedDict[Tuple[str, str], List[float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute('CREATE TABLE IF NOT EXISTS query_embeddings (model TEXT NOT NULL, text TEXT NOT NULL, vector BLOB NOT NULL, created_at REAL, PRIMARY KEY (model, text))')
+            self._conn.commit()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = (model, text)
+        with self._lock:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return vec
+            if self._conn is not None:
+                row = self._conn.execute('SELECT vector FROM query_embeddings WHERE model = ? AND text = ?', key).fetchone()
+                if row is not None:
+                    vec = list(struct.unpack(f'{len(row[0]) // 4}f', row[0]))
+                    self._remember(key, vec)
+                    self.disk_hits += 1
+                    return vec
+            self.misses += 1
+            return None
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        key = (model, text)
+        with self._lock:
+            self._remember(key, vector)
+            if self._conn is not None:
+                self._conn.execute('INSERT OR REPLACE INTO query_embeddings (model, text, vector, created_at) VALUES (?, ?, ?, ?)', (model, text, struct.pack(f'{len(vector)}f', *vector), time.time()))
+                self._conn.commit()
+
+    def _remember(self, key: Tuple[str, str], vector: List[float]) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {'entries': len(self._lru), 'max_entries': self.max_entries, 'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses, 'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0, 'persistent': self._conn is not None}
+
+@service_metadata(name='SearchEngine', version='1.1.0', description='The Oracle: Performs Hybrid Search (Vector Similarity + Keyword Matching) on SQLite databases.', tags=['search', 'vector', 'hybrid', 'rag'], capabilities=['db:sqlite', 'network:outbound', 'compute'], internal_dependencies=['microservice_std_lib'], external_dependencies=['requests', 'sqlite_vec'], side_effects=['db:read', 'network:outbound'])
 class SearchEngineMS:
     """
     The Oracle: Performs Hybrid Search (Vector Similarity + Keyword Matching).
@@ -38,6 +102,8 @@ class SearchEngineMS:
         self.config = config or {}
         self.model_name = self.config.get('model_name', 'phi3:mini-128k')
         self.ollama_url = self.config.get('ollama_url', DEFAULT_OLLAMA_URL)
+        self.start_time = time.time()
+        self.embedding_cache = QueryEmbeddingCache(max_entries=self.config.get('query_cache_size', 512), db_path=self.config.get('query_cache_db'))
 
     @service_endpoint(inputs={'db_path': 'str', 'query': 'str', 'limit': 'int'}, outputs={'results': 'List[Dict]'}, description='Main entry point. Returns a list of results sorted by relevance (RRF).', tags=['search', 'query'], side_effects=['db:read', 'network:outbound'])
     def search(self, db_path: str, query: str, limit: int=10) -> List[Dict[str, Any]]:
@@ -47,6 +113,38 @@ class SearchEngineMS:
         if not os.path.exists(db_path):
             logger.warning(f'Database not found at: {db_path}')
             return []
+        query_vec = self._get_query_embedding(query)
+        if not query_vec:
+            logger.info('Vectorization failed. Falling back to keyword-only search.')
+            return self._keyword_search_only(db_path, query, limit)
+        conn = self._open_vector_db(db_path)
+        try:
+            return self._hybrid_search(conn, query, query_vec, limit)
+        finally:
+            conn.close()
+
+    @service_endpoint(inputs={'db_path': 'str', 'queries': 'List[str]', 'limit': 'int'}, outputs={'results': 'Dict[str, List[Dict]]'}, description='Runs several searches, embedding each distinct uncached query once over one HTTP session and sharing one connection.', tags=['search', 'query', 'batch'], side_effects=['db:read', 'network:outbound'])
+    def search_many(self, db_path: str, queries: List[str], limit: int=10) -> Dict[str, List[Dict[str, Any]]]:
+        """Batched search(): returns {query: results} in the order given."""
+        if not os.path.exists(db_path):
+            logger.warning(f'Database not found at: {db_path}')
+            return {query: [] for query in queries}
+        vectors = self._get_query_embeddings(queries)
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        conn = self._open_vector_db(db_path)
+        try:
+            for query, query_vec in zip(queries, vectors):
+                if query in results:
+                    continue
+                if query_vec:
+                    results[query] = self._hybrid_search(conn, query, query_vec, limit)
+                else:
+                    results[query] = self._keyword_search_only(db_path, query, limit)
+        finally:
+            conn.close()
+        return results
+
+    def _open_vector_db(self, db_path: str) -> sqlite3.Connection:
         conn = sqlite3.connect(db_path)
         try:
             conn.enable_load_extension(True)
@@ -54,12 +152,10 @@ class SearchEngineMS:
             sqlite_vec.load(conn)
         except Exception as e:
             logger.warning(f'Warning: sqlite_vec not loaded. Vector search may fail. Error: {e}')
+        return conn
+
+    def _hybrid_search(self, conn: sqlite3.Connection, query: str, query_vec: List[float], limit: int) -> List[Dict[str, Any]]:
         cursor = conn.cursor()
-        query_vec = self._get_query_embedding(query)
-        if not query_vec:
-            logger.info('Vectorization failed. Falling back to keyword-only search.')
-            conn.close()
-            return self._keyword_search_only(db_path, query, limit)
         vec_bytes = struct.pack(f'{len(query_vec)}f', *query_vec)
         sql = '\n        WITH \n        vec_matches AS (\n            SELECT rowid, distance,\n            row_number() OVER (ORDER BY distance) as rank\n            FROM knowledge_vectors\n            WHERE embedding MATCH ? \n            AND k = 50\n        ),\n        fts_matches AS (\n            SELECT rowid, rank as fts_score,\n            row_number() OVER (ORDER BY rank) as rank\n            FROM documents_fts\n            WHERE documents_fts MATCH ?\n            ORDER BY rank\n            LIMIT 50\n        )\n        SELECT \n            kc.file_path,\n            kc.content,\n            (\n                -- RRF Formula: 1 / (k + rank)\n                COALESCE(1.0 / (60 + v.rank), 0.0) +\n                COALESCE(1.0 / (60 + f.rank), 0.0)\n            ) as rrf_score\n        FROM knowledge_chunks kc\n        LEFT JOIN vec_matches v ON kc.id = v.rowid\n        LEFT JOIN fts_matches f ON kc.id = f.rowid\n        WHERE v.rowid IS NOT NULL OR f.rowid IS NOT NULL\n        ORDER BY rrf_score DESC\n        LIMIT ?;\n        '
         try:
@@ -68,8 +164,6 @@ class SearchEngineMS:
         except sqlite3.OperationalError as e:
             logger.error(f'Search Error (likely missing schema or sqlite-vec): {e}')
             return []
-        finally:
-            conn.close()
         results = []
         for r in rows:
             path, content, score = r
@@ -92,9 +186,42 @@ class SearchEngineMS:
             conn.close()
 
     def _get_query_embedding(self, text: str) -> Optional[List[float]]:
-        """Call Ollama to get the vector for the search query."""
+        """Vector for one search query (cached)."""
+        return self._get_query_embeddings([text])[0]
+
+    def _get_query_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Vectors for several queries: cache first, then Ollama for the distinct misses."""
+        keys = [normalize_query(text) for text in texts]
+        vectors: Dict[str, Optional[List[float]]] = {}
+        missing: List[str] = []
+        for key in keys:
+            if key in vectors or key in missing:
+                continue
+            cached = self.embedding_cache.get(self.model_name, key)
+            if cached is None:
+                missing.append(key)
+            else:
+                vectors[key] = cached
+        if missing:
+            for key, vec in zip(missing, self._request_embeddings(missing)):
+                vectors[key] = vec
+                if vec:
+                    self.embedding_cache.put(self.model_name, key, vec)
+        return [vectors.get(key) for key in keys]
+
+    def _request_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        One Ollama /embeddings call per text over a shared keep-alive session.
+        Stored chunk vectors come from /embeddings (unnormalized), so queries
+        must too: the batch /embed endpoint L2-normalizes and would shift the
+        vec0 L2 distances against them.
+        """
+        with requests.Session() as session:
+            return [self._request_embedding(text, session) for text in texts]
+
+    def _request_embedding(self, text: str, session: Any=requests) -> Optional[List[float]]:
         try:
-            res = requests.post(f'{self.ollama_url}/embeddings', json={'model': self.model_name, 'prompt': text}, timeout=5)
+            res = session.post(f'{self.ollama_url}/embeddings', json={'model': self.model_name, 'prompt': text}, timeout=5)
             if res.status_code == 200:
                 return res.json().get('embedding')
         except Exception as e:
@@ -116,14 +243,10 @@ class SearchEngineMS:
         end = min(len(content), idx + 140)
         snippet = content[start:end].replace('\n', ' ')
         return f'...{snippet}...'
-    @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float'}, description='Standardized health check for service status.', tags=['diagnostic', 'health'])
+    @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float', 'embedding_cache': 'Dict'}, description='Standardized health check for service status.', tags=['diagnostic', 'health'])
     def get_health(self):
         """Returns the operational status of the service."""
-        start = getattr(self, 'start_time', None)
-        if start is None:
-            start = time.time()
-            self.start_time = start
-        return {'status': 'online', 'uptime': time.time() - start}
+        return {'status': 'online', 'uptime': time.time() - self.start_time, 'embedding_cache': self.embedding_cache.stats()}
 
 if __name__ == '__main__':
     print('Initializing Search Engine...')
@@ -1,7 +1,14 @@
+import bisect
+import functools
+import json
 import logging
+import os
 import queue
+import re
+import threading
 import time
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from microservice_std_lib import service_metadata, service_endpoint
 logger = logging.getLogger('TelemetryService')
 
@@ -19,7 +26,200 @@ class QueueHandler(logging.Handler):
         self.log_queue.put(record)
 
 
-@service_metadata(name='TelemetryService', version='1.0.0', description='The Nervous System: Watches the thread-safe LogQueue and updates GUI components with real-time status.', tags=['utility', 'logging', 'telemetry'], capabilities=['log-redirection', 'real-time-updates'], internal_dependencies=['microservice_std_lib'], external_dependencies=[], side_effects=['ui:update'])
+LabelKey = Tuple[Tuple[str, str], ...]
+# Log-spaced latency buckets (seconds): 1us .. ~1000s, ~25% relative error.
+DEFAULT_LATENCY_BOUNDS = tuple((1e-06 * 1.25 ** i for i in range(94)))
+
+
+class Counter:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float=1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float=1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Fixed-bucket histogram; percentiles are reported as the bucket upper bound (clamped to the observed max)."""
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'min', 'max', '_lock')
+
+    def __init__(self, bounds: Tuple[float, ...]=DEFAULT_LATENCY_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for idx, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank and bucket:
+                upper = self.bounds[idx] if idx < len(self.bounds) else self.max
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {'count': self.count, 'sum': self.sum, 'min': self.min if self.count else 0.0, 'max': self.max, 'mean': self.sum / self.count if self.count else 0.0, 'p50': self.percentile(50), 'p90': self.percentile(90), 'p99': self.percentile(99)}
+
+
+class MetricsRegistry:
+    """
+    In-process metrics: counters, gauges and latency histograms keyed by
+    name + labels. Snapshots export as JSON or Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Dict[LabelKey, Any]] = {}
+        self._kinds: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind: str, name: str, labels: Optional[Dict[str, str]], factory: Callable[[], Any]):
+        key: LabelKey = tuple(sorted(((str(k), str(v)) for k, v in (labels or {}).items())))
+        series = self._metrics.get(name)
+        if series is not None and key in series:
+            return series[key]
+        with self._lock:
+            if self._kinds.setdefault(name, kind) != kind:
+                raise ValueError(f'Metric {name!r} already registered as a {self._kinds[name]}')
+            return self._metrics.setdefault(name, {}).setdefault(key, factory())
+
+    def counter(self, name: str, labels: Optional[Dict[str, str]]=None) -> Counter:
+        return self._get('counter', name, labels, Counter)
+
+    def gauge(self, name: str, labels: Optional[Dict[str, str]]=None) -> Gauge:
+        return self._get('gauge', name, labels, Gauge)
+
+    def histogram(self, name: str, labels: Optional[Dict[str, str]]=None) -> Histogram:
+        return self._get('histogram', name, labels, Histogram)
+
+    def instrument(self, name: Optional[str]=None) -> Callable:
+        """
+        Decorator recording latency (the histogram count doubles as the call
+        count) and errors for a callable, labelled endpoint=<name>.
+        functools.wraps keeps @service_endpoint metadata, so it can sit above
+        or below that decorator.
+        """
+
+        def decorator(func):
+            labels = {'endpoint': name or func.__qualname__}
+            errors = self.counter('endpoint_errors_total', labels)
+            duration = self.histogram('endpoint_duration_seconds', labels)
+            clock = time.perf_counter
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = clock()
+                try:
+                    return func(*args, **kwargs)
+                except BaseException:
+                    errors.inc()
+                    raise
+                finally:
+                    duration.observe(clock() - started)
+            return wrapper
+        return decorator
+
+    def instrument_service(self, service: Any) -> List[str]:
+        """Wraps every @service_endpoint method on an existing instance; returns the wrapped names."""
+        wrapped = []
+        prefix = getattr(service, '_service_info', {}).get('name', service.__class__.__name__)
+        for attr in dir(type(service)):
+            method = getattr(service, attr, None)
+            if callable(method) and getattr(method, '_is_endpoint', False) and (not getattr(method, '_is_instrumented', False)):
+                instrumented = self.instrument(f'{prefix}.{attr}')(method)
+                instrumented._is_instrumented = True
+                setattr(service, attr, instrumented)
+                wrapped.append(attr)
+        return wrapped
+
+    def snapshot(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {'generated_at': time.time(), 'metrics': {}}
+        for name, series in list(self._metrics.items()):
+            kind = self._kinds[name]
+            rows = []
+            for key, metric in list(series.items()):
+                value = metric.summary() if kind == 'histogram' else metric.value
+                rows.append({'labels': dict(key), 'value': value})
+            out['metrics'][name] = {'type': kind, 'series': rows}
+        return out
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        for name, series in list(self._metrics.items()):
+            kind = self._kinds[name]
+            metric_name = re.sub('[^a-zA-Z0-9_:]', '_', name)
+            lines.append(f'# TYPE {metric_name} {kind}')
+            for key, metric in list(series.items()):
+                if kind != 'histogram':
+                    lines.append(f'{metric_name}{_prom_labels(key)} {metric.value}')
+                    continue
+                cumulative = 0
+                for bound, bucket in zip(metric.bounds, metric.counts):
+                    cumulative += bucket
+                    if bucket:
+                        lines.append(f"{metric_name}_bucket{_prom_labels(key + (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{metric_name}_bucket{_prom_labels(key + (('le', '+Inf'),))} {metric.count}")
+                lines.append(f'{metric_name}_sum{_prom_labels(key)} {metric.sum}')
+                lines.append(f'{metric_name}_count{_prom_labels(key)} {metric.count}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str, fmt: str='json') -> str:
+        """Atomically writes a snapshot (fmt 'json' or 'prometheus') to path."""
+        if fmt not in ('json', 'prometheus'):
+            raise ValueError(f'Unknown metrics format: {fmt!r}')
+        payload = json.dumps(self.snapshot(), indent=2) if fmt == 'json' else self.to_prometheus()
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + '.tmp')
+        tmp.write_text(payload, encoding='utf-8')
+        os.replace(tmp, target)
+        return str(target)
+
+
+def _prom_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    body = ','.join((f'{k}="{v}"'.replace('\n', ' ') for k, v in key))
+    return '{' + body + '}'
+
+
+@service_metadata(name='TelemetryService', version='1.1.0', description='The Nervous System: Watches the thread-safe LogQueue and updates GUI components with real-time status.', tags=['utility', 'logging', 'telemetry'], capabilities=['log-redirection', 'real-time-updates', 'metrics'], internal_dependencies=['microservice_std_lib'], external_dependencies=[], side_effects=['ui:update'])
 class TelemetryServiceMS:
     """
     The Nervous System.
@@ -31,6 +231,7 @@ class TelemetryServiceMS:
         self.root = self.config.get('root')
         self.panels = self.config.get('panels')
         self.log_queue = queue.Queue()
+        self.metrics = self.config.get('metrics') or MetricsRegistry()
         self.start_time = time.time()
         self._heartbeat_count = 0
         self._setup_logging_hook()
@@ -60,6 +261,22 @@ class TelemetryServiceMS:
         """Allows an agent to verify the pulse of the UI loop."""
         return {'alive': True, 'heartbeat': self._heartbeat_count}
 
+    @service_endpoint(inputs={'service': 'Any'}, outputs={'instrumented': 'List[str]'}, description='Wraps every @service_endpoint method of a service instance to record call count, error count and latency.', tags=['metrics', 'instrumentation'], side_effects=[])
+    def instrument_service(self, service: Any) -> List[str]:
+        return self.metrics.instrument_service(service)
+
+    @service_endpoint(inputs={}, outputs={'snapshot': 'Dict'}, description='Returns counters, gauges and latency histograms (count, mean, p50/p90/p99).', tags=['metrics', 'read'], side_effects=[])
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        return self.metrics.snapshot()
+
+    @service_endpoint(inputs={}, outputs={'text': 'str'}, description='Returns the metrics in Prometheus text exposition format.', tags=['metrics', 'read'], side_effects=[])
+    def metrics_prometheus(self) -> str:
+        return self.metrics.to_prometheus()
+
+    @service_endpoint(inputs={'path': 'str', 'fmt': 'str'}, outputs={'path': 'str'}, description="Writes a metrics snapshot to a local file as 'json' or 'prometheus'.", tags=['metrics', 'export'], side_effects=['filesystem:write'])
+    def export_metrics(self, path: str, fmt: str='json') -> str:
+        return self.metrics.export(path, fmt)
+
     def _poll_queue(self):
         """The heartbeat that drains the queue into the GUI."""
         if not self.root or not self.panels:
@@ -91,3 +308,7 @@ if __name__ == '__main__':
     print('Service ready:', svc)
     logger.info('Internal test message')
     svc._poll_queue()
+    timed = svc.metrics.instrument('demo.sleep')(time.sleep)
+    for _ in range(5):
+        timed(0.01)
+    print(svc.metrics_prometheus())
@@ -2,22 +2,203 @@
 SERVICE_NAME: _NeuralGraphEngineMS
 ENTRY_POINT: _NeuralGraphEngineMS.py
 INTERNAL_DEPENDENCIES: base_service, microservice_std_lib
-EXTERNAL_DEPENDENCIES: pygame
+EXTERNAL_DEPENDENCIES: pygame, numpy (optional: vectorized and Barnes-Hut layout engines)
 """
 import pygame
 import math
 import random
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+try:
+    import numpy as np
+except ImportError:
+    np = None
 pygame.font.init()
 from microservice_std_lib import service_metadata, service_endpoint
 from base_service import BaseService
+REPULSION = 1000
+REPULSION_CUTOFF_SQ = 25000
+MIN_DIST_SQ = 0.1
 
-@service_metadata(name='NeuralGraphEngineMS', version='1.1.0', description='The Cartographer: A physics-driven rendering engine for visualizing complex neural relationships in a 2D force-directed graph.', tags=['visualization', 'graph', 'pygame'], capabilities=['force-directed-layout', 'real-time-rendering'], side_effects=['ui:update', 'render:write'], internal_dependencies=['base_service', 'microservice_std_lib'], external_dependencies=['pygame'])
+class PythonForceLayout:
+    """
+    Reference O(n^2) repulsion: every active node against every other node,
+    in plain Python. Exact; fine for a few hundred nodes.
+    """
+    name = 'python'
+
+    def repulsion(self, xs: Sequence[float], ys: Sequence[float], active: Sequence[bool]) -> Tuple[List[float], List[float]]:
+        n = len(xs)
+        fxs = [0.0] * n
+        fys = [0.0] * n
+        for i in range(n):
+            if not active[i]:
+                continue
+            ax, ay = (xs[i], ys[i])
+            fx, fy = (0.0, 0.0)
+            for j in range(n):
+                if i == j:
+                    continue
+                dx = ax - xs[j]
+                dy = ay - ys[j]
+                dist_sq = dx * dx + dy * dy
+                if dist_sq < MIN_DIST_SQ:
+                    dist_sq = MIN_DIST_SQ
+                if dist_sq > REPULSION_CUTOFF_SQ:
+                    continue
+                f = REPULSION / dist_sq
+                dist = math.sqrt(dist_sq)
+                fx += dx / dist * f
+                fy += dy / dist * f
+            fxs[i] = fx
+            fys[i] = fy
+        return (fxs, fys)
+
+class NumpyForceLayout:
+    """
+    Exact O(n^2) repulsion, vectorized. Rows are processed in blocks so the
+    pairwise matrices stay around `block_pairs` elements.
+    """
+    name = 'numpy'
+
+    def __init__(self, block_pairs: int=4000000):
+        if np is None:
+            raise RuntimeError('NumpyForceLayout requires numpy.')
+        self.block_pairs = block_pairs
+
+    def repulsion(self, xs, ys, active):
+        x = np.asarray(xs, dtype=np.float64)
+        y = np.asarray(ys, dtype=np.float64)
+        fx = np.zeros_like(x)
+        fy = np.zeros_like(y)
+        rows = np.flatnonzero(np.asarray(active, dtype=bool))
+        block = max(1, self.block_pairs // max(1, len(x)))
+        for lo in range(0, len(rows), block):
+            idx = rows[lo:lo + block]
+            dx = x[idx, None] - x[None, :]
+            dy = y[idx, None] - y[None, :]
+            dist_sq = np.maximum(dx * dx + dy * dy, MIN_DIST_SQ)
+            scale = np.where(dist_sq > REPULSION_CUTOFF_SQ, 0.0, REPULSION / (dist_sq * np.sqrt(dist_sq)))
+            scale[np.arange(len(idx)), idx] = 0.0
+            fx[idx] = (dx * scale).sum(axis=1)
+            fy[idx] = (dy * scale).sum(axis=1)
+        return (fx, fy)
+
+class BarnesHutForceLayout:
+    """
+    Barnes-Hut approximation over a quadtree, evaluated breadth-first with
+    numpy: every (node, cell) pair of a tree level is handled in one vector
+    pass. A cell far enough away (size / distance < theta) acts as a single
+    mass at its centre of mass; cells entirely beyond the repulsion cutoff
+    are dropped; near leaf cells are expanded to exact node-node pairs.
+    The quadtree is a pyramid of uniform grids rebuilt from positions each
+    frame (one bincount per level), so there is no per-node Python work.
+    """
+    name = 'barnes_hut'
+
+    def __init__(self, theta: float=0.6, max_depth: int=9):
+        if np is None:
+            raise RuntimeError('BarnesHutForceLayout requires numpy.')
+        self.theta = theta
+        self.max_depth = max_depth
+
+    def repulsion(self, xs, ys, active):
+        x = np.asarray(xs, dtype=np.float64)
+        y = np.asarray(ys, dtype=np.float64)
+        n = len(x)
+        fx = np.zeros(n)
+        fy = np.zeros(n)
+        if n < 2:
+            return (fx, fy)
+        depth = int(min(self.max_depth, max(1, math.ceil(math.log(n, 4)))))
+        min_x, min_y = (x.min(), y.min())
+        span = max(x.max() - min_x, y.max() - min_y, 1.0) * (1 + 1e-09)
+        levels = []
+        for level in range(depth + 1):
+            side = 1 << level
+            cx = np.minimum(((x - min_x) / span * side).astype(np.int64), side - 1)
+            cy = np.minimum(((y - min_y) / span * side).astype(np.int64), side - 1)
+            cell = cy * side + cx
+            count = np.bincount(cell, minlength=side * side)
+            safe = np.maximum(count, 1)
+            com_x = np.bincount(cell, weights=x, minlength=side * side) / safe
+            com_y = np.bincount(cell, weights=y, minlength=side * side) / safe
+            levels.append((side, span / side, cell, count, com_x, com_y))
+        leaf_cell = levels[depth][2]
+        order = np.argsort(leaf_cell, kind='stable')
+        leaf_start = np.searchsorted(leaf_cell[order], np.arange(levels[depth][3].size))
+        theta_sq = self.theta * self.theta
+        pi = np.flatnonzero(np.asarray(active, dtype=bool))
+        pc = np.zeros(len(pi), dtype=np.int64)
+        for level, (side, size, cell, count, com_x, com_y) in enumerate(levels):
+            if not len(pi):
+                break
+            cnt = count[pc]
+            px, py = (x[pi], y[pi])
+            box_x = min_x + pc % side * size
+            box_y = min_y + pc // side * size
+            gap_x = np.maximum(np.maximum(box_x - px, px - (box_x + size)), 0.0)
+            gap_y = np.maximum(np.maximum(box_y - py, py - (box_y + size)), 0.0)
+            keep = (cnt > 0) & (gap_x * gap_x + gap_y * gap_y <= REPULSION_CUTOFF_SQ)
+            pi, pc, cnt, px, py = (pi[keep], pc[keep], cnt[keep], px[keep], py[keep])
+            dx = px - com_x[pc]
+            dy = py - com_y[pc]
+            dist_sq = dx * dx + dy * dy
+            far = (cell[pi] != pc) & (size * size < theta_sq * dist_sq)
+            if far.any():
+                self._accumulate(fx, fy, pi[far], dx[far], dy[far], dist_sq[far], cnt[far])
+            near = ~far
+            pi, pc = (pi[near], pc[near])
+            if level < depth:
+                col, row = (pc % side * 2, pc // side * 2)
+                child_side = side * 2
+                pi = np.repeat(pi, 4)
+                pc = np.stack([row * child_side + col, row * child_side + col + 1, (row + 1) * child_side + col, (row + 1) * child_side + col + 1], axis=1).ravel()
+            else:
+                members = count[pc]
+                total = int(members.sum())
+                if not total:
+                    break
+                offsets = np.arange(total) - np.repeat(np.cumsum(members) - members, members)
+                i_idx = np.repeat(pi, members)
+                j_idx = order[np.repeat(leaf_start[pc], members) + offsets]
+                other = i_idx != j_idx
+                i_idx, j_idx = (i_idx[other], j_idx[other])
+                dx = x[i_idx] - x[j_idx]
+                dy = y[i_idx] - y[j_idx]
+                self._accumulate(fx, fy, i_idx, dx, dy, dx * dx + dy * dy, 1.0)
+        return (fx, fy)
+
+    @staticmethod
+    def _accumulate(fx, fy, idx, dx, dy, dist_sq, mass):
+        dist_sq = np.maximum(dist_sq, MIN_DIST_SQ)
+        scale = np.where(dist_sq > REPULSION_CUTOFF_SQ, 0.0, REPULSION * mass / (dist_sq * np.sqrt(dist_sq)))
+        fx += np.bincount(idx, weights=dx * scale, minlength=len(fx))
+        fy += np.bincount(idx, weights=dy * scale, minlength=len(fy))
+LAYOUT_ENGINES = {'python': PythonForceLayout, 'numpy': NumpyForceLayout, 'barnes_hut': BarnesHutForceLayout}
+
+def select_layout_engine(node_count: int, preferred: str='auto'):
+    """Resolve 'auto' by graph size: python < 150 nodes, numpy < 3000, Barnes-Hut beyond (numpy paths need numpy)."""
+    if preferred != 'auto':
+        return LAYOUT_ENGINES[preferred]()
+    if np is None or node_count < 150:
+        return PythonForceLayout()
+    if node_count < 3000:
+        return NumpyForceLayout()
+    return BarnesHutForceLayout()
+
+@service_metadata(name='NeuralGraphEngineMS', version='1.2.0', description='The Cartographer: A physics-driven rendering engine for visualizing complex neural relationships in a 2D force-directed graph.', tags=['visualization', 'graph', 'pygame'], capabilities=['force-directed-layout', 'real-time-rendering'], side_effects=['ui:update', 'render:write'], internal_dependencies=['base_service', 'microservice_std_lib'], external_dependencies=['pygame'])
 class NeuralGraphEngineMS(BaseService):
 
-    def __init__(self, width, height, bg_color=(16, 16, 24)):
+    def __init__(self, width, height, bg_color=(16, 16, 24), layout_engine: str='auto', settle_epsilon: float=0.02, settle_patience: int=10):
         super().__init__('NeuralGraphEngineMS')
+        if layout_engine != 'auto' and layout_engine not in LAYOUT_ENGINES:
+            raise ValueError(f'Unknown layout engine: {layout_engine!r}')
+        self.layout_engine = layout_engine
+        self._engine = None
+        self.settle_epsilon = settle_epsilon
+        self.settle_patience = settle_patience
+        self._calm_frames = 0
         self.width = width
         self.start_time = time.time()
         self.height = height
@@ -36,7 +217,21 @@ class NeuralGraphEngineMS(BaseService):
     @service_endpoint(inputs={}, outputs={'status': 'str', 'uptime': 'float', 'nodes': 'int', 'settled': 'bool'}, description='Standardized health check to verify the operational state of the graph renderer.', tags=['diagnostic', 'health'])
     def get_health(self) -> Dict[str, Any]:
         """Returns the operational status of the NeuralGraphEngineMS."""
-        return {'status': 'online', 'uptime': time.time() - self.start_time, 'nodes': len(self.nodes), 'settled': self.settled}
+        return {'status': 'online', 'uptime': time.time() - self.start_time, 'nodes': len(self.nodes), 'settled': self.settled, 'layout_engine': self._engine.name if self._engine else self.layout_engine}
+
+    @service_endpoint(inputs={'name': 'str'}, outputs={'layout_engine': 'str'}, description="Selects the repulsion engine: 'auto', 'python', 'numpy' or 'barnes_hut'.", tags=['physics', 'config'], side_effects=['graph:update'])
+    def set_layout_engine(self, name: str) -> str:
+        if name != 'auto' and name not in LAYOUT_ENGINES:
+            raise ValueError(f'Unknown layout engine: {name!r}')
+        self.layout_engine = name
+        self._engine = None
+        self.wake()
+        return name
+
+    def wake(self):
+        """Restarts the simulation and clears the convergence counter."""
+        self.settled = False
+        self._calm_frames = 0
 
     def resize(self, width, height):
         self.width = width
@@ -47,7 +242,8 @@ class NeuralGraphEngineMS(BaseService):
     def set_data(self, nodes, links):
         self.nodes = nodes
         self.links = links
-        self.settled = False
+        self._engine = None
+        self.wake()
         node_map = {node['id']: node for node in self.nodes}
         for n in self.nodes:
             if 'gnn_x' in n and 'gnn_y' in n:
@@ -101,7 +297,7 @@ class NeuralGraphEngineMS(BaseService):
             dist = math.hypot(n['x'] - wx, n['y'] - wy)
             if dist < n['_radius'] * 2:
                 self.dragged_node_idx = i
-                self.settled = False
+                self.wake()
                 return True
         return False
 
@@ -113,7 +309,7 @@ class NeuralGraphEngineMS(BaseService):
             node['y'] = wy
             node['vx'] = 0
             node['vy'] = 0
-            self.settled = False
+            self.wake()
         else:
             prev_hover = self.hovered_node_idx
             self.hovered_node_idx = None
@@ -153,42 +349,33 @@ class NeuralGraphEngineMS(BaseService):
             if n['id'] in node_ids:
                 n['_color'] = (255, 255, 0)
                 n['_radius'] = 12
-        self.settled = False
+        self.wake()
 
     @service_endpoint(inputs={}, outputs={'settled': 'bool'}, description='Performs one iteration of the force-directed physics calculation.', tags=['physics', 'lifecycle'], mode='async', side_effects=['graph:update'])
     def step_physics(self):
         if not self.nodes or self.settled:
-            return
-        REPULSION = 1000
+            return self.settled
         ATTRACTION = 0.01
         CENTER_GRAVITY = 0.01
         DAMPING = 0.85
         cx, cy = (self.width / 2, self.height / 2)
         total_kinetic_energy = 0
+        freeze_chunks = self.zoom < 1.2
+        active = []
         for i, a in enumerate(self.nodes):
-            if i == self.dragged_node_idx:
-                continue
-            if self.zoom < 1.2 and a.get('type') == 'chunk':
+            is_active = i != self.dragged_node_idx and (not (freeze_chunks and a.get('type') == 'chunk'))
+            if not is_active and i != self.dragged_node_idx:
                 a['vx'] = 0
                 a['vy'] = 0
+            active.append(is_active)
+        if self._engine is None:
+            self._engine = select_layout_engine(len(self.nodes), self.layout_engine)
+        rep_x, rep_y = self._engine.repulsion([n['x'] for n in self.nodes], [n['y'] for n in self.nodes], active)
+        for i, a in enumerate(self.nodes):
+            if not active[i]:
                 continue
-            fx, fy = (0, 0)
-            fx += (cx - a['x']) * CENTER_GRAVITY
-            fy += (cy - a['y']) * CENTER_GRAVITY
-            for j, b in enumerate(self.nodes):
-                if i == j:
-                    continue
-                dx = a['x'] - b['x']
-                dy = a['y'] - b['y']
-                dist_sq = dx * dx + dy * dy
-                if dist_sq < 0.1:
-                    dist_sq = 0.1
-                if dist_sq > 25000:
-                    continue
-                f = REPULSION / dist_sq
-                dist = math.sqrt(dist_sq)
-                fx += dx / dist * f
-                fy += dy / dist * f
+            fx = (cx - a['x']) * CENTER_GRAVITY + float(rep_x[i])
+            fy = (cy - a['y']) * CENTER_GRAVITY + float(rep_y[i])
             a['vx'] = (a['vx'] + fx) * DAMPING
             a['vy'] = (a['vy'] + fy) * DAMPING
         for u, v in self.links:
@@ -204,14 +391,24 @@ class NeuralGraphEngineMS(BaseService):
             if v != self.dragged_node_idx:
                 b['vx'] -= fx
                 b['vy'] -= fy
+        moving = 0
         for i, n in enumerate(self.nodes):
             if i == self.dragged_node_idx:
                 continue
             n['x'] += n['vx']
             n['y'] += n['vy']
             total_kinetic_energy += abs(n['vx']) + abs(n['vy'])
-        if total_kinetic_energy < 0.5:
+            moving += 1
+        # Convergence: the legacy absolute floor, or a per-node mean energy
+        # below settle_epsilon for settle_patience consecutive frames (the
+        # absolute floor alone never triggers on large graphs).
+        if total_kinetic_energy / max(1, moving) < self.settle_epsilon:
+            self._calm_frames += 1
+        else:
+            self._calm_frames = 0
+        if total_kinetic_energy < 0.5 or self._calm_frames >= self.settle_patience:
             self.settled = True
+        return self.settled
 
     @service_endpoint(inputs={}, outputs={'raw_data': 'bytes'}, description='Renders the current frame to a byte buffer for display in UI components.', tags=['render', 'output'], side_effects=['ui:update', 'render:write'])
     def get_image_bytes(self):
@@ -116,7 +116,7 @@ class NeuralGraphViewerMS(BaseService, ttk.Frame):
             self.engine.cam_x = hit_node['x']
             self.engine.cam_y = hit_node['y']
             self.engine.zoom = 2.0
-            self.engine.settled = False
+            self.engine.wake()
 
     def on_click(self, event):
         self.last_mouse_x = event.x
@@ -148,7 +148,7 @@ class NeuralGraphViewerMS(BaseService, ttk.Frame):
 
     def on_zoom(self, amount):
         self.engine.zoom_camera(amount, 0, 0)
-        self.engine.settled = False
+        self.engine.wake()
 
     def on_windows_scroll(self, event):
         if event.delta > 0:
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from ..managers.managers import (
     ManifoldManager,
@@ -15,9 +15,14 @@ from ..managers.managers import (
 
 
 class LayerHub:
-    """Single access point for all layer managers in the grouped library."""
+    """
+    Single access point for all layer managers in the grouped library.
+    Managers only hold lazy service proxies, so building the hub imports no
+    service modules; pass warm_up=[service names] (or ["*"]) to construct
+    services up front instead of on first use.
+    """
 
-    def __init__(self):
+    def __init__(self, warm_up: Optional[Iterable[str]] = None):
         self.storage = StorageManager()
         self.structure = StructureManager()
         self.meaning = MeaningManager()
@@ -33,6 +38,16 @@ class LayerHub:
             "observability": self.observability,
             "manifold": self.manifold,
         }
+        if warm_up:
+            self.warm_up(warm_up)
+
+    def warm_up(self, service_names: Iterable[str]) -> List[str]:
+        names = list(service_names)
+        warmed: List[str] = []
+        for manager in self._managers.values():
+            targets = [svc["name"] for svc in manager.list_services()] if "*" in names else names
+            warmed.extend(manager.warm_up(targets))
+        return warmed
 
     def get_manager(self, layer: str) -> Optional[Any]:
         return self._managers.get(str(layer).strip().lower())
@@ -46,6 +61,21 @@ class LayerHub:
     def list_services(self) -> Dict[str, List[Dict[str, Any]]]:
         return {layer: manager.list_services() for layer, manager in self._managers.items()}
 
+    def startup_profile(self) -> Dict[str, Any]:
+        """Per-service import/construction seconds; deferred services report loaded=False."""
+        services = []
+        for layer, manager in self._managers.items():
+            for row in manager.startup_profile():
+                services.append({"layer": layer, **row})
+        loaded = [row for row in services if row["loaded"]]
+        return {
+            "services": services,
+            "loaded": len(loaded),
+            "deferred": len(services) - len(loaded),
+            "import_s": sum(row["import_s"] for row in loaded),
+            "construct_s": sum(row["construct_s"] for row in loaded),
+        }
+
     def resolve_service(self, service_name: str) -> Optional[Any]:
         target = str(service_name).strip()
         for manager in self._managers.values():
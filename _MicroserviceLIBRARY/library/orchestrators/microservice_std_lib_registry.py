@@ -9,9 +9,83 @@ Designed to latch onto what @service_metadata already provides:
 Nothing in existing services needs to change except the injection of register().
 """
 
+import importlib
+import threading
+import time
 from typing import Any, Dict, List, Optional
 
 
+# ---------------------------------------------------------------------------
+# Lazy service proxy
+# ---------------------------------------------------------------------------
+
+class LazyService:
+    """
+    Stand-in registered for a service that has not been built yet.
+    The first attribute access imports the service module, constructs the
+    class, and re-registers the real instance (with its @service_metadata)
+    in place of the proxy. Import and construction times are kept for the
+    startup profile. The version/tags/capabilities in the spec are what the
+    registry reports until then.
+    """
+
+    def __init__(self, name: str, module_name: str, class_name: Optional[str] = None,
+                 registry: Optional["ServiceRegistry"] = None, group: Optional[str] = None,
+                 version: Optional[str] = None, tags: Optional[List[str]] = None,
+                 capabilities: Optional[List[str]] = None):
+        self._lazy_name = name
+        self._lazy_module = module_name
+        self._lazy_class = class_name or name
+        self._lazy_registry = registry
+        self._lazy_group = group
+        self._lazy_version = version
+        self._lazy_tags = list(tags or [])
+        self._lazy_capabilities = list(capabilities or [])
+        self._lazy_instance: Any = None
+        self._lazy_lock = threading.Lock()
+        self._lazy_profile: Dict[str, Any] = {"service": name, "module": module_name, "loaded": False, "import_s": 0.0, "construct_s": 0.0}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._lazy_instance is not None
+
+    def materialize(self) -> Any:
+        if self._lazy_instance is not None:
+            return self._lazy_instance
+        with self._lazy_lock:
+            if self._lazy_instance is None:
+                started = time.perf_counter()
+                module = importlib.import_module(self._lazy_module)
+                imported = time.perf_counter()
+                instance = getattr(module, self._lazy_class)()
+                built = time.perf_counter()
+                self._lazy_profile.update(loaded=True, import_s=imported - started, construct_s=built - imported)
+                if self._lazy_registry is not None:
+                    register = getattr(instance, "register", None)
+                    if callable(register):
+                        register(self._lazy_registry, group=self._lazy_group)
+                    else:
+                        self._lazy_registry.register(
+                            self._lazy_name, self._lazy_version or "0.0.0", self._lazy_tags,
+                            self._lazy_capabilities, instance, group=self._lazy_group,
+                        )
+                self._lazy_instance = instance
+        return self._lazy_instance
+
+    def startup_profile(self) -> Dict[str, Any]:
+        return dict(self._lazy_profile)
+
+    def __getattr__(self, item: str) -> Any:
+        # Only reached for attributes the proxy itself does not define.
+        if item.startswith("_lazy_"):
+            raise AttributeError(item)
+        return getattr(self.materialize(), item)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "deferred"
+        return f"<LazyService {self._lazy_name} ({state})>"
+
+
 # ---------------------------------------------------------------------------
 # Registry
 # ---------------------------------------------------------------------------
@@ -34,6 +108,7 @@ class ServiceRegistry:
         instance: Any,
         group: Optional[str] = None,
     ) -> None:
+        previous = self._services.get(name)
         self._services[name] = {
             "name": name,
             "version": version,
@@ -42,6 +117,36 @@ class ServiceRegistry:
             "group": group,
             "instance": instance,
         }
+        if previous is not None and "lazy" in previous:
+            self._services[name]["lazy"] = previous["lazy"]
+
+    def register_lazy(
+        self,
+        name: str,
+        module_name: str,
+        class_name: Optional[str] = None,
+        group: Optional[str] = None,
+        version: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        capabilities: Optional[List[str]] = None,
+    ) -> LazyService:
+        """
+        Register a LazyService placeholder; the real entry replaces it on first use.
+        version/tags/capabilities should mirror the service's @service_metadata so
+        list_by_tag() and list_all() see deferred services too.
+        """
+        proxy = LazyService(name, module_name, class_name, registry=self, group=group,
+                            version=version, tags=tags, capabilities=capabilities)
+        self._services[name] = {
+            "name": name,
+            "version": version,
+            "tags": list(proxy._lazy_tags),
+            "capabilities": list(proxy._lazy_capabilities),
+            "group": group,
+            "instance": proxy,
+            "lazy": proxy,
+        }
+        return proxy
 
     def get(self, name: str) -> Optional[Any]:
         entry = self._services.get(name)
@@ -49,10 +154,13 @@ class ServiceRegistry:
 
     def list_all(self) -> List[Dict[str, Any]]:
         return [
-            {k: v for k, v in entry.items() if k != "instance"}
+            {k: v for k, v in entry.items() if k not in ("instance", "lazy")}
             for entry in self._services.values()
         ]
 
+    def startup_profile(self) -> List[Dict[str, Any]]:
+        return [entry["lazy"].startup_profile() for entry in self._services.values() if "lazy" in entry]
+
     def list_by_tag(self, tag: str) -> List[str]:
         return [
             name for name, entry in self._services.items()
@@ -69,6 +177,10 @@ class ServiceRegistry:
         results = {}
         for name, entry in self._services.items():
             inst = entry["instance"]
+            if isinstance(inst, LazyService):
+                # Health checks never force construction.
+                results[name] = {"status": "deferred"}
+                continue
             try:
                 results[name] = inst.get_health()
             except Exception as e:
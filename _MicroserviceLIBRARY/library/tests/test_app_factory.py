@@ -305,6 +305,49 @@ class AppFactoryIntegrationTests(unittest.TestCase):
         health = self._run_health(app_dir)
         self.assertIn("FingerprintScannerMS", health["deferred"])
 
+    def test_static_restamp_only_touches_changed_files(self):
+        app_dir = self._app_dir("incremental_static_app")
+        stamper = AppStamper(self.query, cas_dir=self.temp_root / "stamp_cas")
+        manifest = self.query.recommend_blueprint(
+            ["FingerprintScannerMS", "ScannerMS"],
+            destination=str(app_dir),
+            name="Incremental App",
+            vendor_mode="static",
+        )
+        first = stamper.stamp(manifest)
+        self.assertTrue(first["validation"]["ok"], msg=json.dumps(first, indent=2))
+        vendored = app_dir / "vendor" / "library" / "microservices" / "core" / "_FingerprintScannerMS.py"
+        self.assertGreater(vendored.stat().st_nlink, 1)
+
+        second = stamper.stamp(manifest)
+        self.assertTrue(second["validation"]["ok"])
+        self.assertEqual(second["changed_files"], [])
+        self.assertEqual(second["removed_files"], [])
+
+        self.assertFalse(vendored.stat().st_mode & 0o222)
+        # An editor that forces the write edits the shared blob in place.
+        vendored.chmod(0o644)
+        vendored.write_text("# locally edited\n", encoding="utf-8")
+        third = stamper.stamp(manifest)
+        self.assertEqual(third["changed_files"], [str(vendored)])
+        self.assertTrue(stamper.verify_app_integrity(app_dir)["ok"])
+        source = self.repo_root / "library" / "microservices" / "core" / "_FingerprintScannerMS.py"
+        self.assertEqual(vendored.read_bytes(), source.read_bytes())
+        self.assertFalse(vendored.stat().st_mode & 0o222)
+
+        reduced = self.query.recommend_blueprint(
+            ["FingerprintScannerMS"],
+            destination=str(app_dir),
+            name="Incremental App",
+            vendor_mode="static",
+        )
+        fourth = stamper.stamp(reduced)
+        self.assertTrue(fourth["validation"]["ok"], msg=json.dumps(fourth, indent=2))
+        scanner = app_dir / "vendor" / "library" / "microservices" / "core" / "_ScannerMS.py"
+        self.assertIn(str(scanner), fourth["removed_files"])
+        self.assertFalse(scanner.exists())
+        self.assertTrue(vendored.exists())
+
     def test_filtered_external_dependencies_exclude_ttk(self):
         app_dir = self._app_dir("ui_requirements_app")
         manifest = self.query.recommend_blueprint(
@@ -371,6 +414,93 @@ class AppFactoryIntegrationTests(unittest.TestCase):
             self.assertTrue(resolved["validation"].cycle_warnings)
             self.assertFalse(resolved["validation"].errors)
 
+    def test_incremental_build_skips_unchanged_modules_by_stat(self):
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            temp_dir = Path(temp_dir_name)
+            core_dir = temp_dir / "library" / "microservices" / "core"
+            core_dir.mkdir(parents=True, exist_ok=True)
+            (temp_dir / "library" / "__init__.py").write_text("", encoding="utf-8")
+            (core_dir / "_AlphaMS.py").write_text(
+                "from microservice_std_lib import service_metadata\n\n"
+                "@service_metadata(name='Alpha', version='1.0.0', description='alpha', tags=['test'], internal_dependencies=['BetaMS'])\n"
+                "class AlphaMS:\n"
+                "    pass\n",
+                encoding="utf-8",
+            )
+            builder = CatalogBuilder(
+                library_root=temp_dir / "library",
+                catalog_db_path=temp_dir / "catalog.db",
+                mapping_report_path=temp_dir / "mapping.json",
+            )
+            self.assertEqual(builder.build(incremental=False)["changed_modules"], 1)
+
+            with mock.patch.object(CatalogBuilder, "_parse_module", side_effect=AssertionError("unchanged module was parsed")):
+                report = builder.build(incremental=True)
+            self.assertEqual(report["changed_modules"], 0)
+            self.assertEqual(report["unchanged_modules"], 1)
+
+            (core_dir / "_BetaMS.py").write_text(
+                "from microservice_std_lib import service_metadata\n\n"
+                "@service_metadata(name='Beta', version='1.0.0', description='beta', tags=['test'])\n"
+                "class BetaMS:\n"
+                "    pass\n",
+                encoding="utf-8",
+            )
+            report = builder.build(incremental=True)
+            self.assertEqual((report["changed_modules"], report["unchanged_modules"]), (1, 1))
+            conn = sqlite3.connect(temp_dir / "catalog.db")
+            try:
+                resolved = conn.execute(
+                    "SELECT is_resolved FROM dependencies WHERE dependency_type = 'requires_code' AND evidence_json LIKE '%BetaMS%'"
+                ).fetchone()
+            finally:
+                conn.close()
+            self.assertEqual(resolved[0], 1)
+
+    def test_incremental_build_repoints_refs_claimed_by_new_services(self):
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            temp_dir = Path(temp_dir_name)
+            core_dir = temp_dir / "library" / "microservices" / "core"
+            core_dir.mkdir(parents=True, exist_ok=True)
+            (temp_dir / "library" / "__init__.py").write_text("", encoding="utf-8")
+            (core_dir / "_AlphaMS.py").write_text(
+                "from microservice_std_lib import service_metadata\n\n"
+                "@service_metadata(name='Alpha', version='1.0.0', description='alpha', tags=['test'], internal_dependencies=['Gamma'])\n"
+                "class AlphaMS:\n"
+                "    pass\n",
+                encoding="utf-8",
+            )
+            (core_dir / "Gamma.py").write_text("VALUE = 1\n", encoding="utf-8")
+            builder = CatalogBuilder(
+                library_root=temp_dir / "library",
+                catalog_db_path=temp_dir / "catalog.db",
+                mapping_report_path=temp_dir / "mapping.json",
+            )
+            builder.build(incremental=False)
+
+            def gamma_target():
+                conn = sqlite3.connect(temp_dir / "catalog.db")
+                try:
+                    return conn.execute(
+                        "SELECT dst_service_id, dst_artifact_id FROM dependencies WHERE evidence_json LIKE '%Gamma%'"
+                    ).fetchone()
+                finally:
+                    conn.close()
+
+            self.assertIsNotNone(gamma_target()[1])
+            (core_dir / "_ZetaMS.py").write_text(
+                "from microservice_std_lib import service_metadata\n\n"
+                "@service_metadata(name='Gamma', version='1.0.0', description='zeta', tags=['test'])\n"
+                "class ZetaMS:\n"
+                "    pass\n",
+                encoding="utf-8",
+            )
+            builder.build(incremental=True)
+            incremental = gamma_target()
+            builder.build(incremental=False)
+            self.assertEqual(incremental, gamma_target())
+            self.assertIsNotNone(incremental[0])
+
     def test_install_pack_skips_collisions_and_rebuilds_catalog(self):
         with tempfile.TemporaryDirectory() as temp_dir_name:
             temp_dir = Path(temp_dir_name)
@@ -423,6 +553,38 @@ class AppFactoryIntegrationTests(unittest.TestCase):
             self.assertIn("1.0.0", installed_file.read_text(encoding="utf-8"))
 
 
+    def test_layer_hub_constructs_services_on_first_use(self):
+        from library.orchestrators import LayerHub
+
+        hub = LayerHub()
+        self.assertEqual(hub.startup_profile()["loaded"], 0)
+        self.assertEqual(hub.health()["structure"]["DagOpsMS"], {"status": "deferred"})
+
+        self.assertEqual(hub.resolve_service("DagOpsMS").get_health()["status"], "online")
+        profile = hub.startup_profile()
+        self.assertEqual(profile["loaded"], 1)
+        loaded = [row for row in profile["services"] if row["loaded"]]
+        self.assertEqual((loaded[0]["layer"], loaded[0]["service"]), ("structure", "DagOpsMS"))
+        self.assertEqual(hub.structure.list_services()[0]["version"], "1.0.0")
+
+        warmed = LayerHub(warm_up=["IntervalIndexMS"]).startup_profile()
+        self.assertEqual([row["service"] for row in warmed["services"] if row["loaded"]], ["IntervalIndexMS"])
+
+    def test_deferred_services_carry_metadata_and_count_as_healthy(self):
+        from library.orchestrators import LayerHub
+        from library.microservices.grouped.meaning_relation_observability_manifold_groups import LayerHealthMS
+
+        storage = LayerHub().storage
+        entry = {row["name"]: row for row in storage.list_services()}["Blake3HashMS"]
+        self.assertEqual(entry["version"], "1.0.0")
+        self.assertIn("hash", entry["tags"])
+        self.assertIn("MerkleRootMS", storage.registry.list_by_tag("merkle"))
+
+        report = LayerHealthMS().poll_all(storage.registry)
+        self.assertEqual((report["deferred"], report["degraded"]), (4, 0))
+        self.assertEqual(LayerHealthMS().poll_by_tag(storage.registry, "hash"), {"Blake3HashMS": {"status": "deferred"}})
+        self.assertFalse(storage.registry.get("Blake3HashMS").is_loaded)
+
     def test_default_schema_uses_foundry_palette(self):
         preview = UiSchemaPreviewService()
         schema = preview.default_schema('tkinter_base_pack')
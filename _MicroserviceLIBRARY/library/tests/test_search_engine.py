@@ -0,0 +1,245 @@
+import hashlib
+import importlib.util
+import json
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+if str(LIBRARY_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBRARY_ROOT))
+
+HAS_REQUESTS = importlib.util.find_spec("requests") is not None
+DIM = 8
+
+
+def _vec_loadable():
+    if importlib.util.find_spec("sqlite_vec") is None:
+        return False
+    conn = sqlite3.connect(":memory:")
+    try:
+        import sqlite_vec
+
+        conn.enable_load_extension(True)
+        sqlite_vec.load(conn)
+        return True
+    except (AttributeError, sqlite3.OperationalError):
+        return False
+    finally:
+        conn.close()
+
+
+HAS_VEC = _vec_loadable()
+
+
+def _fts5_available():
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(body)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+HAS_FTS5 = _fts5_available()
+
+
+def stub_vector(text):
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [b / 255.0 for b in digest[:DIM]]
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    """Deterministic stand-in for Ollama's /api/embeddings (other paths 404)."""
+
+    calls = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).calls.append((self.path, body))
+        if self.path == "/api/embeddings":
+            payload = {"embedding": stub_vector(body["prompt"])}
+        else:
+            self.send_error(404)
+            return
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipUnless(HAS_REQUESTS, "requests is not installed")
+class SearchEngineEmbeddingCacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from microservices.meaning._SearchEngineMS import SearchEngineMS
+
+        cls.SearchEngineMS = SearchEngineMS
+        cls.server = HTTPServer(("127.0.0.1", 0), _StubOllama)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/api"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _StubOllama.calls = []
+        self._tmp = tempfile.TemporaryDirectory()
+        self.temp_root = Path(self._tmp.name)
+        self.db_path = str(self.temp_root / "knowledge.db")
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE knowledge_chunks (id INTEGER PRIMARY KEY, file_path TEXT, content TEXT)")
+        conn.execute("CREATE VIRTUAL TABLE documents_fts USING fts5(file_path, content)")
+        rows = [(1, "a.py", "parse the config file"), (2, "b.py", "render the graph view")]
+        conn.executemany("INSERT INTO knowledge_chunks VALUES (?, ?, ?)", rows)
+        conn.executemany("INSERT INTO documents_fts (rowid, file_path, content) VALUES (?, ?, ?)", rows)
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _engine(self, **config):
+        return self.SearchEngineMS({"ollama_url": self.url, "model_name": "stub", **config})
+
+    def _add_vectors(self):
+        import sqlite_vec
+
+        conn = sqlite3.connect(self.db_path)
+        conn.enable_load_extension(True)
+        sqlite_vec.load(conn)
+        conn.execute(f"CREATE VIRTUAL TABLE knowledge_vectors USING vec0(embedding float[{DIM}])")
+        for rowid, content in conn.execute("SELECT id, content FROM knowledge_chunks").fetchall():
+            conn.execute("INSERT INTO knowledge_vectors (rowid, embedding) VALUES (?, ?)", (rowid, struct.pack(f"{DIM}f", *stub_vector(content))))
+        conn.commit()
+        conn.close()
+
+    def _embedded(self):
+        return [body["prompt"] for path, body in _StubOllama.calls if path == "/api/embeddings"]
+
+    def test_repeated_queries_hit_the_lru(self):
+        engine = self._engine(query_cache_size=4)
+        engine.search(self.db_path, "parse  config")
+        engine.search(self.db_path, " parse config ")
+        self.assertEqual(self._embedded(), ["parse config"])
+        stats = engine.get_health()["embedding_cache"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_lru_is_bounded(self):
+        engine = self._engine(query_cache_size=2)
+        for text in ("one", "two", "three", "one"):
+            engine.search(self.db_path, text)
+        self.assertEqual(engine.get_health()["embedding_cache"]["entries"], 2)
+        self.assertEqual(self._embedded(), ["one", "two", "three", "one"])
+
+    def test_sqlite_cache_survives_restart(self):
+        cache_db = str(self.temp_root / "query_cache.db")
+        self._engine(query_cache_db=cache_db).search(self.db_path, "render graph")
+        engine = self._engine(query_cache_db=cache_db)
+        engine.search(self.db_path, "render graph")
+        self.assertEqual(self._embedded(), ["render graph"])
+        self.assertEqual(engine.get_health()["embedding_cache"]["disk_hits"], 1)
+
+    def test_queries_use_the_document_embedding_endpoint(self):
+        engine = self._engine()
+        engine.search(self.db_path, "config")
+        engine.search_many(self.db_path, ["config", "graph", "view", "graph"], limit=5)
+        self.assertEqual({path for path, _ in _StubOllama.calls}, {"/api/embeddings"})
+        self.assertEqual(self._embedded(), ["config", "graph", "view"])
+
+    def test_search_many_falls_back_to_keywords_without_embeddings(self):
+        engine = self.SearchEngineMS({"ollama_url": self.url + "/offline", "model_name": "stub"})
+        results = engine.search_many(self.db_path, ["config", "graph", "config"], limit=5)
+        self.assertEqual(list(results), ["config", "graph"])
+        self.assertEqual([r["path"] for r in results["config"]], ["a.py"])
+        self.assertEqual([r["path"] for r in results["graph"]], ["b.py"])
+        self.assertIn("config", results["config"][0]["snippet"])
+
+    @unittest.skipUnless(HAS_VEC, "sqlite_vec cannot be loaded")
+    def test_search_many_matches_search(self):
+        self._add_vectors()
+        engine = self._engine()
+        queries = ["parse the config file", "render the graph view"]
+        batched = engine.search_many(self.db_path, queries, limit=5)
+        for query in queries:
+            self.assertEqual(batched[query], engine.search(self.db_path, query, limit=5))
+        self.assertEqual(batched["parse the config file"][0]["path"], "a.py")
+        self.assertEqual(batched["render the graph view"][0]["path"], "b.py")
+
+
+class LexicalIndexEngineTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _index(self, engine):
+        from microservices.grouped.meaning_relation_observability_manifold_groups import LexicalIndexMS
+
+        service = LexicalIndexMS(engine=engine)
+        db_path = str(Path(self.tmp.name) / f"{engine}.db")
+        service.index_terms(db_path, ["alpha", "beta", "Foo.Bar"], "a")
+        service.index_terms(db_path, ["alpha", "alps", "gamma"], "b")
+        service.index_terms(db_path, ["alpha"], "b")
+        return service, db_path
+
+    @unittest.skipUnless(HAS_FTS5, "SQLite build lacks FTS5")
+    def test_engines_agree_on_prefix_search_and_and_semantics(self):
+        for engine in ("table", "fts5"):
+            with self.subTest(engine=engine):
+                service, db_path = self._index(engine)
+                self.assertEqual(
+                    service.prefix_search(db_path, "alp"),
+                    [
+                        {"term": "alpha", "node_id": "b", "frequency": 2},
+                        {"term": "alpha", "node_id": "a", "frequency": 1},
+                        {"term": "alps", "node_id": "b", "frequency": 1},
+                    ],
+                )
+                self.assertEqual(service.prefix_search(db_path, "foo."), [{"term": "foo.bar", "node_id": "a", "frequency": 1}])
+                self.assertEqual([row["node_id"] for row in service.search(db_path, "alpha beta")], ["a"])
+                self.assertEqual([row["node_id"] for row in service.search(db_path, "alp gam", prefix=True)], ["b"])
+
+    @unittest.skipUnless(HAS_FTS5, "SQLite build lacks FTS5")
+    def test_fts5_engine_writes_only_the_fts_store(self):
+        service, db_path = self._index("fts5")
+        conn = sqlite3.connect(db_path)
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        finally:
+            conn.close()
+        self.assertIn("lexical_fts", tables)
+        self.assertNotIn("lexical_terms", tables)
+
+    def test_term_keyed_table_is_upgraded(self):
+        from microservices.grouped.meaning_relation_observability_manifold_groups import LexicalIndexMS
+
+        db_path = str(Path(self.tmp.name) / "old.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE lexical_terms (term TEXT PRIMARY KEY, node_id TEXT, frequency INTEGER DEFAULT 1)")
+        conn.execute("INSERT INTO lexical_terms VALUES ('alpha', 'a', 3)")
+        conn.commit()
+        conn.close()
+        service = LexicalIndexMS(engine="table")
+        service.index_terms(db_path, ["alpha"], "b")
+        self.assertEqual([(row["node_id"], row["frequency"]) for row in service.prefix_search(db_path, "al")], [("a", 3), ("b", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+bench_diff_engine.py
+Edits one file many times through DiffEngineMS and reports bytes stored in
+the revision chain versus full-copy-per-revision storage, plus the time to
+reconstruct random revisions and to page through history.
+
+Usage:
+    python bench_diff_engine.py
+    python bench_diff_engine.py --edits 10000 --lines 1000 --snapshot-interval 50
+"""
+
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+if str(LIBRARY_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBRARY_ROOT))
+
+from microservices.db._DiffEngineMS import DiffEngineMS  # noqa: E402
+
+
+def edit(lines, rng: random.Random, step: int) -> None:
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(lines))
+        roll = rng.random()
+        if roll < 0.6:
+            lines[i] = f'    value_{step}_{i} = compute({rng.random():.6f})\n'
+        elif roll < 0.8 or len(lines) < 10:
+            lines.insert(i, f'    # note {step}\n')
+        else:
+            del lines[i]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--edits', type=int, default=10_000)
+    parser.add_argument('--lines', type=int, default=1000)
+    parser.add_argument('--snapshot-interval', type=int, default=50)
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=9)
+    args = parser.parse_args()
+    logging.getLogger('DiffEngine').setLevel(logging.WARNING)
+    warnings.simplefilter('ignore', DeprecationWarning)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = DiffEngineMS({'db_path': str(Path(tmp) / 'diff.db'), 'snapshot_interval': args.snapshot_interval})
+        lines = [f'    line_{i} = {i}\n' for i in range(args.lines)]
+        full_copy_bytes = 0
+        started = time.perf_counter()
+        for step in range(args.edits + 1):
+            content = ''.join(lines)
+            full_copy_bytes += len(content.encode('utf-8'))
+            engine.update_file('bench.py', content)
+            edit(lines, rng, step)
+        write_s = time.perf_counter() - started
+
+        stats = engine.storage_stats('bench.py')
+        print(f"{stats['revisions']:,} revisions of a ~{args.lines}-line file, snapshot every {args.snapshot_interval}")
+        print(f'write          {write_s:8.2f}s  ({args.edits / write_s:,.0f} edits/s)')
+        print(f"stored         {stats['total_bytes'] / 1e6:8.2f} MB  (deltas {stats['delta_bytes'] / 1e6:.2f} MB, "
+              f"{stats['snapshots']} snapshots {stats['snapshot_bytes'] / 1e6:.2f} MB)")
+        print(f'full copies    {full_copy_bytes / 1e6:8.2f} MB  (x{full_copy_bytes / stats["total_bytes"]:.0f})')
+
+        timings = []
+        for rev in (rng.randrange(stats['revisions']) for _ in range(args.samples)):
+            started = time.perf_counter()
+            engine.get_revision('bench.py', rev)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f'reconstruct    mean {sum(timings) / len(timings) * 1000:6.2f} ms  max {timings[-1] * 1000:6.2f} ms')
+
+        started = time.perf_counter()
+        page = engine.get_history('bench.py', limit=50, offset=args.edits // 2)
+        print(f'history page   {len(page)} entries with diffs in {(time.perf_counter() - started) * 1000:.1f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""
+bench_interval_index.py
+Compares IntervalIndexMS query latency for the SQL engine vs the in-memory
+interval tree engine over a synthetic span table.
+
+Usage:
+    python bench_interval_index.py
+    python bench_interval_index.py --spans 1000000 --queries 500
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+if str(LIBRARY_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBRARY_ROOT))
+
+from microservices.grouped.structure_group import IntervalIndexMS  # noqa: E402
+
+
+def populate(db_path: str, spans: int, seed: int) -> None:
+    rng = random.Random(seed)
+    IntervalIndexMS()._open(db_path).close()
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = []
+        for i in range(spans):
+            start = rng.randrange(0, spans * 4)
+            rows.append((f'span-{i}', f'node-{i % 1000}', start, start + rng.randrange(1, 200), ''))
+        conn.executemany('INSERT INTO interval_index VALUES (?, ?, ?, ?, ?)', rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def time_queries(service: IntervalIndexMS, db_path: str, queries, kind: str):
+    total_hits = 0
+    started = time.perf_counter()
+    for start, end in queries:
+        if kind == 'overlapping':
+            total_hits += len(service.spans_overlapping(db_path, start, end))
+        else:
+            total_hits += len(service.spans_at_line(db_path, start))
+    return time.perf_counter() - started, total_hits
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--spans', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / 'intervals.db')
+        t0 = time.perf_counter()
+        populate(db_path, args.spans, args.seed)
+        print(f'populated {args.spans:,} spans in {time.perf_counter() - t0:.2f}s')
+
+        rng = random.Random(args.seed + 1)
+        queries = []
+        for _ in range(args.queries):
+            start = rng.randrange(0, args.spans * 4)
+            queries.append((start, start + rng.randrange(0, 50)))
+
+        sql = IntervalIndexMS(engine='sql')
+        tree = IntervalIndexMS(engine='tree')
+        t0 = time.perf_counter()
+        tree.spans_at_line(db_path, 0)
+        print(f'tree build (first use) {time.perf_counter() - t0:.2f}s')
+
+        for kind in ('overlapping', 'containing'):
+            sql_s, sql_hits = time_queries(sql, db_path, queries, kind)
+            tree_s, tree_hits = time_queries(tree, db_path, queries, kind)
+            if sql_hits != tree_hits:
+                print(f'MISMATCH {kind}: sql={sql_hits} tree={tree_hits}')
+                return 1
+            print(f'{kind:<12} sql {sql_s / len(queries) * 1000:8.3f} ms/query | '
+                  f'tree {tree_s / len(queries) * 1000:8.3f} ms/query | '
+                  f'speedup x{sql_s / max(tree_s, 1e-9):.1f} | hits {tree_hits}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+"""
+bench_iso_process.py
+Throughput of IsoProcessMS over trivial payloads: a fresh spawn per call
+versus the warm worker pool.
+
+Usage:
+    python bench_iso_process.py
+    python bench_iso_process.py --payloads 100 --pool-size 4 --load-delay 0.2
+"""
+
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+if str(LIBRARY_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBRARY_ROOT))
+
+from microservices.core._IsoProcessMS import IsoProcessMS  # noqa: E402
+
+
+def run(service: IsoProcessMS, payloads: int, concurrency: int, task_config: dict) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda i: service.execute(f'payload-{i}', task_config), range(payloads)))
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--payloads', type=int, default=100)
+    parser.add_argument('--pool-size', type=int, default=4)
+    parser.add_argument('--load-delay', type=float, default=0.2, help='simulated heavy-library/model load per worker start')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    task_config = {'model_name': 'bench-model', 'load_delay': args.load_delay, 'chunk_delay': 0.0}
+    spawn = IsoProcessMS({'mode': 'spawn'})
+    pooled = IsoProcessMS({'mode': 'pool', 'pool_size': args.pool_size})
+    try:
+        spawn_s = run(spawn, args.payloads, args.pool_size, task_config)
+        pool_s = run(pooled, args.payloads, args.pool_size, task_config)
+        stats = pooled.pool_stats()
+    finally:
+        pooled.shutdown()
+    print(f'{args.payloads} payloads, concurrency {args.pool_size}')
+    print(f'spawn per call: {spawn_s:7.2f}s  ({args.payloads / spawn_s:7.1f} payloads/s)')
+    print(f'warm pool     : {pool_s:7.2f}s  ({args.payloads / pool_s:7.1f} payloads/s)  x{spawn_s / pool_s:.1f}')
+    print(f'pool stats    : {stats}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
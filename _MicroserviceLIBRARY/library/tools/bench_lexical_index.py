@@ -0,0 +1,74 @@
+"""
+bench_lexical_index.py
+Index and query throughput of LexicalIndexMS for the original term table
+versus the FTS5 engine over a synthetic corpus.
+
+Usage:
+    python bench_lexical_index.py
+    python bench_lexical_index.py --docs 100000 --terms-per-doc 40 --queries 200
+"""
+
+import argparse
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+if str(LIBRARY_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBRARY_ROOT))
+
+from microservices.grouped.meaning_relation_observability_manifold_groups import LexicalIndexMS  # noqa: E402
+
+
+def make_corpus(docs: int, terms_per_doc: int, vocabulary: int, seed: int):
+    rng = random.Random(seed)
+    vocab = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(vocabulary)]
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]  # Zipf-ish term distribution
+    corpus = [{'node_id': f'node-{i}', 'terms': rng.choices(vocab, weights, k=terms_per_doc)} for i in range(docs)]
+    return vocab, corpus
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--terms-per-doc', type=int, default=40)
+    parser.add_argument('--vocabulary', type=int, default=50_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    vocab, corpus = make_corpus(args.docs, args.terms_per_doc, args.vocabulary, args.seed)
+    rng = random.Random(args.seed + 1)
+    prefixes = [rng.choice(vocab)[:3] for _ in range(args.queries)]
+    words = [rng.choice(vocab[:5000]) for _ in range(args.queries)]
+    print(f'{args.docs:,} docs x {args.terms_per_doc} terms, vocabulary {args.vocabulary:,}')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in ('table', 'fts5'):
+            service = LexicalIndexMS(engine=engine)
+            db_path = str(Path(tmp) / f'{engine}.db')
+            started = time.perf_counter()
+            service.index_many(db_path, corpus)
+            index_s = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for prefix in prefixes:
+                service.prefix_search(db_path, prefix)
+            prefix_s = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for word in words:
+                service.search(db_path, word, limit=10)
+            search_s = time.perf_counter() - started
+
+            print(f'{engine:<6} index {args.docs / index_s:9,.0f} docs/s | '
+                  f'prefix_search {prefix_s / args.queries * 1000:7.2f} ms/query | '
+                  f'search {search_s / args.queries * 1000:7.2f} ms/query')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
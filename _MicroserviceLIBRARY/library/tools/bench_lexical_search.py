@@ -0,0 +1,87 @@
+"""
+bench_lexical_search.py
+Bulk-load throughput of LexicalSearchMS: the legacy one-connection-per-
+document loop, add_document on the long-lived connection, and
+add_documents with a single FTS rebuild.
+
+Usage:
+    python bench_lexical_search.py
+    python bench_lexical_search.py --docs 100000 --legacy-docs 10000
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+if str(LIBRARY_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBRARY_ROOT))
+
+from microservices.db._LexicalSearchMS import LexicalSearchMS  # noqa: E402
+
+
+def make_docs(count: int, words: int, seed: int):
+    rng = random.Random(seed)
+    vocab = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(20000)]
+    return [{'doc_id': f'doc-{i}', 'text': ' '.join(rng.choices(vocab, k=words)), 'metadata': {'n': i}} for i in range(count)]
+
+
+def legacy_add(db_path: str, doc) -> None:
+    # The 1.0.0 add_document: fresh connection and commit per document.
+    conn = sqlite3.connect(db_path)
+    conn.execute('INSERT OR REPLACE INTO documents (id, content, metadata) VALUES (?, ?, ?)', (doc['doc_id'], doc['text'], json.dumps(doc['metadata'])))
+    conn.commit()
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--legacy-docs', type=int, default=10_000, help='the per-document loops are timed on this many docs')
+    parser.add_argument('--words', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+    docs = make_docs(args.docs, args.words, args.seed)
+    subset = docs[:args.legacy_docs]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        service = LexicalSearchMS({'db_path': str(Path(tmp) / 'legacy.db')})
+        service.close()
+        started = time.perf_counter()
+        for doc in subset:
+            legacy_add(service.db_path, doc)
+        results['legacy loop'] = len(subset) / (time.perf_counter() - started)
+
+        service = LexicalSearchMS({'db_path': str(Path(tmp) / 'loop.db')})
+        started = time.perf_counter()
+        for doc in subset:
+            service.add_document(doc['doc_id'], doc['text'], doc['metadata'])
+        results['add_document'] = len(subset) / (time.perf_counter() - started)
+        service.close()
+
+        service = LexicalSearchMS({'db_path': str(Path(tmp) / 'bulk.db')})
+        started = time.perf_counter()
+        service.add_documents(docs, rebuild=True)
+        results['add_documents'] = len(docs) / (time.perf_counter() - started)
+        started = time.perf_counter()
+        service.optimize()
+        optimize_s = time.perf_counter() - started
+        service.close()
+
+    baseline = results['legacy loop']
+    for label, rate in results.items():
+        print(f'{label:<14} {rate:10,.0f} docs/s  x{rate / baseline:6.1f}')
+    print(f'optimize       {optimize_s:10.2f} s')
+    print(f'100k docs: legacy ~{100_000 / baseline:.0f}s, bulk ~{100_000 / results["add_documents"]:.1f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
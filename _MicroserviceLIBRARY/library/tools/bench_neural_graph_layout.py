@@ -0,0 +1,69 @@
+"""
+bench_neural_graph_layout.py
+Headless frames-per-second benchmark for NeuralGraphEngineMS.step_physics
+across the available layout engines (python / numpy / barnes_hut).
+
+Usage:
+    python bench_neural_graph_layout.py
+    python bench_neural_graph_layout.py --sizes 500 5000 20000 --frames 10
+    python bench_neural_graph_layout.py --python-limit 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+for extra in (LIBRARY_ROOT, LIBRARY_ROOT / 'microservices' / 'relation'):
+    if str(extra) not in sys.path:
+        sys.path.insert(0, str(extra))
+
+from microservices.relation._NeuralGraphEngineMS import LAYOUT_ENGINES, NeuralGraphEngineMS, np  # noqa: E402
+
+
+def make_graph(size: int, seed: int):
+    rng = random.Random(seed)
+    nodes = [{'id': f'n{i}', 'label': f'n{i}', 'type': 'file'} for i in range(size)]
+    links = [(i, rng.randrange(i)) for i in range(1, size)]
+    return nodes, links
+
+
+def fps(engine_name: str, size: int, frames: int, seed: int) -> float:
+    nodes, links = make_graph(size, seed)
+    engine = NeuralGraphEngineMS(1600, 1200, layout_engine=engine_name, settle_patience=10 ** 9)
+    engine.set_data(nodes, links)
+    engine.step_physics()
+    started = time.perf_counter()
+    for _ in range(frames):
+        engine.step_physics()
+    return frames / (time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 5000, 20000])
+    parser.add_argument('--frames', type=int, default=5)
+    parser.add_argument('--python-limit', type=int, default=1000, help='skip the pure-Python engine above this node count')
+    parser.add_argument('--numpy-limit', type=int, default=20000, help='skip the exact numpy engine above this node count')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    engines = list(LAYOUT_ENGINES) if np is not None else ['python']
+    print(f"{'nodes':>8} " + ' '.join(f'{name:>12}' for name in engines))
+    for size in args.sizes:
+        cells = []
+        for name in engines:
+            if (name == 'python' and size > args.python_limit) or (name == 'numpy' and size > args.numpy_limit):
+                cells.append(f"{'skipped':>12}")
+                continue
+            cells.append(f'{fps(name, size, args.frames, args.seed):>8.2f} fps')
+        print(f'{size:>8} ' + ' '.join(cells))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+"""
+bench_telemetry_overhead.py
+Per-call overhead of MetricsRegistry.instrument on a trivial endpoint,
+single-threaded and under thread contention.
+
+Usage:
+    python bench_telemetry_overhead.py
+    python bench_telemetry_overhead.py --calls 1000000 --threads 8
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+if str(LIBRARY_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBRARY_ROOT))
+
+from microservices.observability._TelemetryServiceMS import MetricsRegistry  # noqa: E402
+
+
+def endpoint(x):
+    return x + 1
+
+
+def time_calls(func, calls: int, threads: int) -> float:
+    per_thread = calls // threads
+
+    def loop(_):
+        for i in range(per_thread):
+            func(i)
+
+    started = time.perf_counter()
+    if threads == 1:
+        loop(0)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(loop, range(threads)))
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=500_000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    instrumented = registry.instrument('bench.endpoint')(endpoint)
+    for threads in (1, args.threads):
+        bare_s = time_calls(endpoint, args.calls, threads)
+        inst_s = time_calls(instrumented, args.calls, threads)
+        overhead_ns = (inst_s - bare_s) / args.calls * 1e9
+        print(f'threads={threads:<3} bare {bare_s:6.2f}s  instrumented {inst_s:6.2f}s  overhead {overhead_ns:7.0f} ns/call')
+    summary = registry.histogram('endpoint_duration_seconds', {'endpoint': 'bench.endpoint'}).summary()
+    print(f"recorded {summary['count']:,} calls  p50={summary['p50'] * 1e6:.2f}us  p99={summary['p99'] * 1e6:.2f}us")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -12,8 +12,15 @@ import queue
 import traceback
 import fnmatch
 import os
+import re
+import stat
 import json
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import shutil
 import tarfile
+import tempfile
 
 # ==============================================================================
 # 0. PYTHONW SAFETY CHECK
@@ -60,6 +67,20 @@ FORCE_BINARY_EXTENSIONS_FOR_DUMP = {
 LOG_ROOT_NAME = "_logs"
 PROJECT_CONFIG_FILENAME = "_project_mapper_config.json"
 
+# --- Source Dump ---
+DUMP_MAX_FILE_BYTES = 1_000_000   # larger files are skipped (None = no cap)
+DUMP_MAX_TOTAL_BYTES = None       # stop the dump once this much source is written (None = no cap)
+DUMP_READ_WORKERS = 4
+BINARY_SNIFF_BYTES = 1024
+
+# --- Incremental Backups ---
+INCREMENTAL_FORMAT = 1
+BACKUP_READ_CHUNK = 1024 * 1024
+BACKUP_SPOOL_BYTES = 16 * 1024 * 1024  # changed files up to this size are staged in memory
+
+# --- Tree View ---
+SIZE_UPDATE_BATCH = 500  # size cells applied per GUI-queue callback
+
 # --- State Constants ---
 S_CHECKED = "checked"
 S_UNCHECKED = "unchecked"
@@ -138,6 +159,510 @@ def format_display_size(size_bytes: int) -> str:
     size_gb = size_mb / 1024
     return f"{size_gb:.2f} GB"
 
+def _compile_fnmatch(patterns) -> "re.Pattern | None":
+    """Fold a set of fnmatch patterns into one regex.
+
+    Matching os.path.normcase(name) against the result is equivalent to
+    any(fnmatch.fnmatch(name, p) for p in patterns).
+    """
+    pats = sorted({os.path.normcase(p) for p in patterns})
+    if not pats:
+        return None
+    return re.compile("|".join(fnmatch.translate(p) for p in pats))
+
+def walk_entries(top):
+    """os.walk() that hands back DirEntry objects instead of names.
+
+    Yields (dirpath, dir_entries, file_entries) top-down in the same order as
+    os.walk(top). Prune by editing dir_entries in place. Symlinked directories
+    are listed but not descended, and unreadable directories are skipped.
+    """
+    stack = [os.fspath(top)]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        dirs, files = [], []
+        for entry in entries:
+            try: is_dir = entry.is_dir()
+            except OSError: is_dir = False
+            (dirs if is_dir else files).append(entry)
+        yield dirpath, dirs, files
+        for entry in reversed(dirs):
+            try: is_link = entry.is_symlink()
+            except OSError: is_link = False
+            if not is_link:
+                stack.append(entry.path)
+
+class ExclusionMatcher:
+    """Compiled snapshot of every exclusion rule for one project root.
+
+    Build one per scan (ProjectMapperApp.build_exclusion_matcher) and reuse it
+    for every path: each pattern category is a single regex, parent folders are
+    resolved once instead of once per child, and directory decisions are cached.
+    Results are identical to the per-call fnmatch checks it replaces.
+    """
+
+    def __init__(self, project_root: Path, dynamic_filenames=(), gitignore_dirnames=(),
+                 gitignore_file_patterns=(), gitignore_path_patterns=(), enabled: bool = True):
+        self.enabled = enabled
+        self.root = project_root.resolve()
+        self._root_str = str(self.root)
+        self._root_prefix = os.path.join(self._root_str, "")
+        self._dirnames = EXCLUDED_FOLDERS | set(gitignore_dirnames)
+        self._file_re = _compile_fnmatch(
+            PREDEFINED_EXCLUDED_FILENAMES | set(dynamic_filenames) | set(gitignore_file_patterns))
+        self._path_re = _compile_fnmatch(gitignore_path_patterns)
+        self._path_dir_re = _compile_fnmatch(p + "/" for p in gitignore_path_patterns)
+        self._dir_cache = {}
+        self._parent_cache = {}
+
+    def dir_excluded(self, name: str, rel_posix: str) -> bool:
+        """Hard-coded folders, .gitignore dir names, then .gitignore path patterns."""
+        key = (name, rel_posix)
+        hit = self._dir_cache.get(key)
+        if hit is None:
+            hit = name in self._dirnames
+            if not hit and self._path_re is not None:
+                rel = os.path.normcase(rel_posix)
+                rel_dir = os.path.normcase(rel_posix + "/")
+                hit = bool(self._path_re.match(rel) or self._path_re.match(rel_dir)
+                           or self._path_dir_re.match(rel_dir))
+            self._dir_cache[key] = hit
+        return hit
+
+    def file_excluded(self, filename: str, rel_posix: str | None = None) -> bool:
+        """Predefined + dynamic + .gitignore name patterns, then .gitignore path patterns."""
+        if self._file_re is not None and self._file_re.match(os.path.normcase(filename)):
+            return True
+        if rel_posix and self._path_re is not None:
+            return bool(self._path_re.match(os.path.normcase(rel_posix.replace("\\", "/"))))
+        return False
+
+    def resolve(self, path: Path, is_symlink: bool | None = None) -> Path:
+        """path.resolve(), reusing the resolved parent when path itself is not a link."""
+        if is_symlink is None:
+            try: is_symlink = stat.S_ISLNK(os.lstat(path).st_mode)
+            except OSError: is_symlink = False
+        if is_symlink or path.name in ("", ".", ".."):
+            return path.resolve()
+        parent_key = str(path.parent)
+        parent = self._parent_cache.get(parent_key)
+        if parent is None:
+            parent = self._parent_cache[parent_key] = path.parent.resolve()
+        return parent / path.name
+
+    def rel_posix(self, resolved: Path) -> str:
+        """Posix relpath of a resolved path; falls back to the name outside the root."""
+        s = str(resolved)
+        if s.startswith(self._root_prefix):
+            return s[len(self._root_prefix):].replace(os.sep, "/")
+        if s == self._root_str:
+            return "."
+        return resolved.name
+
+    def exclude(self, path: Path, is_dir: bool | None = None, is_symlink: bool | None = None) -> bool:
+        """Same answer as ProjectMapperApp.should_exclude_path(path, root).
+
+        is_dir / is_symlink may be passed straight from a DirEntry to skip the
+        stat calls; is_dir follows symlinks, as DirEntry.is_dir() does.
+        """
+        if not self.enabled:
+            return False
+        try:
+            p = self.resolve(path, is_symlink)
+        except Exception:
+            return False
+
+        # Only apply exclusions inside the active project root
+        if p != self.root and not str(p).startswith(self._root_str):
+            return False
+
+        if is_dir is None:
+            is_dir = p.is_dir()
+        if is_dir:
+            return self.dir_excluded(p.name, self.rel_posix(p))
+        return self.file_excluded(p.name, self.rel_posix(p))
+
+class FolderSizeCache:
+    """Cumulative folder sizes from one bottom-up walk.
+
+    scan() visits every directory once and sums its regular files (symlinks
+    are not followed), then rolls the totals up from the leaves, so each
+    file is counted once instead of once per ancestor. Per-directory results
+    are kept keyed by the directory's mtime: while that is unchanged, a
+    rescan reuses the cached listing and file sizes instead of stat-ing the
+    files again. Editing a file in place does not touch its folder's mtime,
+    so the app clear()s the cache on every tree load; the reuse only spans
+    scans within one load.
+    """
+
+    def __init__(self):
+        self._entries = {}  # dir path -> (mtime_ns, own_bytes, subdir paths)
+        self.last_stats = {"dirs": 0, "cached": 0}
+
+    def clear(self):
+        self._entries.clear()
+
+    def _list_dir(self, path: str):
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return 0, ()
+        hit = self._entries.get(path)
+        if hit is not None and hit[0] == mtime_ns:
+            self.last_stats["cached"] += 1
+            return hit[1], hit[2]
+
+        own, subdirs = 0, []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            own += entry.stat(follow_symlinks=False).st_size
+                        elif entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
+            return 0, ()
+        subdirs = tuple(subdirs)
+        self._entries[path] = (mtime_ns, own, subdirs)
+        return own, subdirs
+
+    def scan(self, root, stop_event: threading.Event | None = None) -> dict[str, int] | None:
+        """Return {directory path: cumulative bytes} for root and every folder below it.
+
+        Totals match get_folder_size_bytes() per folder. Returns None when
+        stop_event is set mid-walk.
+        """
+        self.last_stats = {"dirs": 0, "cached": 0}
+        order = []
+        stack = [os.fspath(root)]
+        while stack:
+            if stop_event is not None and stop_event.is_set():
+                return None
+            path = stack.pop()
+            own, subdirs = self._list_dir(path)
+            order.append((path, own, subdirs))
+            stack.extend(subdirs)
+        self.last_stats["dirs"] = len(order)
+
+        totals = {}
+        for path, own, subdirs in reversed(order):
+            totals[path] = own + sum(totals[d] for d in subdirs)
+        return totals
+
+def read_dump_text(file_path) -> str | None:
+    """Read a file once for the dump: None if unreadable or binary, else its text.
+
+    The binary sniff looks at the same leading bytes is_binary() reads, and
+    the text comes out exactly as a universal-newline utf-8 read with
+    errors="ignore" would give it.
+    """
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            data = f.readall()
+    except OSError:
+        return None
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return None
+    text = data.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def write_dump(f_out, files, max_total_bytes=DUMP_MAX_TOTAL_BYTES, workers=DUMP_READ_WORKERS,
+               stop_event=None, log=None) -> dict:
+    """Write the FILE sections of a source dump to the text stream f_out.
+
+    files yields (path, relpath, size) in output order. Reads run ahead on a
+    small thread pool, at most a few files per worker in flight, while
+    sections are written strictly in input order, so the output is the same
+    for any worker count. Binary and unreadable files are left out. Once
+    max_total_bytes of source would be exceeded the dump stops with a note.
+    """
+    log = log or (lambda msg, level="INFO": None)
+    stats = {"files": 0, "bytes": 0, "cancelled": False, "truncated": False}
+    if workers <= 1:
+        _write_dump_sections(f_out, ((item, None) for item in files), max_total_bytes, stop_event, log, stats)
+        return stats
+
+    source = iter(files)
+    pending = deque()
+    window = workers * 4
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def _ordered():
+            while True:
+                while len(pending) < window:
+                    item = next(source, None)
+                    if item is None: break
+                    pending.append((item, pool.submit(read_dump_text, item[0])))
+                if not pending: return
+                yield pending.popleft()
+
+        _write_dump_sections(f_out, _ordered(), max_total_bytes, stop_event, log, stats)
+        for _, future in pending:
+            future.cancel()
+    return stats
+
+def _write_dump_sections(f_out, items, max_total_bytes, stop_event, log, stats):
+    """Consume ((path, relpath, size), future-or-None) pairs in order; None reads inline."""
+    for (fpath, rel, size), future in items:
+        if stop_event is not None and stop_event.is_set():
+            f_out.write("\n\n!!! DUMP CANCELLED BY USER !!!")
+            stats["cancelled"] = True
+            return
+        if max_total_bytes is not None and stats["bytes"] + size > max_total_bytes:
+            f_out.write(f"\n\n!!! DUMP TRUNCATED: total size cap of {format_display_size(max_total_bytes)} reached !!!")
+            stats["truncated"] = True
+            return
+        try:
+            text = read_dump_text(fpath) if future is None else future.result()
+        except Exception as e:
+            f_out.write(f"\n{'-'*80}\nFILE: {rel}\n{'-'*80}\n\n[ERROR READING FILE: {e}]\n")
+            continue
+        if text is None: continue
+
+        if stats["files"] % 5 == 0: log(f"Dumping: {rel}", "DEBUG")
+        f_out.write(f"\n{'-'*80}\nFILE: {rel}\n{'-'*80}\n")
+        f_out.write(text)
+        stats["files"] += 1
+        stats["bytes"] += size
+
+def _spool_file(path):
+    """Copy a file into a spooled temp file while hashing it: (spool, size, sha256).
+
+    tarfile writes the header before the data, so archiving a file that
+    shrinks mid-copy corrupts every later member. Archiving the spooled copy
+    keeps the header size and the data in step.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=BACKUP_SPOOL_BYTES)
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(BACKUP_READ_CHUNK), b""):
+                h.update(chunk)
+                spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    size = spool.tell()
+    spool.seek(0)
+    return spool, size, h.hexdigest()
+
+def _snapshot_seqs(out_dir: Path, base: str) -> list[int]:
+    seqs = []
+    for p in out_dir.glob(f"{base}_*.json"):
+        tail = p.stem[len(base) + 1:]
+        if tail.isdigit():
+            seqs.append(int(tail))
+    return seqs
+
+def snapshot_paths(out_dir: Path, base: str, seq: int) -> tuple[Path, Path]:
+    """(manifest, delta archive) paths of incremental snapshot number seq."""
+    stem = f"{base}_{seq:04d}"
+    return out_dir / f"{stem}.json", out_dir / f"{stem}.tar.gz"
+
+def load_snapshot(out_dir: Path, base: str, seq: int) -> dict:
+    """Full relpath -> entry map of snapshot seq, replayed from the first manifest.
+
+    Each manifest only records what changed against its parent; raises
+    ValueError when a manifest in the chain is missing or unreadable.
+    """
+    chain = []
+    while seq:
+        manifest_path = snapshot_paths(out_dir, base, seq)[0]
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"broken backup chain at {manifest_path.name}: {e}") from e
+        if manifest.get("format") != INCREMENTAL_FORMAT:
+            raise ValueError(f"{manifest_path.name}: not an incremental backup manifest")
+        chain.append(manifest)
+        seq = manifest.get("parent") or 0
+
+    files = {}
+    for manifest in reversed(chain):
+        for rel in manifest["deleted"]:
+            files.pop(rel, None)
+        files.update(manifest["changed"])
+    return files
+
+def latest_snapshot(out_dir: Path, base: str) -> tuple[int, dict | None]:
+    """(seq, files) of the newest snapshot whose chain replays cleanly, or (0, None)."""
+    for seq in sorted(_snapshot_seqs(out_dir, base), reverse=True):
+        try:
+            return seq, load_snapshot(out_dir, base, seq)
+        except ValueError:
+            continue
+    return 0, None
+
+def write_incremental_backup(out_dir: Path, base: str, candidates, stop_event=None, log=None) -> dict:
+    """Write the next snapshot of an incremental backup chain.
+
+    candidates yields (path, relpath posix, stat_result) for every file to
+    keep. Each snapshot is a manifest of the entries (relpath -> [size,
+    mtime_ns, sha256, archive seq, member]) added, changed or deleted since
+    its parent, plus a delta .tar.gz holding only content that no earlier
+    snapshot stored. Files whose size and mtime_ns match the previous
+    manifest are not read at all; changed files are hashed first so renames,
+    copies and touch-only edits reuse the stored blob. Nothing is written when
+    the file set is unchanged. The manifest goes down last, so an interrupted
+    run leaves the chain as it was. A file that cannot be read is skipped;
+    an error while writing the archive discards it and propagates.
+    """
+    log = log or (lambda msg, level="INFO": None)
+    prev_seq, prev_files = latest_snapshot(out_dir, base)
+    prev_files = prev_files or {}
+    blobs = {}
+    for rel, (_, _, sha, seq, member) in prev_files.items():
+        blobs.setdefault(sha, (seq, member or rel))
+
+    # Past any newer manifest that failed to replay: later ones may still point at its archive
+    seq = max(_snapshot_seqs(out_dir, base), default=0) + 1
+    manifest_path, archive_path = snapshot_paths(out_dir, base, seq)
+    tmp_archive = archive_path.with_name(archive_path.name + ".tmp")
+    stats = {"snapshot": None, "files": 0, "unchanged": 0, "reused": 0, "stored": 0,
+             "stored_bytes": 0, "cancelled": False}
+    files = {}
+    tar = None
+    completed = False
+    try:
+        for fpath, rel, st in candidates:
+            if stop_event is not None and stop_event.is_set():
+                stats["cancelled"] = True
+                return stats
+            if fpath.parent == out_dir:
+                continue  # never back up the backups
+            old = prev_files.get(rel)
+            if old is not None and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+                files[rel] = old
+                stats["unchanged"] += 1
+                continue
+            try:
+                spool, size, sha = _spool_file(fpath)
+            except OSError as e:
+                log(f"Backup skipped {rel}: {e}", "WARNING")
+                continue
+            with spool:
+                hit = blobs.get(sha)
+                if hit is not None:
+                    files[rel] = [size, st.st_mtime_ns, sha, hit[0], None if hit[1] == rel else hit[1]]
+                    stats["reused"] += 1
+                    continue
+                if tar is None:
+                    tar = tarfile.open(tmp_archive, "w:gz")
+                info = tarfile.TarInfo(rel)
+                info.size, info.mtime, info.mode = size, st.st_mtime, stat.S_IMODE(st.st_mode)
+                tar.addfile(info, spool)
+            blobs.setdefault(sha, (seq, rel))
+            files[rel] = [size, st.st_mtime_ns, sha, seq, None]
+            stats["stored"] += 1
+            stats["stored_bytes"] += size
+            if stats["stored"] % 10 == 0: log(f"Archiving: {rel}", "DEBUG")
+        if tar is not None:
+            tar.close()
+        completed = True
+    finally:
+        if not completed:
+            if tar is not None:
+                try: tar.close()
+                except (OSError, tarfile.TarError): pass
+            tmp_archive.unlink(missing_ok=True)
+
+    stats["files"] = len(files)
+    changed = {rel: e for rel, e in files.items() if prev_files.get(rel) != e}
+    deleted = sorted(rel for rel in prev_files if rel not in files)
+    if prev_seq and not changed and not deleted:
+        tmp_archive.unlink(missing_ok=True)
+        return stats
+    if tar is not None:
+        os.replace(tmp_archive, archive_path)
+
+    manifest = {
+        "format": INCREMENTAL_FORMAT,
+        "base": base,
+        "seq": seq,
+        "parent": prev_seq or None,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "fields": ["size", "mtime_ns", "sha256", "archive_seq", "member"],
+        "changed": changed,
+        "deleted": deleted,
+    }
+    tmp_manifest = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(tmp_manifest, manifest_path)
+    stats["snapshot"] = manifest_path.name
+    return stats
+
+def restore_snapshot(manifest_path: Path, dest: Path, stop_event=None, log=None) -> int:
+    """Recreate the file set of one snapshot under dest; returns files written.
+
+    The manifest chain is replayed up to this snapshot, then each file is
+    pulled from whichever delta archive holds its content. Every archive is
+    streamed once, and each file is checked against its recorded sha256 and
+    given back its mtime. Raises ValueError when part of the chain is
+    missing or content does not match.
+    """
+    log = log or (lambda msg, level="INFO": None)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != INCREMENTAL_FORMAT:
+        raise ValueError(f"{manifest_path.name}: not an incremental backup manifest")
+    files = load_snapshot(manifest_path.parent, manifest["base"], manifest["seq"])
+
+    wanted = {}  # archive seq -> member -> [(rel, mtime_ns, sha256)]
+    for rel, (_, mtime_ns, sha, seq, member) in files.items():
+        wanted.setdefault(seq, {}).setdefault(member or rel, []).append((rel, mtime_ns, sha))
+
+    dest_root = dest.resolve()
+    written = 0
+    for seq in sorted(wanted):
+        archive = snapshot_paths(manifest_path.parent, manifest["base"], seq)[1]
+        if not archive.exists():
+            raise ValueError(f"missing archive in backup chain: {archive.name}")
+        members = wanted[seq]
+        with tarfile.open(archive, "r:gz") as tar:
+            for info in tar:
+                targets = members.pop(info.name, None)
+                if targets is None:
+                    continue
+                if stop_event is not None and stop_event.is_set():
+                    return written
+                src = tar.extractfile(info)
+                first = None
+                for rel, mtime_ns, sha in targets:
+                    out = (dest_root / rel).resolve()
+                    if not str(out).startswith(os.path.join(str(dest_root), "")):
+                        raise ValueError(f"refusing to restore outside the destination: {rel}")
+                    out.parent.mkdir(parents=True, exist_ok=True)
+                    if first is None:
+                        h = hashlib.sha256()
+                        with open(out, "wb") as f_out:
+                            for chunk in iter(lambda: src.read(BACKUP_READ_CHUNK), b""):
+                                h.update(chunk)
+                                f_out.write(chunk)
+                        if h.hexdigest() != sha:
+                            raise ValueError(f"{archive.name}: content of {info.name} does not match the manifest")
+                        first = out
+                    else:
+                        shutil.copyfile(first, out)
+                    os.utime(out, ns=(mtime_ns, mtime_ns))
+                    written += 1
+                    if written % 10 == 0: log(f"Restoring: {rel}", "DEBUG")
+                if not members:
+                    break
+        if members:
+            raise ValueError(f"{archive.name}: missing {len(members)} member(s), e.g. {next(iter(members))}")
+    return written
+
 # ==============================================================================
 # 3. GUI COMPONENTS & PROGRESS POPUP
 # ==============================================================================
@@ -219,6 +744,10 @@ class ProjectMapperApp:
 
         # Application State
         self.folder_item_states = {}
+        self.tree_file_iids = set()
+        self.dump_max_file_bytes = DUMP_MAX_FILE_BYTES
+        self.dump_max_total_bytes = DUMP_MAX_TOTAL_BYTES
+        self.folder_size_cache = FolderSizeCache()
         self.dynamic_global_excluded_filenames = set()
 
         # .gitignore support (best-effort, simple patterns)
@@ -427,6 +956,20 @@ class ProjectMapperApp:
         )
         ts_chk.pack(side=tk.LEFT, padx=10)
 
+        # -- Incremental Backup Toggle (default OFF: full tar.gz each time) --
+        self.widgets['incremental_backup'] = tk.BooleanVar(value=False)
+        incr_chk = tk.Checkbutton(
+            util_frame,
+            text="Incremental Backups",
+            variable=self.widgets['incremental_backup'],
+            bg=THEME["panel_bg"],
+            fg=THEME["text"],
+            selectcolor=THEME["tree_bg"],
+            activebackground=THEME["panel_bg"],
+            activeforeground=THEME["text"],
+        )
+        incr_chk.pack(side=tk.LEFT, padx=10)
+
         # -- Exclusion / .gitignore Toggle (default ON) --
         self.widgets['respect_exclusions'] = tk.BooleanVar(value=True)
         excl_chk = tk.Checkbutton(
@@ -467,6 +1010,15 @@ class ProjectMapperApp:
             activebackground=THEME["field_bg_alt"],
             activeforeground=THEME["text"],
         ).pack(side=tk.RIGHT, padx=5)
+        tk.Button(
+            util_frame,
+            text="Restore",
+            command=self._on_restore_backup,
+            bg=THEME["panel_alt_bg"],
+            fg=THEME["text"],
+            activebackground=THEME["field_bg_alt"],
+            activeforeground=THEME["text"],
+        ).pack(side=tk.RIGHT, padx=5)
         tk.Button(
             util_frame,
             text="Exclusions",
@@ -651,6 +1203,8 @@ class ProjectMapperApp:
             return
             
         tree.insert("", "end", text="Scanning...")
+        # Files grown in place (logs, databases) keep their folder's mtime; resize from scratch
+        self.folder_size_cache.clear()
         self.run_threaded_action(lambda: self._initial_tree_load_impl(path), task_id='load_tree')
 
     def _initial_tree_load_impl(self, root_path: Path):
@@ -660,19 +1214,24 @@ class ProjectMapperApp:
         self.load_project_config(root_path)
         tree_data = []
 
+        matcher = self.build_exclusion_matcher(root_path)
+
         def _recurse(current: Path, parent_iid: str):
             if self.stop_event.is_set(): return
             try:
                 # LIST ALL ITEMS (Files + Folders)
                 # Sort: Folders first, then files (case insensitive)
-                items = sorted(list(current.iterdir()), key=lambda x: (not x.is_dir(), x.name.lower()))
+                with os.scandir(current) as it:
+                    entries = [(e, e.is_dir(), e.is_symlink()) for e in it]
+                entries.sort(key=lambda x: (not x[1], x[0].name.lower()))
                 
-                for p in items:
+                for entry, is_dir, is_link in entries:
+                    p = Path(entry.path)
                     # 1. SAFETY: Skip Excluded Folders/Files immediately
-                    if self.should_exclude_path(p, root_path):
+                    if matcher.exclude(p, is_dir=is_dir, is_symlink=is_link):
                         continue
 
-                    path_str = str(p.resolve())
+                    path_str = str(matcher.resolve(p, is_symlink=is_link))
                     
                     # 2. State Inheritance
                     # If we don't have a specific state saved, inherit from parent
@@ -688,11 +1247,12 @@ class ProjectMapperApp:
                     tree_data.append({
                         'parent': parent_iid, 
                         'iid': path_str, 
-                        'text': display_text
+                        'text': display_text,
+                        'is_file': entry.is_file()
                     })
                     
                     # 4. Recurse only if Directory
-                    if p.is_dir():
+                    if is_dir:
                         _recurse(p, path_str)
                         
             except PermissionError: pass
@@ -706,6 +1266,7 @@ class ProjectMapperApp:
     def _populate_tree(self, data):
         tree = self.widgets['folder_tree']
         for i in tree.get_children(): tree.delete(i)
+        self.tree_file_iids = {d['iid'] for d in data if d.get('is_file')}
         for d in data:
             tree.insert(d['parent'], "end", iid=d['iid'], text=d['text'], open=d.get('open', False))
             tree.set(d['iid'], "size", "...")
@@ -713,21 +1274,32 @@ class ProjectMapperApp:
         self.refresh_tree_visuals()
         root_path = self._get_current_project_path()
         if root_path:
-             threading.Thread(target=self._calc_sizes_async, args=(str(root_path),), daemon=True).start()
-
-    def _calc_sizes_async(self, root_iid):
+             iids = [d['iid'] for d in data]
+             threading.Thread(target=self._calc_sizes_async, args=(str(root_path.resolve()), iids), daemon=True).start()
+
+    def _calc_sizes_async(self, root_dir, iids):
+        # One bottom-up walk for every folder, then size updates posted in batches
+        totals = self.folder_size_cache.scan(root_dir, self.stop_event)
+        if totals is None: return
+        updates = []
+        for iid in iids:
+            if self.stop_event.is_set(): return
+            if iid in self.tree_file_iids:
+                try: sz = os.stat(iid).st_size
+                except OSError: continue
+            else:
+                if iid not in totals:
+                    # Symlinked folders are not descended by the walk; size them on their own
+                    totals.update(self.folder_size_cache.scan(iid, self.stop_event) or {})
+                sz = totals.get(iid, 0)
+            updates.append((iid, format_display_size(sz)))
+        for i in range(0, len(updates), SIZE_UPDATE_BATCH):
+            self.gui_queue.put(lambda batch=updates[i:i + SIZE_UPDATE_BATCH]: self._apply_size_updates(batch))
+
+    def _apply_size_updates(self, batch):
         tree = self.widgets['folder_tree']
-        q = [root_iid]
-        while q:
-            if self.stop_event.is_set(): break
-            iid = q.pop(0)
-            try:
-                if not tree.exists(iid): continue
-                sz = get_folder_size_bytes(Path(iid))
-                fmt = format_display_size(sz)
-                self.gui_queue.put(lambda i=iid, s=fmt: (tree.set(i, "size", s), self.refresh_tree_visuals(i)))
-                q.extend(tree.get_children(iid))
-            except: pass
+        for iid, fmt in batch:
+            if tree.exists(iid): tree.set(iid, "size", fmt)
 
     def refresh_tree_visuals(self, start_node=None):
         tree = self.widgets['folder_tree']
@@ -739,11 +1311,10 @@ class ProjectMapperApp:
             # Use Checkbox Icon
             icon = self.icon_imgs.get(st, self.icon_imgs[S_UNCHECKED])
             
-            # Add File/Folder distinction to text
-            p = Path(iid)
-            prefix = "📄 " if p.is_file() else "" 
+            # Add File/Folder distinction to text (kind recorded at load time, no stat)
+            prefix = "📄 " if iid in self.tree_file_iids else "" 
             
-            tree.item(iid, text=f" {prefix}{p.name}", image=icon)
+            tree.item(iid, text=f" {prefix}{Path(iid).name}", image=icon)
             
             # Recursion only needed for folders (files have no children)
             if tree.get_children(iid):
@@ -867,51 +1438,35 @@ class ProjectMapperApp:
         except Exception:
             return True
 
-    def should_exclude_dir(self, dir_path: Path, project_root: Path) -> bool:
-        """Directory exclusion check: hard-coded exclusions + .gitignore (best-effort)."""
-        if not self._respect_exclusions_enabled():
-            return False
-
-        name = dir_path.name
-        if name in EXCLUDED_FOLDERS:
-            return True
-
-        rel = self._rel_posix(dir_path, project_root)
+    def build_exclusion_matcher(self, project_root: Path) -> ExclusionMatcher:
+        """Snapshot the current exclusion rules into a compiled matcher.
 
+        Build one per scan and call matcher.exclude() per path; patterns added
+        while a scan runs apply from the next scan on.
+        """
         with self.state_lock:
-            if name in self.gitignore_dirnames:
-                return True
-            # Match path patterns against directory relpath
-            for pat in self.gitignore_path_patterns:
-                if fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(rel + "/", pat) or fnmatch.fnmatch(rel + "/", pat + "/"):
-                    return True
+            return ExclusionMatcher(
+                project_root,
+                dynamic_filenames=set(self.dynamic_global_excluded_filenames),
+                gitignore_dirnames=set(self.gitignore_dirnames),
+                gitignore_file_patterns=set(self.gitignore_file_patterns),
+                gitignore_path_patterns=set(self.gitignore_path_patterns),
+                enabled=self._respect_exclusions_enabled(),
+            )
 
-        return False
+    def should_exclude_dir(self, dir_path: Path, project_root: Path) -> bool:
+        """Directory exclusion check: hard-coded exclusions + .gitignore (best-effort)."""
+        matcher = self.build_exclusion_matcher(project_root)
+        if not matcher.enabled:
+            return False
+        return matcher.dir_excluded(dir_path.name, self._rel_posix(dir_path, project_root))
 
     def should_exclude_file(self, filename: str, rel_posix: str | None = None) -> bool:
         """File exclusion check: predefined + dynamic + .gitignore (best-effort)."""
-        if not self._respect_exclusions_enabled():
+        matcher = self.build_exclusion_matcher(Path("."))
+        if not matcher.enabled:
             return False
-
-        with self.state_lock:
-            pats = PREDEFINED_EXCLUDED_FILENAMES.union(self.dynamic_global_excluded_filenames)
-            gi_files = set(self.gitignore_file_patterns)
-            gi_paths = set(self.gitignore_path_patterns)
-
-        # filename-based patterns
-        if any(fnmatch.fnmatch(filename, p) for p in pats):
-            return True
-        if any(fnmatch.fnmatch(filename, p) for p in gi_files):
-            return True
-
-        # relative-path patterns (if available)
-        if rel_posix:
-            rel_posix = rel_posix.replace("\\", "/")
-            for pat in gi_paths:
-                if fnmatch.fnmatch(rel_posix, pat):
-                    return True
-
-        return False
+        return matcher.file_excluded(filename, rel_posix)
 
     def should_exclude_path(self, path: Path, project_root: Path) -> bool:
         """Unified exclusion gate for BOTH files and directories.
@@ -922,25 +1477,11 @@ class ProjectMapperApp:
           - Predefined + dynamic filename patterns
           - .gitignore patterns (best-effort)
           - UI toggle to disable all exclusions
-        """
-        if not self._respect_exclusions_enabled():
-            return False
-
-        try:
-            root = project_root.resolve()
-            p = path.resolve()
-        except Exception:
-            return False
-
-        # Only apply exclusions inside the active project root
-        if p != root and not str(p).startswith(str(root)):
-            return False
 
-        if p.is_dir():
-            return self.should_exclude_dir(p, root)
-
-        relp = self._rel_posix(p, root)
-        return self.should_exclude_file(p.name, rel_posix=relp)
+        One-off checks only: scans build a single ExclusionMatcher up front
+        and pass DirEntry type info to matcher.exclude() instead.
+        """
+        return self.build_exclusion_matcher(project_root).exclude(path)
 
     # --- Core Actions ---
     def get_log_dir(self, root: Path) -> Path | None:
@@ -972,28 +1513,34 @@ class ProjectMapperApp:
         
         lines = [f"Project Tree: {root}\nGenerated: {datetime.now()}\n"]
         
+        matcher = self.build_exclusion_matcher(root)
+
         def _write_recurse(curr, prefix):
             if self.stop_event.is_set(): 
                 lines.append(f"{prefix}!!! CANCELLED !!!")
                 return
 
-            try: items = sorted(list(curr.iterdir()), key=lambda x: (x.is_file(), x.name.lower()))
+            try:
+                with os.scandir(curr) as it:
+                    items = sorted(it, key=lambda x: (x.is_file(), x.name.lower()))
             except: return
             
-            for i, item in enumerate(items):
+            for i, entry in enumerate(items):
                 is_last = (i == len(items) - 1)
                 conn = "└── " if is_last else "├── "
+                item = Path(entry.path)
+                is_dir = entry.is_dir()
                 
-                if item.is_dir():
+                if is_dir:
                     # Respect exclusions/.gitignore (unless toggled off)
-                    if self.should_exclude_path(item, root):
+                    if matcher.exclude(item, is_dir=True, is_symlink=entry.is_symlink()):
                         continue
 
                     if self.is_selected(item, root):
                         lines.append(f"{prefix}{conn}📁 {item.name}/")
                         _write_recurse(item, prefix + ("    " if is_last else "│   "))
                 else:
-                    if (not self.should_exclude_path(item, root)) and self.is_selected(item.parent, root):
+                    if (not matcher.exclude(item, is_dir=False, is_symlink=entry.is_symlink())) and self.is_selected(item.parent, root):
                          lines.append(f"{prefix}{conn}📄 {item.name}")
         
         _write_recurse(root, "")
@@ -1008,87 +1555,116 @@ class ProjectMapperApp:
         out_dir = self.get_log_dir(root)
         fname = self._generate_filename(root.name, "filedump", ".txt")
         out_file = out_dir / fname
-        
-        count = 0
+        max_file = self.dump_max_file_bytes
+
+        def _candidates():
+            for fpath, entry in self._iter_selected_files(root):
+                if fpath == out_file: continue  # the dump itself, when exclusions are off
+                if "".join(fpath.suffixes).lower() in FORCE_BINARY_EXTENSIONS_FOR_DUMP: continue
+                try: size = entry.stat().st_size
+                except OSError: continue
+                if max_file is not None and size > max_file: continue
+                yield fpath, fpath.relative_to(root), size
+
         with open(out_file, "w", encoding="utf-8") as f_out:
             f_out.write(f"Dump: {root}\n\n")
-            
-            for r, d, f in os.walk(root):
-                if self.stop_event.is_set(): 
-                    f_out.write("\n\n!!! DUMP CANCELLED BY USER !!!")
-                    break
-    
-                curr = Path(r)
-                # First remove excluded folders (hard + .gitignore), then apply selection logic
-                kept_dirs = []
-                for x in d:
-                    dp = curr / x
-                    if self.should_exclude_path(dp, root):
-                        continue
-                    if not self.is_selected(dp, root):
-                        continue
-                    kept_dirs.append(x)
-                d[:] = kept_dirs
-                if not self.is_selected(curr, root): continue
-                
-                for fname_item in f:
-                    if self.stop_event.is_set(): break
-
-                    fpath = curr / fname_item
-                    if self.should_exclude_path(fpath, root):
-                        continue
-                    if fpath.stat().st_size > 1_000_000: continue
-                    if is_binary(fpath) or "".join(fpath.suffixes).lower() in FORCE_BINARY_EXTENSIONS_FOR_DUMP: continue
-                    
-                    rel = fpath.relative_to(root)
-                    if count % 5 == 0: self.schedule_log_message(f"Dumping: {rel}", "DEBUG")
-                    
-                    try:
-                        f_out.write(f"\n{'-'*80}\nFILE: {rel}\n{'-'*80}\n")
-                        with open(fpath, "r", encoding="utf-8", errors="ignore") as f_in:
-                            f_out.write(f_in.read())
-                        count += 1
-                    except Exception as e:
-                        f_out.write(f"\n[ERROR READING FILE: {e}]\n")
+            stats = write_dump(f_out, _candidates(), max_total_bytes=self.dump_max_total_bytes,
+                               stop_event=self.stop_event, log=self.schedule_log_message)
         
-        self.schedule_log_message(f"Dump saved: {fname} ({count} files)")
+        note = " - stopped at total size cap" if stats["truncated"] else ""
+        self.schedule_log_message(f"Dump saved: {fname} ({stats['files']} files{note})")
+
+    def _iter_selected_files(self, root: Path):
+        """(path, DirEntry) for every selected, non-excluded file under root."""
+        matcher = self.build_exclusion_matcher(root)
+        for r, d, f in walk_entries(root):
+            if self.stop_event.is_set(): return
+            curr = Path(r)
+            kept_dirs = []
+            for x in d:
+                dp = curr / x.name
+                if matcher.exclude(dp, is_dir=True, is_symlink=x.is_symlink()):
+                    continue
+                if not self.is_selected(dp, root):
+                    continue
+                kept_dirs.append(x)
+            d[:] = kept_dirs
+            if not self.is_selected(curr, root): continue
+            for entry in f:
+                fpath = curr / entry.name
+                if matcher.exclude(fpath, is_dir=False, is_symlink=entry.is_symlink()):
+                    continue
+                yield fpath, entry
 
     def backup_project_impl(self):
         root = self._get_current_project_path()
         if not root: return
         
         out_dir = self.get_log_dir(root)
+        if self.widgets['incremental_backup'].get():
+            self._incremental_backup_impl(root, out_dir)
+            return
+
         fname = self._generate_filename(root.name, "backup", ".tar.gz")
         out_file = out_dir / fname
         
         count = 0
         with tarfile.open(out_file, "w:gz") as tar:
-            for r, d, f in os.walk(root):
-                if self.stop_event.is_set(): break
-                curr = Path(r)
-                kept_dirs = []
-                for x in d:
-                    dp = curr / x
-                    if self.should_exclude_path(dp, root):
-                        continue
-                    if not self.is_selected(dp, root):
-                        continue
-                    kept_dirs.append(x)
-                d[:] = kept_dirs
-                if not self.is_selected(curr, root): continue
-                for fname_item in f:
-                    fpath = curr / fname_item
-                    if self.should_exclude_path(fpath, root):
-                        continue
-                    tar.add(fpath, arcname=fpath.relative_to(root))
-                    count += 1
-                    if count % 10 == 0: self.schedule_log_message(f"Archiving: {fname_item}", "DEBUG")
+            for fpath, entry in self._iter_selected_files(root):
+                tar.add(fpath, arcname=fpath.relative_to(root))
+                count += 1
+                if count % 10 == 0: self.schedule_log_message(f"Archiving: {entry.name}", "DEBUG")
 
         if self.stop_event.is_set():
             self.schedule_log_message("Backup Cancelled.", "WARNING")
         else:
             self.schedule_log_message(f"Backup saved: {fname}")
 
+    def _incremental_backup_impl(self, root: Path, out_dir: Path):
+        def _candidates():
+            for fpath, entry in self._iter_selected_files(root):
+                try: st = entry.stat()
+                except OSError: continue
+                yield fpath, fpath.relative_to(root).as_posix(), st
+
+        try:
+            stats = write_incremental_backup(out_dir, f"{root.name}_backup_incr", _candidates(),
+                                             stop_event=self.stop_event, log=self.schedule_log_message)
+        except (OSError, tarfile.TarError) as e:
+            self.schedule_log_message(f"Backup failed, no snapshot written: {e}", "ERROR")
+            return
+        if stats["cancelled"] or self.stop_event.is_set():
+            self.schedule_log_message("Backup Cancelled.", "WARNING")
+        elif stats["snapshot"] is None:
+            self.schedule_log_message(f"Backup unchanged since last snapshot ({stats['files']} files).")
+        else:
+            self.schedule_log_message(
+                f"Backup saved: {stats['snapshot']} ({stats['stored']} new, {stats['reused']} deduplicated, "
+                f"{stats['unchanged']} unchanged, {format_display_size(stats['stored_bytes'])} stored)")
+
+    def _on_restore_backup(self):
+        root = self._get_current_project_path()
+        manifest = filedialog.askopenfilename(
+            title="Select backup snapshot",
+            initialdir=str(root / LOG_ROOT_NAME) if root else None,
+            filetypes=[("Incremental backup manifest", "*.json")],
+        )
+        if not manifest: return
+        dest = filedialog.askdirectory(title="Restore into (empty folder recommended)")
+        if not dest: return
+        self.run_threaded_action(lambda: self.restore_backup_impl(Path(manifest), Path(dest)), task_id='restore', use_popup=True)
+
+    def restore_backup_impl(self, manifest: Path, dest: Path):
+        try:
+            count = restore_snapshot(manifest, dest, stop_event=self.stop_event, log=self.schedule_log_message)
+        except (OSError, ValueError, tarfile.TarError) as e:
+            self.schedule_log_message(f"Restore failed: {e}", "ERROR")
+            return
+        if self.stop_event.is_set():
+            self.schedule_log_message("Restore Cancelled.", "WARNING")
+        else:
+            self.schedule_log_message(f"Restored {count} files from {manifest.name} into {dest}")
+
     def audit_system_impl(self):
         root = self._get_current_project_path() or DEFAULT_ROOT_DIR
         out_dir = self.get_log_dir(root)
@@ -1138,13 +1714,17 @@ class ProjectMapperApp:
                 except: pass
             data = {
                 "folder_states": rel_states,
-                "dynamic_exclusions": list(self.dynamic_global_excluded_filenames)
+                "dynamic_exclusions": list(self.dynamic_global_excluded_filenames),
+                "dump_max_file_bytes": self.dump_max_file_bytes,
+                "dump_max_total_bytes": self.dump_max_total_bytes
             }
         with open(cfg, "w") as f: json.dump(data, f, indent=2)
 
     def load_project_config(self, root: Path):
         # Always (re)load .gitignore for the active root (best-effort)
         self._load_gitignore_patterns(root)
+        self.dump_max_file_bytes = DUMP_MAX_FILE_BYTES
+        self.dump_max_total_bytes = DUMP_MAX_TOTAL_BYTES
 
         cfg = self.get_log_dir(root) / PROJECT_CONFIG_FILENAME
         if not cfg.exists(): return
@@ -1153,6 +1733,8 @@ class ProjectMapperApp:
             for k, v in data.get("folder_states", {}).items():
                 self.folder_item_states[str((root / k).resolve())] = v
             self.dynamic_global_excluded_filenames.update(data.get("dynamic_exclusions", []))
+            self.dump_max_file_bytes = data.get("dump_max_file_bytes", DUMP_MAX_FILE_BYTES)
+            self.dump_max_total_bytes = data.get("dump_max_total_bytes", DUMP_MAX_TOTAL_BYTES)
         except: pass
 
     # --- Dynamic Exclusions ---
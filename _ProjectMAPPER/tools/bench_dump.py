@@ -0,0 +1,98 @@
+"""
+bench_dump.py
+Dumps a generated source tree three ways and checks the output is identical:
+the previous loop (is_binary() opens each file, then a second text-mode open
+reads it), and write_dump() with one reader thread and with a pool. Also
+shows the total byte cap cutting the dump short.
+
+Usage:
+    python tools/bench_dump.py
+    python tools/bench_dump.py --files 20000 --file-size 16384 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.app import DUMP_MAX_FILE_BYTES, is_binary, walk_entries, write_dump  # noqa: E402
+
+
+def build_tree(root: Path, files: int, file_size: int, per_dir: int = 100) -> None:
+    rng = random.Random(3)
+    for i in range(files):
+        folder = root / f"pkg{i // per_dir:04d}"
+        if i % per_dir == 0:
+            folder.mkdir(parents=True, exist_ok=True)
+        if i % 50 == 0:
+            (folder / f"blob{i}.dat2").write_bytes(os.urandom(file_size))
+            continue
+        line = f"value_{i} = {rng.random()!r}  # comment\r\n" if i % 7 == 0 else f"value_{i} = {rng.random()!r}\n"
+        (folder / f"mod{i}.py").write_text(line * (file_size // len(line) + 1), newline="")
+
+
+def candidates(root: Path):
+    for dirpath, _, files in walk_entries(root):
+        for entry in files:
+            size = entry.stat().st_size
+            if size <= DUMP_MAX_FILE_BYTES:
+                path = Path(entry.path)
+                yield path, path.relative_to(root), size
+
+
+def previous_dump(f_out, files) -> None:
+    for fpath, rel, _ in files:
+        if is_binary(fpath):
+            continue
+        f_out.write(f"\n{'-'*80}\nFILE: {rel}\n{'-'*80}\n")
+        with open(fpath, "r", encoding="utf-8", errors="ignore") as f_in:
+            f_out.write(f_in.read())
+
+
+def timed(fn) -> tuple[float, str]:
+    out = io.StringIO()
+    started = time.perf_counter()
+    fn(out)
+    return time.perf_counter() - started, out.getvalue()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--file-size", type=int, default=8192)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        build_tree(root, args.files, args.file_size)
+
+        before_s, before = timed(lambda out: previous_dump(out, candidates(root)))
+        serial_s, serial = timed(lambda out: write_dump(out, candidates(root), workers=1))
+        pool_s, pooled = timed(lambda out: write_dump(out, candidates(root), workers=args.workers))
+        capped = io.StringIO()
+        cap_stats = write_dump(capped, candidates(root), max_total_bytes=len(before) // 10, workers=args.workers)
+
+    if not before == serial == pooled:
+        print("MISMATCH between the previous dump and write_dump")
+        return 1
+    print(f"{args.files:,} files, {len(before) / 1e6:.1f} MB of dump text, {os.cpu_count()} CPU(s)")
+    print(f"is_binary + second open   {before_s:6.2f}s")
+    print(f"write_dump, 1 reader      {serial_s:6.2f}s  x{before_s / serial_s:.2f}")
+    print(f"write_dump, {args.workers} readers     {pool_s:6.2f}s  x{before_s / pool_s:.2f}")
+    print(f"total cap {len(before) // 10:,} B -> {cap_stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+"""
+bench_folder_sizes.py
+Sizes every folder of a generated deep tree the way the tree view needs:
+get_folder_size_bytes() once per folder (the previous per-node approach)
+versus a single FolderSizeCache.scan(), cold and warm. Totals must agree for
+every folder, including after a file is added deep in the tree.
+
+Usage:
+    python tools/bench_folder_sizes.py
+    python tools/bench_folder_sizes.py --depth 40 --fanout 2 --files 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.app import FolderSizeCache, get_folder_size_bytes  # noqa: E402
+
+
+def build_tree(root: Path, depth: int, fanout: int, files: int, spine: int) -> list[Path]:
+    """A few long chains (the deep part) with small bushy subtrees hanging off each level."""
+    folders = [root]
+    for chain in range(spine):
+        node = root / f"chain{chain}"
+        for level in range(depth):
+            node.mkdir(parents=True, exist_ok=True)
+            folders.append(node)
+            for i in range(files):
+                (node / f"f{i}.txt").write_bytes(b"x" * (level * 7 + i))
+            for branch in range(fanout - 1):
+                side = node / f"side{branch}"
+                side.mkdir()
+                folders.append(side)
+                (side / "leaf.bin").write_bytes(os.urandom(64 + level))
+            node = node / f"l{level + 1}"
+    return folders
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=60)
+    parser.add_argument("--fanout", type=int, default=3, help="sub-folders per level, including the next chain link")
+    parser.add_argument("--files", type=int, default=40, help="files per chain folder")
+    parser.add_argument("--spine", type=int, default=20, help="number of deep chains")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        folders = build_tree(root, args.depth, args.fanout, args.files, args.spine)
+        print(f"{len(folders):,} folders, depth {args.depth}")
+
+        started = time.perf_counter()
+        expected = {str(f): get_folder_size_bytes(f) for f in folders}
+        per_node_s = time.perf_counter() - started
+
+        cache = FolderSizeCache()
+        started = time.perf_counter()
+        cold = cache.scan(root)
+        cold_s = time.perf_counter() - started
+        started = time.perf_counter()
+        warm = cache.scan(root)
+        warm_s = time.perf_counter() - started
+        warm_stats = dict(cache.last_stats)
+
+        deepest = folders[args.depth]
+        (deepest / "added.txt").write_bytes(b"y" * 1000)
+        changed = cache.scan(root)
+
+        for path, size in expected.items():
+            if cold[path] != size or warm[path] != size:
+                print(f"MISMATCH {path}: {size} vs {cold[path]} / {warm[path]}")
+                return 1
+        if changed[str(root)] != expected[str(root)] + 1000 or changed[str(deepest)] != get_folder_size_bytes(deepest):
+            print("MISMATCH after adding a file")
+            return 1
+
+        print(f"per-folder walks   {per_node_s:7.2f}s")
+        print(f"single scan, cold  {cold_s:7.2f}s  x{per_node_s / cold_s:.1f}")
+        print(f"single scan, warm  {warm_s:7.2f}s  x{per_node_s / warm_s:.1f}  {warm_stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""
+bench_incremental_backup.py
+Backs up a generated project the old way (a full tar.gz every run) and as
+an incremental chain: first snapshot, an unchanged rerun, then runs after
+editing, renaming and deleting a few files. Every snapshot is restored into
+a scratch folder and compared byte for byte with what was on disk.
+
+Usage:
+    python tools/bench_incremental_backup.py
+    python tools/bench_incremental_backup.py --files 20000 --file-size 8192 --change 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.app import restore_snapshot, snapshot_paths, walk_entries, write_incremental_backup  # noqa: E402
+
+
+def build_project(root: Path, files: int, file_size: int, per_dir: int = 100) -> None:
+    rng = random.Random(7)
+    for i in range(files):
+        folder = root / f"pkg{i // per_dir:04d}"
+        if i % per_dir == 0:
+            folder.mkdir(parents=True, exist_ok=True)
+        words = " ".join(rng.choice(("def", "class", "return", "self", "value", "import")) for _ in range(file_size // 6))
+        (folder / f"mod{i}.py").write_text(words[:file_size])
+
+
+def candidates(root: Path):
+    for dirpath, _, files in walk_entries(root):
+        for entry in files:
+            path = Path(entry.path)
+            yield path, path.relative_to(root).as_posix(), entry.stat()
+
+
+def snapshot_of(root: Path) -> dict[str, bytes]:
+    return {rel: path.read_bytes() for path, rel, _ in candidates(root)}
+
+
+def full_backup(root: Path, out_file: Path) -> None:
+    with tarfile.open(out_file, "w:gz") as tar:
+        for path, rel, _ in candidates(root):
+            tar.add(path, arcname=rel)
+
+
+def mutate(root: Path, fraction: float, seed: int) -> None:
+    rng = random.Random(seed)
+    files = sorted(p for p, _, _ in candidates(root))
+    for path in rng.sample(files, max(1, int(len(files) * fraction))):
+        path.write_text(path.read_text() + f"\n# edit {seed}\n")
+    renamed = rng.choice(files)
+    if renamed.exists():
+        renamed.rename(renamed.with_name("renamed_" + renamed.name))
+    gone = rng.choice(files)
+    if gone.exists():
+        gone.unlink()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--file-size", type=int, default=4096)
+    parser.add_argument("--change", type=float, default=0.01, help="fraction of files edited between runs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out_dir = Path(tmp) / "proj", Path(tmp) / "backups"
+        out_dir.mkdir()
+        build_project(root, args.files, args.file_size)
+        base = "proj_backup_incr"
+
+        started = time.perf_counter()
+        full_backup(root, out_dir / "full.tar.gz")
+        full_s = time.perf_counter() - started
+        print(f"{args.files:,} files; full tar.gz every run: {full_s:6.2f}s  {(out_dir / 'full.tar.gz').stat().st_size / 1e6:7.2f} MB")
+
+        expected = {}
+        steps = [("first snapshot", None), ("unchanged rerun", None), ("after edits", 1), ("after edits", 2)]
+        for label, seed in steps:
+            if seed is not None:
+                mutate(root, args.change, seed)
+            started = time.perf_counter()
+            stats = write_incremental_backup(out_dir, base, candidates(root))
+            elapsed = time.perf_counter() - started
+            stored = 0.0
+            if stats["snapshot"]:
+                seq = int(Path(stats["snapshot"]).stem.rsplit("_", 1)[1])
+                manifest, archive = snapshot_paths(out_dir, base, seq)
+                stored = (manifest.stat().st_size + (archive.stat().st_size if archive.exists() else 0)) / 1e6
+                expected[seq] = snapshot_of(root)
+            print(f"incremental, {label:<16} {elapsed:6.2f}s  {stored:7.2f} MB  "
+                  f"new={stats['stored']} dedup={stats['reused']} unchanged={stats['unchanged']} -> {stats['snapshot']}")
+
+        for seq, files in expected.items():
+            dest = Path(tmp) / f"restore{seq}"
+            restore_snapshot(snapshot_paths(out_dir, base, seq)[0], dest)
+            if snapshot_of(dest) != files:
+                print(f"MISMATCH restoring snapshot {seq}")
+                return 1
+        print(f"restored {len(expected)} snapshots, all identical to the source at backup time")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
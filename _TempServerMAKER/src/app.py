@@ -1,5 +1,6 @@
 from __future__ import annotations
-import argparse, http.server, json, mimetypes, os, socket, socketserver, sys, threading, time, webbrowser, hashlib, ast
+import argparse, http.server, json, mimetypes, os, socket, socketserver, sys, threading, time, webbrowser, hashlib, ast, gzip, zlib
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs, unquote
@@ -15,6 +16,32 @@ except Exception:
 class QuietTCPServer(socketserver.TCPServer):
     allow_reuse_address = True
 
+class QuietThreadingServer(socketserver.ThreadingMixIn, QuietTCPServer):
+    """
+    One thread per request, at most `max_handlers` at a time: when all are busy
+    the accept loop waits for a slot instead of spawning more threads.
+    """
+    daemon_threads = True
+    request_queue_size = 128  # listen backlog; the default 5 drops bursts into 1s SYN retries
+
+    def __init__(self, server_address, handler_class, max_handlers: int = 16):
+        self._handler_slots = threading.BoundedSemaphore(max(1, max_handlers))
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        self._handler_slots.acquire()
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._handler_slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._handler_slots.release()
+
 def pick_free_port(host: str = "127.0.0.1") -> int:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind((host, 0))
@@ -26,117 +53,199 @@ def now_iso() -> str:
 def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
+GZIP_MIN_BYTES = 1024  # smaller bodies aren't worth compressing
+
+def make_etag(*parts: object) -> str:
+    # Weak validator: the same resource is served both gzipped and identity.
+    return 'W/"' + hashlib.sha1(repr(parts).encode("utf-8")).hexdigest() + '"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip() for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags or etag[2:] in tags
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    for token in (accept_encoding or "").split(","):
+        name, _, params = token.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            q = params.strip()
+            if not q.startswith("q="):
+                return True
+            try:
+                return float(q[2:] or 0) != 0
+            except ValueError:
+                return True  # malformed q-value: treat as the default q=1
+    return False
+
 # ------------------------------ JSONL Report Builder (From app_OG.py) ------------------------------ #
 
-def build_project_codebase_log(root: Path, max_bytes: int = 0, include_binaries: bool = False) -> str:
+class ReportCache:
+    """
+    Per-file JSONL records for the report endpoints, keyed on
+    (kind, root, path, mtime_ns, size, options) so unchanged files are neither
+    re-read nor re-parsed. The root is part of the key because records carry
+    root-relative paths. LRU-bounded by the total size of the cached records.
     """
-    Assemble a JSONL stream (as a single string) with:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[list[str], int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: tuple, build) -> list[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        lines = build()
+        cost = sum(len(line) for line in lines)
+        if cost <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = (lines, cost)
+                    self._bytes += cost
+                while self._bytes > self.max_bytes and self._entries:
+                    _, (_, old_cost) = self._entries.popitem(last=False)
+                    self._bytes -= old_cost
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+def _cached_file_lines(cache: ReportCache | None, kind: str, root: Path, p: Path, options: tuple, build) -> list[str]:
+    if cache is None:
+        return build()
+    try:
+        st = p.stat()
+    except OSError:
+        return build()
+    return cache.get_or_build((kind, str(root), str(p), st.st_mtime_ns, st.st_size, options), build)
+
+def iter_project_codebase_log(root: Path, max_bytes: int = 0, include_binaries: bool = False,
+                              cache: ReportCache | None = None):
+    """
+    Yield the project codebase log as JSONL lines:
       - meta
       - file_tree section (dir/file entries)
       - files section (per-file headers + content)
     """
-    lines = []
-    lines.append(_jsonl({
+    yield _jsonl({
         "type": "meta",
         "root": str(root),
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "format": "jsonl",
         "sections": ["file_tree","files"],
-    }))
+    })
 
     # file tree
-    lines.append(_jsonl({"type": "section", "name": "file_tree"}))
-    for p in _iter_all_paths(root):
-        lines.append(_jsonl({
-            "type": "dir" if p.is_dir() else "file",
+    entries = [(p, p.is_dir()) for p in _iter_all_paths(root)]
+    yield _jsonl({"type": "section", "name": "file_tree"})
+    for p, is_dir in entries:
+        yield _jsonl({
+            "type": "dir" if is_dir else "file",
             "path": _rel(root, p),
-        }))
+        })
 
     # files
-    lines.append(_jsonl({"type": "section", "name": "files"}))
-    for p in _iter_all_paths(root):
-        if p.is_dir():
-            continue
-        rel = _rel(root, p)
-        lang = _guess_lang(p)
-        try:
-            raw = p.read_bytes()
-        except Exception as e:
-            lines.append(_jsonl({"type": "file_error", "path": rel, "error": str(e)}))
-            continue
-
-        if lang == "binary" and not include_binaries:
-            try:
-                st = p.stat()
-                lines.append(_jsonl({
-                    "type": "file_header",
-                    "path": rel,
-                    "size": st.st_size,
-                    "sha256": _sha256_bytes(raw),
-                    "language": lang,
-                    "skipped": "binary"
-                }))
-            except Exception:
-                lines.append(_jsonl({"type": "file_header", "path": rel, "language": lang, "skipped": "binary"}))
+    yield _jsonl({"type": "section", "name": "files"})
+    for p, is_dir in entries:
+        if is_dir:
             continue
+        build = lambda p=p: _codebase_file_lines(root, p, max_bytes, include_binaries)
+        yield from _cached_file_lines(cache, "codebase", root, p, (max_bytes, include_binaries), build)
 
-        text = raw.decode("utf-8", errors="replace")
-        truncated = False
-        if max_bytes and len(text.encode("utf-8")) > max_bytes:
-            # rough truncation by characters (OK for logs)
-            text = text[:max_bytes]
-            truncated = True
+def _codebase_file_lines(root: Path, p: Path, max_bytes: int, include_binaries: bool) -> list[str]:
+    rel = _rel(root, p)
+    lang = _guess_lang(p)
+    try:
+        raw = p.read_bytes()
+    except Exception as e:
+        return [_jsonl({"type": "file_error", "path": rel, "error": str(e)})]
 
+    if lang == "binary" and not include_binaries:
         try:
             st = p.stat()
-            size = st.st_size
+            return [_jsonl({
+                "type": "file_header",
+                "path": rel,
+                "size": st.st_size,
+                "sha256": _sha256_bytes(raw),
+                "language": lang,
+                "skipped": "binary"
+            })]
         except Exception:
-            size = len(raw)
+            return [_jsonl({"type": "file_header", "path": rel, "language": lang, "skipped": "binary"})]
 
-        lines.append(_jsonl({
-            "type": "file",
-            "path": rel,
-            "size": size,
-            "sha256": _sha256_bytes(raw),
-            "language": lang,
-            "truncated": truncated,
-            "content": text
-        }))
+    text = raw.decode("utf-8", errors="replace")
+    truncated = False
+    if max_bytes and len(text.encode("utf-8")) > max_bytes:
+        # rough truncation by characters (OK for logs)
+        text = text[:max_bytes]
+        truncated = True
 
-    return "".join(lines)
+    try:
+        st = p.stat()
+        size = st.st_size
+    except Exception:
+        size = len(raw)
+
+    return [_jsonl({
+        "type": "file",
+        "path": rel,
+        "size": size,
+        "sha256": _sha256_bytes(raw),
+        "language": lang,
+        "truncated": truncated,
+        "content": text
+    })]
 
+def build_project_codebase_log(root: Path, max_bytes: int = 0, include_binaries: bool = False) -> str:
+    """Assemble the project codebase log JSONL stream as a single string."""
+    return "".join(iter_project_codebase_log(root, max_bytes=max_bytes, include_binaries=include_binaries))
 
-def build_ast_tree_log(root: Path) -> str:
+
+def iter_ast_tree_log(root: Path, cache: ReportCache | None = None):
     """
-    Assemble a JSONL stream (as a single string) for *.py files:
+    Yield the AST tree log as JSONL lines for *.py files:
       - meta
       - ast_file header per file
       - ast_node records (flat walk)
     """
-    lines = []
-    lines.append(_jsonl({
+    yield _jsonl({
         "type": "meta",
         "root": str(root),
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "format": "jsonl",
         "scope": "*.py only",
-    }))
+    })
 
     for p in _iter_all_paths(root):
-        if p.is_dir() or p.suffix != ".py":
-            continue
-        rel = _rel(root, p)
-        try:
-            src = p.read_text(encoding="utf-8", errors="replace")
-        except Exception as e:
-            lines.append(_jsonl({"type": "ast_error", "path": rel, "error": str(e)}))
+        if p.suffix != ".py" or p.is_dir():
             continue
+        yield from _cached_file_lines(cache, "ast", root, p, (), lambda p=p: _ast_file_lines(root, p))
 
-        lines.append(_jsonl({"type": "ast_file", "path": rel}))
-        for item in _iter_ast_nodes(src, rel):
-            lines.append(_jsonl(item))
+def _ast_file_lines(root: Path, p: Path) -> list[str]:
+    rel = _rel(root, p)
+    try:
+        src = p.read_text(encoding="utf-8", errors="replace")
+    except Exception as e:
+        return [_jsonl({"type": "ast_error", "path": rel, "error": str(e)})]
+    lines = [_jsonl({"type": "ast_file", "path": rel})]
+    for item in _iter_ast_nodes(src, rel):
+        lines.append(_jsonl(item))
+    return lines
 
-    return "".join(lines)
+def build_ast_tree_log(root: Path) -> str:
+    """Assemble the AST tree log JSONL stream as a single string."""
+    return "".join(iter_ast_tree_log(root))
 
 
 def _iter_all_paths(root: Path):
@@ -283,7 +392,8 @@ class App:
 
     def __init__(self, directory: Path, host: str, port: int,
                  open_browser: bool, keep_index: bool,
-                 headless: bool, write_report: bool) -> None:
+                 headless: bool, write_report: bool,
+                 threaded: bool = True, max_handlers: int = 16) -> None:
         self.root_dir = Path(directory).resolve()
         self.host = host
         self.port = port
@@ -291,6 +401,9 @@ class App:
         self.keep_index = keep_index  # if True and no index.html, write DEFAULT_INDEX_HTML to disk
         self.headless = headless
         self.write_report_flag = write_report
+        self.threaded = threaded
+        self.max_handlers = max_handlers
+        self.report_cache = ReportCache()
         self.httpd: QuietTCPServer | None = None
         self.thread: threading.Thread | None = None
         self.url: str = ""
@@ -299,6 +412,9 @@ class App:
         ensure_dir(self.logs_dir)
         self.log_path = self.logs_dir / f"server_{int(time.time())}.log"
         self.report_path = self.logs_dir / "ai_report.txt"
+        # Rendered index page, rebuilt only when a directory (or template asset) mtime changes.
+        self._index_lock = threading.Lock()
+        self._index_cache: dict | None = None
 
     def set_root_dir(self, new_root: Path) -> None:
         new_root = Path(new_root).resolve()
@@ -310,6 +426,9 @@ class App:
         ensure_dir(self.logs_dir)
         self.log_path = self.logs_dir / f"server_{int(time.time())}.log"
         self.report_path = self.logs_dir / "ai_report.txt"
+        self.invalidate_index()
+        # Records from the old root are unreachable now (the root is in the key).
+        self.report_cache.clear()
         self._log(f"Root changed to: {self.root_dir}")
 
     def _file_record(self, p: Path) -> dict:
@@ -337,6 +456,12 @@ class App:
             rec["binary"] = True
         return rec
 
+    def _file_meta(self, p: Path) -> dict:
+        """Manifest entry for the index page; file text is fetched on demand via /__api__/file."""
+        st = p.stat()
+        mtype, _ = mimetypes.guess_type(p.name)
+        return {"path": _rel(self.root_dir, p), "size": st.st_size, "mime": mtype or "application/octet-stream", "mtime": st.st_mtime}
+
     def _parse_ast(self, p: Path) -> list:
         try:
             tree = ast.parse(p.read_text(encoding="utf-8", errors="replace"))
@@ -355,15 +480,79 @@ class App:
             return [{"error": str(e)}]
 
     def _gather_files(self) -> list[Path]:
+        return self._scan_tree()[0]
+
+    def _scan_tree(self) -> tuple[list[Path], dict[str, int]]:
+        """
+        One walk of the root: the served files, plus the mtime_ns of every directory
+        visited (adding, removing or renaming an entry bumps its directory's mtime).
+        Hidden directories and the logs dir are pruned; their files are never served.
+        """
         files: list[Path] = []
-        for p in self.root_dir.rglob("*"):
-            if not p.is_file():
-                continue
-            if any(part.startswith('.') for part in p.parts) or self.logs_dir in p.parents or p.name == "app.py" or p.name == "app_merged.py":
+        dir_mtimes: dict[str, int] = {}
+        for dirpath, dirnames, filenames in os.walk(self.root_dir):
+            try:
+                dir_mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+            except OSError:
                 continue
-            files.append(p)
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and Path(dirpath, d) != self.logs_dir]
+            for name in filenames:
+                p = Path(dirpath, name)
+                if not p.is_file():
+                    continue
+                if any(part.startswith('.') for part in p.parts) or self.logs_dir in p.parents or p.name == "app.py" or p.name == "app_merged.py":
+                    continue
+                files.append(p)
         files.sort()
-        return files
+        return files, dir_mtimes
+
+    def _template_mtimes(self) -> tuple:
+        assets_dir = Path(__file__).parent / "assets"
+        out = []
+        for name in ("index.html", "style.css", "index.js"):
+            try:
+                out.append((assets_dir / name).stat().st_mtime_ns)
+            except OSError:
+                out.append(None)
+        return tuple(out)
+
+    @staticmethod
+    def _dirs_unchanged(dir_mtimes: dict[str, int]) -> bool:
+        for dirpath, mtime_ns in dir_mtimes.items():
+            try:
+                if os.stat(dirpath).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def invalidate_index(self) -> None:
+        with self._index_lock:
+            self._index_cache = None
+
+    def get_index_page(self) -> dict:
+        """
+        The populated index page as {"body", "gzip", "etag"}. Reused while no directory
+        or template mtime has changed; in-place edits of existing files don't touch
+        directory mtimes, so their listed size/mtime refresh on the next structural
+        change or POST /__api__/refresh (contents are always read live).
+        """
+        with self._index_lock:
+            cached = self._index_cache
+            if (cached is not None and cached["template"] == self._template_mtimes()
+                    and self._dirs_unchanged(cached["dirs"])):
+                return cached
+            template = self._template_mtimes()
+            files, dir_mtimes = self._scan_tree()
+            body = self.generate_populated_html(files).encode("utf-8", errors="replace")
+            self._index_cache = {
+                "body": body,
+                "gzip": gzip.compress(body, compresslevel=6),
+                "etag": make_etag(str(self.root_dir), hashlib.sha1(body).hexdigest()),
+                "dirs": dir_mtimes,
+                "template": template,
+            }
+            return self._index_cache
 
     def _load_template(self) -> str:
         # Look for assets relative to this script (app.py)
@@ -391,8 +580,13 @@ class App:
         self._log("assets/index.html not found — serving built-in template.")
         return DEFAULT_INDEX_HTML
 
-    def generate_populated_html(self) -> str:
-        files = [self._file_record(p) for p in self._gather_files()]
+    def generate_populated_html(self, paths: list[Path] | None = None) -> str:
+        files = []
+        for p in (self._gather_files() if paths is None else paths):
+            try:
+                files.append(self._file_meta(p))
+            except OSError:
+                continue  # vanished between walk and stat
         meta = {"generated_at": now_iso(), "root": str(self.root_dir), "count": len(files), "total_bytes": sum(f.get("size", 0) for f in files)}
         def safe_json(obj: object) -> str:
             return json.dumps(obj, ensure_ascii=False).replace("</", "<\/").replace("<\\/", "<\\/")
@@ -412,6 +606,7 @@ class App:
         self.report_path.write_text("\n".join(lines), encoding="utf-8")
 
     def refresh(self) -> None:
+        self.invalidate_index()
         self.write_ai_report()
         self._log("Refreshed AI report")
 
@@ -432,23 +627,71 @@ class App:
                 self.send_header('Access-Control-Allow-Methods', 'GET,POST,OPTIONS')
                 self.send_header('Access-Control-Allow-Headers', 'Content-Type')
 
-            def _send_json(self, obj: object, code: int = 200):
-                data = json.dumps(obj, ensure_ascii=False).encode('utf-8')
+            def _send_bytes(self, body: bytes, ctype: str, code: int = 200, etag: str | None = None, gzipped: bytes | None = None):
+                """Send BODY honouring If-None-Match (304) and Accept-Encoding: gzip."""
+                if etag and code == 200 and etag_matches(self.headers.get('If-None-Match'), etag):
+                    self.send_response(304)
+                    self._set_cors()
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                encoding = None
+                if len(body) >= GZIP_MIN_BYTES and accepts_gzip(self.headers.get('Accept-Encoding')):
+                    body = gzipped if gzipped is not None else gzip.compress(body, compresslevel=6)
+                    encoding = 'gzip'
                 self.send_response(code)
                 self._set_cors()
-                self.send_header('Content-Type', 'application/json; charset=utf-8')
-                self.send_header('Content-Length', str(len(data)))
+                self.send_header('Content-Type', ctype)
+                if etag:
+                    self.send_header('ETag', etag)
+                    self.send_header('Cache-Control', 'no-cache')
+                if encoding:
+                    self.send_header('Content-Encoding', encoding)
+                self.send_header('Vary', 'Accept-Encoding')
+                self.send_header('Content-Length', str(len(body)))
                 self.end_headers()
-                self.wfile.write(data)
+                self.wfile.write(body)
+
+            def _send_json(self, obj: object, code: int = 200, etag: str | None = None):
+                data = json.dumps(obj, ensure_ascii=False).encode('utf-8')
+                self._send_bytes(data, 'application/json; charset=utf-8', code, etag=etag)
 
             def _send_text(self, text: str, code: int = 200, ctype: str = 'text/plain; charset=utf-8'):
                 b = text.encode('utf-8', errors='replace')
-                self.send_response(code)
+                self._send_bytes(b, ctype, code)
+
+            def _send_stream(self, lines, ctype: str = 'text/plain; charset=utf-8'):
+                """
+                Stream generated lines as they are produced (gzip-compressed on the fly
+                when accepted). No Content-Length: the response ends when the connection closes.
+                """
+                compressor = None
+                if accepts_gzip(self.headers.get('Accept-Encoding')):
+                    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+                self.close_connection = True
+                self.send_response(200)
                 self._set_cors()
                 self.send_header('Content-Type', ctype)
-                self.send_header('Content-Length', str(len(b)))
+                if compressor:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Vary', 'Accept-Encoding')
+                self.send_header('Connection', 'close')
                 self.end_headers()
-                self.wfile.write(b)
+                buf: list[bytes] = []
+                buffered = 0
+                try:
+                    for line in lines:
+                        data = line.encode('utf-8', errors='replace')
+                        buf.append(data)
+                        buffered += len(data)
+                        if buffered >= 64 * 1024:
+                            out = b''.join(buf)
+                            self.wfile.write(compressor.compress(out) if compressor else out)
+                            buf, buffered = [], 0
+                    out = b''.join(buf)
+                    self.wfile.write(compressor.compress(out) + compressor.flush() if compressor else out)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client went away mid-report
 
             def do_OPTIONS(self):
                 self.send_response(204)
@@ -467,6 +710,8 @@ class App:
                         "template_path": str(app_ref.template_path),
                         "template_exists": tpl_exists,
                         "keep_index": app_ref.keep_index,
+                        "threaded": app_ref.threaded,
+                        "report_cache": {"hits": app_ref.report_cache.hits, "misses": app_ref.report_cache.misses},
                     })
 
                 if self.path.startswith('/__api__/'):
@@ -476,13 +721,13 @@ class App:
                         max_bytes = int(q.get("max_bytes", ["0"])[0] or "0")
                         include_binaries = q.get("include_binaries", ["0"])[0] == "1"
 
-                        text = build_project_codebase_log(app_ref.root_dir.resolve(), max_bytes=max_bytes, include_binaries=include_binaries)
-                        return self._send_text(text, 200, 'text/plain; charset=utf-8')
+                        return self._send_stream(iter_project_codebase_log(
+                            app_ref.root_dir.resolve(), max_bytes=max_bytes,
+                            include_binaries=include_binaries, cache=app_ref.report_cache))
 
                     # AST Tree Log (JSONL) - From app_OG.py
                     if self.path.startswith('/__api__/report/ast-tree-log'):
-                        text = build_ast_tree_log(app_ref.root_dir.resolve())
-                        return self._send_text(text, 200, 'text/plain; charset=utf-8')
+                        return self._send_stream(iter_ast_tree_log(app_ref.root_dir.resolve(), cache=app_ref.report_cache))
 
                     # AST Endpoint - From app_OG.py
                     if self.path.startswith('/__api__/ast'):
@@ -526,7 +771,11 @@ class App:
                             return self._send_json({"ok": False, "error": "path outside root"}, 400)
                         if not abs_path.exists() or not abs_path.is_file():
                             return self._send_json({"ok": False, "error": "not a file"}, 404)
-                        total = abs_path.stat().st_size
+                        st = abs_path.stat()
+                        total = st.st_size
+                        etag = make_etag(str(abs_path), st.st_mtime_ns, total, offset, limit)
+                        if etag_matches(self.headers.get('If-None-Match'), etag):
+                            return self._send_bytes(b'', 'application/json; charset=utf-8', etag=etag)
                         mtype, _ = mimetypes.guess_type(abs_path.name)
                         mtype = mtype or 'application/octet-stream'
                         with abs_path.open('rb') as f:
@@ -547,14 +796,14 @@ class App:
                                 payload["text"] = chunk.decode('utf-8')
                             except UnicodeDecodeError:
                                 payload["text"] = chunk.decode('latin-1', errors='replace')
-                        return self._send_json(payload)
+                        return self._send_json(payload, etag=etag)
                     
                     # Fallback for other /__api__/ calls
                     return self._send_json({"error": "API endpoint not found"}, 404)
 
                 if self.path == '/' or self.path == '/index.html':
-                    html_content = app_ref.generate_populated_html()
-                    return self._send_text(html_content, ctype='text/html; charset=utf-8')
+                    page = app_ref.get_index_page()
+                    return self._send_bytes(page["body"], 'text/html; charset=utf-8', etag=page["etag"], gzipped=page["gzip"])
 
                 # Use SimpleHTTPRequestHandler's default file serving
                 # (which now correctly uses the 'directory' kwarg)
@@ -570,7 +819,10 @@ class App:
                     return
                 return super().do_POST()
 
-        httpd = QuietTCPServer((self.host, port), Handler)
+        if self.threaded:
+            httpd = QuietThreadingServer((self.host, port), Handler, max_handlers=self.max_handlers)
+        else:
+            httpd = QuietTCPServer((self.host, port), Handler)
         url = f"http://{self.host}:{port}/"
         return httpd, url
 
@@ -730,6 +982,8 @@ def parse_args(argv: list[str] | None = None):
     p.add_argument('--keep-index', action='store_true', help='If no index.html exists, write built-in template to disk')
     p.add_argument('--report', action='store_true', help='Also write ai_report.txt to _logs/_temp-server/')
     p.add_argument('--keep-file', action='store_true', help='Keep generated files on exit (deprecated)')
+    p.add_argument('--single-thread', dest='threaded', action='store_false', help='Handle one request at a time (legacy server)')
+    p.add_argument('--max-handlers', type=int, default=16, help='Concurrent request handlers in threaded mode (default: 16)')
     return p.parse_args(argv)
 
 def main(argv: list[str] | None = None) -> int:
@@ -744,7 +998,8 @@ def main(argv: list[str] | None = None) -> int:
             print(f"[error] directory does not exist: {directory}")
             return 2
         
-        app = App(directory=directory, host=args.host, port=args.port, open_browser=args.open_browser, keep_index=args.keep_index, headless=args.no_gui, write_report=args.report)
+        app = App(directory=directory, host=args.host, port=args.port, open_browser=args.open_browser, keep_index=args.keep_index, headless=args.no_gui, write_report=args.report,
+                  threaded=args.threaded, max_handlers=args.max_handlers)
         
         return app.run_headless() if app.headless else app.run_gui()
 
@@ -32,6 +32,39 @@ document.addEventListener("DOMContentLoaded", () => {
         '&': '&amp;', '<': '&lt;', '>': '&gt;'
     })[char]);
     const path_to_id = (path) => `card_${path.replace(/[^a-zA-Z0-9_-]/g, '_')}`;
+    const PREVIEW_LIMIT = 400000;
+
+    // File text is not embedded in the page; fetch it in chunks from the file API.
+    async function fetchChunk(path, offset = 0, limit = PREVIEW_LIMIT) {
+        const res = await fetch(`/__api__/file?path=${encodeURIComponent(path)}&offset=${offset}&limit=${limit}`);
+        const data = await res.json();
+        if (!data.ok) throw new Error(data.error || `HTTP ${res.status}`);
+        return data;
+    }
+
+    async function loadSourceInto(details, offset = 0) {
+        const path = details.dataset.path;
+        const pre = details.querySelector('pre');
+        details.querySelector('.load-more')?.remove();
+        try {
+            const chunk = await fetchChunk(path, offset);
+            if (typeof chunk.text !== 'string') {
+                details.innerHTML = `<summary>Contents</summary><div class="small">(binary or too large to preview)</div>`;
+                return;
+            }
+            if (offset === 0) pre.textContent = '';
+            pre.textContent += chunk.text;
+            if (chunk.more) {
+                const btn = document.createElement('button');
+                btn.className = 'btn load-more';
+                btn.textContent = `Load more (${humanBytes(chunk.size - chunk.chunk_end)} left)`;
+                btn.onclick = () => loadSourceInto(details, chunk.chunk_end);
+                details.appendChild(btn);
+            }
+        } catch (error) {
+            pre.textContent = `Error loading file: ${error.message}`;
+        }
+    }
 
     // --- LOGIC ---
 
@@ -105,11 +138,19 @@ document.addEventListener("DOMContentLoaded", () => {
             const isPythonFile = file.path.endsWith('.py');
             const tabs = isPythonFile ? `<div class="tab-container"><button class="tab-btn active" data-tab="source">Source Code</button><button class="tab-btn" data-tab="ast" data-file="${file.path}">AST</button></div>` : '';
             
-            const fileCard = `<div class="card" id="${cardId}"><h3>${file.path}</h3>${tabs}<div class="body"><div class="meta"><div><b>Size:</b> ${humanBytes(file.size)}</div><div><b>MIME:</b> ${file.mime}</div></div><div class="tab-content source-content active">${typeof file.text === 'string'
-                ? `<details><summary>Contents (${humanBytes(file.text.length)})</summary><pre>${escapeHtml(file.text)}</pre></details>`
-                : `<div class="small">(binary or too large to preview)</div>`}</div><div class="tab-content ast-content" data-file="${file.path}">Loading AST...</div></div></div>`;
+            const fileCard = `<div class="card" id="${cardId}"><h3>${file.path}</h3>${tabs}<div class="body"><div class="meta"><div><b>Size:</b> ${humanBytes(file.size)}</div><div><b>MIME:</b> ${file.mime}</div></div><div class="tab-content source-content active"><details class="source" data-path="${escapeHtml(file.path)}"><summary>Contents (${humanBytes(file.size)})</summary><pre>Loading...</pre></details></div><div class="tab-content ast-content" data-file="${file.path}">Loading AST...</div></div></div>`;
             contentEl.insertAdjacentHTML('beforeend', fileCard);
         });
+
+        // Fetch source the first time a card's contents are opened
+        document.querySelectorAll('details.source').forEach(details => {
+            details.addEventListener('toggle', () => {
+                if (details.open && details.dataset.loaded !== 'true') {
+                    details.dataset.loaded = 'true';
+                    loadSourceInto(details);
+                }
+            });
+        });
         
         // Add event listeners for the new tabs
         document.querySelectorAll('.tab-btn[data-tab="ast"]').forEach(btn => {
@@ -193,13 +234,15 @@ document.addEventListener("DOMContentLoaded", () => {
     /**
      * Creates a downloadable AI-friendly text report of all file contents.
      */
-    function exportAiReport() {
+    async function exportAiReport() {
         const lines = [JSON.stringify(META, null, 2)];
         for (const file of FILES) {
+            let text;
+            try { text = (await fetchChunk(file.path)).text; } catch (e) { text = undefined; }
             lines.push('\n' + '='.repeat(80));
             lines.push(`FILE: ${file.path}`);
             lines.push('-'.repeat(80));
-            lines.push(typeof file.text === 'string' ? file.text : '[binary or omitted]');
+            lines.push(typeof text === 'string' ? text : '[binary or omitted]');
         }
         const reportText = lines.join('\n');
         const blob = new Blob([reportText], {
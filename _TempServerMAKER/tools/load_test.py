@@ -0,0 +1,97 @@
+"""
+load_test.py
+Starts the server headless on a generated project and fires concurrent local
+HTTP clients at it: a few full-tree report downloads alongside many small
+/__api__/status and /__api__/file requests. Prints small-request latency for
+the single-threaded server versus the threaded one, and cold versus cached
+report times.
+
+Usage:
+    python tools/load_test.py
+    python tools/load_test.py --files 3000 --report-clients 4 --small-requests 200
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.app import App  # noqa: E402
+
+
+def build_project(root: Path, files: int) -> None:
+    for i in range(files):
+        folder = root / f"pkg{i // 100:03d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        body = "".join(f"def f{j}(x):\n    return x + {j}\n\n" for j in range(40 + i % 60))
+        (folder / f"mod{i}.py").write_text(body, encoding="utf-8")
+
+
+def fetch(url: str) -> float:
+    started = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=300) as res:
+        while res.read(1 << 16):
+            pass
+    return time.perf_counter() - started
+
+
+def run_mixed(app: App, args) -> tuple[list[float], list[float]]:
+    base = app.url.rstrip("/")
+    reports = [f"{base}/__api__/report/ast-tree-log", f"{base}/__api__/report/project-codebase-log"]
+    smalls = [f"{base}/__api__/status", f"{base}/__api__/file?path=pkg000/mod1.py&limit=2000"]
+    report_times: list[float] = []
+    small_times: list[float] = []
+    with ThreadPoolExecutor(max_workers=args.report_clients + args.small_clients) as pool:
+        report_futs = [pool.submit(fetch, reports[i % 2]) for i in range(args.report_clients)]
+        time.sleep(0.05)  # let the reports get going first
+        small_futs = [pool.submit(fetch, smalls[i % 2]) for i in range(args.small_requests)]
+        small_times = [f.result() for f in small_futs]
+        report_times = [f.result() for f in report_futs]
+    return report_times, small_times
+
+
+def pct(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1500)
+    parser.add_argument("--report-clients", type=int, default=2)
+    parser.add_argument("--small-clients", type=int, default=8)
+    parser.add_argument("--small-requests", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        build_project(root, args.files)
+        print(f"{args.files} python files, {args.report_clients} report clients, "
+              f"{args.small_requests} small requests over {args.small_clients} clients")
+        for threaded in (False, True):
+            app = App(root, "127.0.0.1", 0, open_browser=False, keep_index=False, headless=True,
+                      write_report=False, threaded=threaded)
+            app._log = lambda msg: None
+            app.start()
+            try:
+                for label in ("cold", "cached"):
+                    report_times, small_times = run_mixed(app, args)
+                    print(f"{'threaded' if threaded else 'single  '} {label:<6} "
+                          f"report max {max(report_times):6.2f}s | small p50 {pct(small_times, 0.5):8.1f} ms "
+                          f"p95 {pct(small_times, 0.95):8.1f} ms max {max(small_times) * 1000:8.1f} ms")
+            finally:
+                app.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,6 +7,9 @@ import json
 import re
 import datetime
 import difflib
+import time
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 
 def get_asset_path(filename: str) -> str:
@@ -159,28 +162,57 @@ def tokenize_text(text: str):
     lines = [StructuredLine(l) for l in raw_lines]
     return lines, newline
 
-def locate_hunk(file_lines, search_lines, floating=False):
+class LineIndex:
+    """
+    Both comparison forms of every file line (fully reconstructed, and content-only
+    for floating matches), computed once, plus a form -> [line numbers] index.
+    Build one per tokenized file and reuse it for every hunk.
+    """
+    __slots__ = ["forms", "positions"]
+
+    def __init__(self, file_lines):
+        self.forms = {
+            False: [l.reconstruct() for l in file_lines],
+            True: [l.content for l in file_lines],
+        }
+        self.positions = {}
+        for floating, forms in self.forms.items():
+            table = {}
+            for lineno, form in enumerate(forms):
+                table.setdefault(form, []).append(lineno)
+            self.positions[floating] = table
+
+def locate_hunk(file_lines, search_lines, floating=False, index=None):
     """Locate the hunk's search_lines inside file_lines."""
     if not search_lines:
         return []
+    if index is None:
+        index = LineIndex(file_lines)
+
+    forms = index.forms[floating]
+    table = index.positions[floating]
+    if floating:
+        # Compare logical content only
+        needle = [s.content for s in search_lines]
+    else:
+        # Compare fully reconstructed lines
+        needle = [s.reconstruct() for s in search_lines]
+
+    # Seed candidates from the rarest search line; a line absent from the file rules out any match.
+    anchor_offset, anchor_hits = None, None
+    for offset, form in enumerate(needle):
+        hits = table.get(form)
+        if hits is None:
+            return []
+        if anchor_hits is None or len(hits) < len(anchor_hits):
+            anchor_offset, anchor_hits = offset, hits
 
     matches = []
-    max_start = len(file_lines) - len(search_lines)
-    for start in range(max_start + 1):
-        ok = True
-        for i, s in enumerate(search_lines):
-            f = file_lines[start + i]
-            if floating:
-                # Compare logical content only
-                if f.content != s.content:
-                    ok = False
-                    break
-            else:
-                # Compare fully reconstructed lines
-                if f.reconstruct() != s.reconstruct():
-                    ok = False
-                    break
-        if ok:
+    span = len(needle)
+    max_start = len(file_lines) - span
+    for lineno in anchor_hits:
+        start = lineno - anchor_offset
+        if 0 <= start <= max_start and forms[start:start + span] == needle:
             matches.append(start)
 
     return matches
@@ -195,6 +227,7 @@ def apply_patch_text(original_text: str, patch_obj: dict, global_force_indent: b
         raise PatchError("'hunks' must be a list.")
 
     file_lines, newline = tokenize_text(original_text)
+    index = LineIndex(file_lines)
 
     # First pass: compute all applications (start/end/replacements)
     applications = []
@@ -210,10 +243,10 @@ def apply_patch_text(original_text: str, patch_obj: dict, global_force_indent: b
         r_lines = [StructuredLine(l) for l in replace_block.splitlines()]
 
         # 1. Strict match
-        matches = locate_hunk(file_lines, s_lines, floating=False)
+        matches = locate_hunk(file_lines, s_lines, floating=False, index=index)
         # 2. Fallback: content-only match
         if not matches:
-            matches = locate_hunk(file_lines, s_lines, floating=True)
+            matches = locate_hunk(file_lines, s_lines, floating=True, index=index)
 
         if not matches:
             raise PatchError(f"Hunk {idx}: Search block not found.")
@@ -783,6 +816,221 @@ def run_gui():
     app = App()
     app.start()
 
+# ==============================================================================
+# BATCH MODE (Manifest of {file, hunks} entries)
+# ==============================================================================
+
+def load_manifest(path: str) -> list:
+    """
+    Read a batch manifest: a JSON list of entries, a JSON object with a "files"
+    list, or JSONL with one entry per line. Relative "file"/"output" paths are
+    resolved against the manifest's folder.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = []
+        for lineno, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                data.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise PatchError(f"Manifest line {lineno}: not valid JSON ({e.msg}).")
+    if isinstance(data, dict):
+        # A one-line JSONL manifest parses as a single entry object.
+        data = [data] if "files" not in data and ("file" in data or "hunks" in data) else data.get("files")
+    if not isinstance(data, list):
+        raise PatchError("Manifest must be a list of entries, a {'files': [...]} object, or JSONL.")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    entries = []
+    for entry in data:
+        if isinstance(entry, dict):
+            entry = dict(entry)
+            for key in ("file", "output"):
+                if isinstance(entry.get(key), str):
+                    entry[key] = os.path.normpath(os.path.join(base_dir, entry[key]))
+        entries.append(entry)
+    return entries
+
+def validate_manifest(entries: list) -> list:
+    """Check every entry before anything is applied; returns a list of error strings."""
+    if not entries:
+        return ["Manifest has no entries."]
+    errors = []
+    seen = {}
+    for n, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            errors.append(f"Entry {n}: must be an object with 'file' and 'hunks'.")
+            continue
+        target = entry.get("file")
+        if not isinstance(target, str) or not target:
+            errors.append(f"Entry {n}: missing 'file'.")
+            continue
+        if not os.path.isfile(target):
+            errors.append(f"Entry {n}: target file not found: {target}")
+        destination = os.path.normcase(entry.get("output") or target)
+        if destination in seen:
+            errors.append(f"Entry {n}: writes the same file as entry {seen[destination]}: {destination}")
+        seen[destination] = n
+        hunks = entry.get("hunks")
+        if not isinstance(hunks, list) or not hunks:
+            errors.append(f"Entry {n}: 'hunks' must be a non-empty list.")
+            continue
+        for idx, hunk in enumerate(hunks, start=1):
+            if not isinstance(hunk, dict) or not isinstance(hunk.get("search_block"), str) \
+                    or not isinstance(hunk.get("replace_block"), str):
+                errors.append(f"Entry {n}: Hunk {idx}: Missing 'search_block' or 'replace_block'.")
+    return errors
+
+def apply_manifest_entry(entry: dict, global_force_indent: bool = False) -> dict:
+    """Read + patch one manifest entry in memory (runs inside pool workers)."""
+    started = time.perf_counter()
+    result = {"file": entry["file"], "output": entry.get("output") or entry["file"], "status": "applied", "error": None}
+    try:
+        with open(entry["file"], "r", encoding="utf-8") as f:
+            original_text = f.read()
+        force_indent = entry.get("force_indent", global_force_indent)
+        result["new_text"] = apply_patch_text(original_text, entry, global_force_indent=force_indent)
+    except PatchError as e:
+        result.update(status="failed", error=f"Patch Failed: {e}")
+    except Exception as e:
+        result.update(status="failed", error=f"Unexpected Error: {e}")
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+def commit_batch(results: list) -> None:
+    """
+    Write all patched texts atomically: every result is first written to a temp
+    file beside its destination, then swapped in with os.replace(). Originals are
+    hard-linked (or copied) aside first so any failure restores every file.
+    """
+    staged = []
+    try:
+        for res in results:
+            dest = res["output"]
+            tmp = f"{dest}.tpatch-{os.getpid()}.tmp"
+            staged.append((res, tmp))
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(res["new_text"])
+            if os.path.exists(dest):
+                shutil.copymode(dest, tmp)
+    except Exception:
+        for _, tmp in staged:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        raise
+
+    swapped = []
+    try:
+        for res, tmp in staged:
+            dest = res["output"]
+            backup = None
+            if os.path.exists(dest):
+                backup = f"{dest}.tpatch-{os.getpid()}.bak"
+                try:
+                    os.link(dest, backup)
+                except OSError:
+                    shutil.copy2(dest, backup)
+            swapped.append((dest, backup))
+            os.replace(tmp, dest)
+    except Exception:
+        for dest, backup in reversed(swapped):
+            if backup is not None:
+                if os.path.exists(dest) and os.path.samefile(backup, dest):
+                    # Never swapped: rename() between two links to one file is a no-op.
+                    os.remove(backup)
+                else:
+                    os.replace(backup, dest)
+            elif os.path.exists(dest):
+                os.remove(dest)
+        for _, tmp in staged:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        raise
+    for _, backup in swapped:
+        if backup is not None:
+            os.remove(backup)
+
+def run_batch(manifest_path: str, jobs: int = 0, global_force_indent: bool = False,
+              dry_run: bool = False, report_path: str = None) -> int:
+    """Validate, apply across a process pool, then commit all-or-nothing. Returns an exit code."""
+    try:
+        entries = load_manifest(manifest_path)
+    except FileNotFoundError:
+        print(f"Error: Manifest file not found: {manifest_path}")
+        return 1
+    except PatchError as e:
+        print(f"Error: {e}")
+        return 1
+
+    errors = validate_manifest(entries)
+    if errors:
+        print(f"Manifest invalid ({len(errors)} problem(s)); nothing was applied:")
+        for err in errors:
+            print(f"  {err}")
+        return 1
+
+    started = time.perf_counter()
+    jobs = min(jobs or os.cpu_count() or 1, len(entries))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(apply_manifest_entry, entries, [global_force_indent] * len(entries),
+                                    chunksize=max(1, len(entries) // (jobs * 4))))
+    else:
+        results = [apply_manifest_entry(entry, global_force_indent) for entry in entries]
+
+    failed = [res for res in results if res["status"] == "failed"]
+    exit_code = 0
+    if failed:
+        for res in results:
+            if res["status"] == "applied":
+                res["status"] = "not_written"
+        exit_code = 1
+    elif dry_run:
+        for res in results:
+            res["status"] = "validated"
+    else:
+        try:
+            commit_batch(results)
+            for res in results:
+                res["status"] = "written"
+        except Exception as e:
+            for res in results:
+                res.update(status="rolled_back", error=res["error"] or f"Commit failed: {e}")
+            exit_code = 1
+    elapsed = time.perf_counter() - started
+
+    width = max(len(res["file"]) for res in results)
+    for res in results:
+        line = f"{res['status']:<12} {res['seconds'] * 1000:9.1f} ms  {res['file']:<{width}}"
+        print(f"{line}  {res['error']}" if res["error"] else line)
+    summary = f"{len(results)} file(s), {len(failed)} failed, {jobs} worker(s), {elapsed:.2f}s"
+    if failed:
+        print(f"Batch Failed: {summary}. No files were written.")
+    elif exit_code:
+        print(f"Batch Failed: {summary}. Commit error; all files restored.")
+    elif dry_run:
+        print(f"Dry Run Successful. {summary}.")
+    else:
+        print(f"Success: {summary}.")
+
+    if report_path:
+        report = {
+            "manifest": os.path.abspath(manifest_path),
+            "ok": exit_code == 0,
+            "dry_run": dry_run,
+            "workers": jobs,
+            "seconds": elapsed,
+            "files": [{k: v for k, v in res.items() if k != "new_text"} for res in results],
+        }
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return exit_code
+
 # ==============================================================================
 # CLI MODE (Utility)
 # ==============================================================================
@@ -792,13 +1040,24 @@ def run_cli():
     Command Line Interface Entry Point.
     """
     parser = argparse.ArgumentParser(description="_TokenizingPATCHER CLI")
-    parser.add_argument("target", help="Path to the target source file")
-    parser.add_argument("patch", help="Path to the JSON patch file")
+    parser.add_argument("target", nargs="?", help="Path to the target source file")
+    parser.add_argument("patch", nargs="?", help="Path to the JSON patch file")
     parser.add_argument("--output", "-o", help="Path to save the result (defaults to print stdout)")
     parser.add_argument("--force-indent", action="store_true", help="Force patch indentation")
     parser.add_argument("--dry-run", action="store_true", help="Validate only, do not write")
+    parser.add_argument("--batch", metavar="MANIFEST", help="Apply a JSON/JSONL manifest of {file, hunks} entries in place")
+    parser.add_argument("--jobs", "-j", type=int, default=0, help="Batch worker processes (default: CPU count)")
+    parser.add_argument("--report", help="Batch: write the per-file status/timing report as JSON")
     
     args = parser.parse_args()
+
+    if args.batch:
+        if args.target or args.patch or args.output:
+            parser.error("--batch takes its targets from the manifest; drop target/patch/--output")
+        sys.exit(run_batch(args.batch, jobs=args.jobs, global_force_indent=args.force_indent,
+                           dry_run=args.dry_run, report_path=args.report))
+    if not args.target or not args.patch:
+        parser.error("target and patch are required (or use --batch MANIFEST)")
     
     # 1. Read Target
     try:
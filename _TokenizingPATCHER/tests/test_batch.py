@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import app  # noqa: E402
+
+
+def hunk(search: str, replace: str) -> dict:
+    return {"search_block": search, "replace_block": replace}
+
+
+class BatchModeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "a.py").write_text("x = 1\n", encoding="utf-8")
+        (self.root / "b.py").write_text("y = 2\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def write_manifest(self, name: str, text: str) -> str:
+        path = self.root / name
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def run_batch(self, manifest: str, **kwargs) -> tuple[int, str]:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = app.run_batch(manifest, jobs=1, **kwargs)
+        return code, out.getvalue()
+
+    def read(self, name: str) -> str:
+        return (self.root / name).read_text(encoding="utf-8")
+
+    def test_jsonl_resolves_paths_against_the_manifest(self) -> None:
+        lines = [
+            json.dumps({"file": "a.py", "hunks": [hunk("x = 1", "x = 10")]}),
+            "",
+            json.dumps({"file": "b.py", "hunks": [hunk("y = 2", "y = 20")]}),
+        ]
+        entries = app.load_manifest(self.write_manifest("m.jsonl", "\n".join(lines)))
+        self.assertEqual([e["file"] for e in entries], [str(self.root / "a.py"), str(self.root / "b.py")])
+
+    def test_single_entry_jsonl_is_one_entry(self) -> None:
+        manifest = self.write_manifest("one.jsonl", json.dumps({"file": "a.py", "hunks": [hunk("x = 1", "x = 10")]}) + "\n")
+        self.assertEqual(len(app.load_manifest(manifest)), 1)
+        code, _ = self.run_batch(manifest)
+        self.assertEqual(code, 0)
+        self.assertEqual(self.read("a.py").rstrip("\n"), "x = 10")
+
+    def test_bad_jsonl_line_is_reported(self) -> None:
+        manifest = self.write_manifest("bad.jsonl", json.dumps({"file": "a.py", "hunks": []}) + "\n{oops\n")
+        with self.assertRaisesRegex(app.PatchError, "line 2"):
+            app.load_manifest(manifest)
+
+    def test_empty_manifest_is_a_validation_error(self) -> None:
+        for name, text in (("empty.json", "[]"), ("blank.jsonl", "\n\n")):
+            with self.subTest(manifest=name):
+                code, out = self.run_batch(self.write_manifest(name, text))
+                self.assertEqual(code, 1)
+                self.assertIn("Manifest has no entries.", out)
+
+    def test_invalid_manifest_applies_nothing(self) -> None:
+        manifest = self.write_manifest("m.json", json.dumps([
+            {"file": "a.py", "hunks": [hunk("x = 1", "x = 10")]},
+            {"file": "missing.py", "hunks": [hunk("z", "w")]},
+            {"file": "b.py", "output": "a.py", "hunks": [hunk("y = 2", "y = 20")]},
+        ]))
+        code, out = self.run_batch(manifest)
+        self.assertEqual(code, 1)
+        self.assertIn("target file not found", out)
+        self.assertIn("writes the same file as entry 1", out)
+        self.assertEqual(self.read("a.py"), "x = 1\n")
+
+    def test_failed_hunk_writes_no_file(self) -> None:
+        manifest = self.write_manifest("m.json", json.dumps({"files": [
+            {"file": "a.py", "hunks": [hunk("x = 1", "x = 10")]},
+            {"file": "b.py", "hunks": [hunk("not in the file", "y = 20")]},
+        ]}))
+        code, out = self.run_batch(manifest)
+        self.assertEqual(code, 1)
+        self.assertIn("No files were written", out)
+        self.assertEqual((self.read("a.py"), self.read("b.py")), ("x = 1\n", "y = 2\n"))
+
+    def test_commit_failure_restores_every_file(self) -> None:
+        manifest = self.write_manifest("m.json", json.dumps([
+            {"file": "a.py", "hunks": [hunk("x = 1", "x = 10")]},
+            {"file": "b.py", "hunks": [hunk("y = 2", "y = 20")]},
+        ]))
+        real_replace = os.replace
+
+        def failing_replace(src, dst):
+            if str(dst).endswith("b.py") and str(src).endswith(".tmp"):
+                raise OSError("disk full")
+            return real_replace(src, dst)
+
+        with mock.patch.object(app.os, "replace", side_effect=failing_replace):
+            code, out = self.run_batch(manifest)
+        self.assertEqual(code, 1)
+        self.assertIn("all files restored", out)
+        self.assertEqual((self.read("a.py"), self.read("b.py")), ("x = 1\n", "y = 2\n"))
+        self.assertEqual(sorted(p.name for p in self.root.iterdir()), ["a.py", "b.py", "m.json"])
+
+    def test_dry_run_leaves_files_alone(self) -> None:
+        manifest = self.write_manifest("m.json", json.dumps([{"file": "a.py", "hunks": [hunk("x = 1", "x = 10")]}]))
+        code, out = self.run_batch(manifest, dry_run=True)
+        self.assertEqual(code, 0)
+        self.assertIn("Dry Run Successful", out)
+        self.assertEqual(self.read("a.py"), "x = 1\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
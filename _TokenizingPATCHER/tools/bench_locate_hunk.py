@@ -0,0 +1,146 @@
+"""
+bench_locate_hunk.py
+Times locate_hunk (strict then floating, as apply_patch_text calls it) and
+apply_patch_text end to end on a large generated file: the anchor-indexed
+matcher versus the original sliding-window scan. Checks that both produce
+identical matches and identical output text or PatchError messages.
+
+Usage:
+    python tools/bench_locate_hunk.py
+    python tools/bench_locate_hunk.py --lines 20000 --hunks 50 --patches 10
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src import app  # noqa: E402
+
+INDEXED_LOCATE = app.locate_hunk
+BOILERPLATE = ["", "    return None", "        pass", "    # ---", "        self.update()"]
+
+
+def legacy_locate_hunk(file_lines, search_lines, floating=False, index=None):
+    """The original scan: every offset, reconstruct() per comparison."""
+    if not search_lines:
+        return []
+    matches = []
+    max_start = len(file_lines) - len(search_lines)
+    for start in range(max_start + 1):
+        ok = True
+        for i, s in enumerate(search_lines):
+            f = file_lines[start + i]
+            if floating:
+                if f.content != s.content:
+                    ok = False
+                    break
+            else:
+                if f.reconstruct() != s.reconstruct():
+                    ok = False
+                    break
+        if ok:
+            matches.append(start)
+    return matches
+
+
+def make_file(lines: int, rng: random.Random) -> list:
+    out = []
+    while len(out) < lines:
+        n = len(out)
+        out.append(f"def func_{n}(self, value):")
+        out.append(f"    result = value * {rng.randrange(1000)}")
+        out.extend(rng.sample(BOILERPLATE, 3))
+    return out[:lines]
+
+
+def make_patch(file_lines: list, hunks: int, rng: random.Random) -> dict:
+    """Mix of exact, indentation-drifted (floating), ambiguous and missing hunks."""
+    out = []
+    starts = sorted(rng.sample(range(0, len(file_lines) - 4, 8), hunks))
+    for n, start in enumerate(starts):
+        block = file_lines[start:start + 3]
+        kind = rng.random()
+        if kind < 0.05:
+            block = ["", "    return None"]
+        elif kind < 0.08:
+            block = block + ["# not in the file"]
+        elif kind < 0.4:
+            block = ["  " + line if line.strip() else line for line in block]
+        out.append({"search_block": "\n".join(block), "replace_block": f"# hunk {n}\n" + "\n".join(block)})
+    return {"hunks": out}
+
+
+def locate_all(file_lines, patches, locate, index_factory):
+    index = index_factory(file_lines)
+    found = []
+    for patch in patches:
+        for hunk in patch["hunks"]:
+            s_lines = [app.StructuredLine(l) for l in hunk["search_block"].splitlines()]
+            matches = locate(file_lines, s_lines, floating=False, index=index)
+            if not matches:
+                matches = locate(file_lines, s_lines, floating=True, index=index)
+            found.append(matches)
+    return found
+
+
+def run(text: str, patch: dict):
+    try:
+        return "ok", app.apply_patch_text(text, patch)
+    except app.PatchError as e:
+        return "error", str(e)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--hunks", type=int, default=50)
+    parser.add_argument("--patches", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    file_lines = make_file(args.lines, rng)
+    text = "\n".join(file_lines)
+    patches = [make_patch(file_lines, args.hunks, rng) for _ in range(args.patches)]
+    # Single-hunk patches exercise every hunk kind without an early PatchError.
+    patches += [{"hunks": [h]} for h in patches[0]["hunks"]]
+
+    tokenized, _ = app.tokenize_text(text)
+    variants = (
+        ("legacy", legacy_locate_hunk, lambda lines: None),
+        ("indexed", INDEXED_LOCATE, app.LineIndex),
+    )
+    locate_s, apply_s, located, outcomes = {}, {}, {}, {}
+    for label, locate, index_factory in variants:
+        started = time.perf_counter()
+        located[label] = locate_all(tokenized, patches, locate, index_factory)
+        locate_s[label] = time.perf_counter() - started
+
+        app.locate_hunk = locate
+        started = time.perf_counter()
+        outcomes[label] = [run(text, patch) for patch in patches]
+        apply_s[label] = time.perf_counter() - started
+    app.locate_hunk = INDEXED_LOCATE
+
+    if located["legacy"] != located["indexed"] or outcomes["legacy"] != outcomes["indexed"]:
+        print("MISMATCH between legacy and indexed results")
+        return 1
+    hunks = sum(len(p["hunks"]) for p in patches)
+    errors = sum(1 for status, _ in outcomes["indexed"] if status == "error")
+    print(f"{args.lines:,} lines, {len(patches)} patches / {hunks} hunks ({errors} patches rejected), identical results")
+    print(f"{'':8} {'locate':>9} {'apply':>9}")
+    for label, _, _ in variants:
+        print(f"{label:<8} {locate_s[label]:8.2f}s {apply_s[label]:8.2f}s")
+    print(f"speedup  x{locate_s['legacy'] / locate_s['indexed']:<8.0f} x{apply_s['legacy'] / apply_s['indexed']:.1f}")
+    print("(apply includes tokenize_text, which dominates once locating is indexed)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
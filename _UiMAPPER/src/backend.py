@@ -84,6 +84,9 @@ except Exception:  # pragma: no cover
     CrawlConfig = None  # type: ignore
 
 
+DEFAULT_AST_CACHE_DIR = Path(__file__).resolve().parents[1] / ".cache" / "ast"
+
+
 # -------------------------
 # Backend Settings
 # -------------------------
@@ -111,6 +114,12 @@ class BackendSettings:
     write_json: bool = True
     write_jsonl: bool = True
 
+    # Persistent AST cache; defaults to <uimapper>/.cache/ast. ast_disk_cache=False disables the disk tier.
+    ast_disk_cache: bool = True
+    ast_cache_dir: Optional[Path] = None
+    # Worker processes for parsing cache misses (None -> os.cpu_count())
+    ast_parse_workers: Optional[int] = None
+
 
 # -------------------------
 # Backend Orchestrator
@@ -196,6 +205,10 @@ class BackendOrchestrator:
 
             # Apply config updates
             self.py_enum_ms.config.include_pyw = bool(settings.include_pyw)
+            self.ast_cache_ms.cache_dir = (
+                Path(settings.ast_cache_dir or DEFAULT_AST_CACHE_DIR) if settings.ast_disk_cache else None
+            )
+            self.ast_cache_ms.max_workers = settings.ast_parse_workers
             self.hitl_router_ms.policy = settings.hitl_policy
 
             # Ensure crawl service exists (constructed per-run because it needs project_root)
@@ -319,10 +332,10 @@ class BackendOrchestrator:
             # -------------------------
             self._emit_stage("ast", "Parsing ASTs...")
             ast_by_path: Dict[Path, Any] = {}
-            for p in py_files:
-                if cancel():
-                    return self._finish_cancelled()
-                res = self.ast_cache_ms.parse(p)
+            parsed = self.ast_cache_ms.parse_many(py_files, cancel=cancel)
+            if cancel():
+                return self._finish_cancelled()
+            for p, res in parsed.items():
                 if res.ok and res.tree is not None:
                     ast_by_path[p] = res.tree
                     self.state_ms.add_ast_ok(self._session, p)
@@ -338,7 +351,13 @@ class BackendOrchestrator:
                         },
                     )
 
-            self._emit_stage("ast", f"AST parsed. ok={self._session.counters.ast_ok} err={self._session.counters.ast_err}")
+            ast_stats = self.ast_cache_ms.last_stats
+            self._emit_stage(
+                "ast",
+                f"AST parsed. ok={self._session.counters.ast_ok} err={self._session.counters.ast_err} "
+                f"(cached: memory={ast_stats.get('memory_hits', 0)} disk={ast_stats.get('disk_hits', 0)}; "
+                f"parsed={ast_stats.get('parsed', 0)} workers={ast_stats.get('workers', 1)})",
+            )
 
             if cancel():
                 return self._finish_cancelled()
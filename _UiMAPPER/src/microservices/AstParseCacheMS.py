@@ -6,6 +6,9 @@ Parse Python files into AST with caching + stable error reporting.
 Responsibilities:
 - Parse file content to ast.AST
 - Cache by (path, mtime_ns, size) to avoid re-parsing
+- Optional on-disk tier (cache_dir) keyed by the same stat tuple plus the
+  interpreter's cache tag, so unchanged files skip parsing across runs
+- parse_many(): resolve a batch, parsing cache misses across a process pool
 - Provide structured parse results (success or error)
 - Never raise on syntax errors; return them as structured data
 
@@ -18,9 +21,27 @@ Non-goals:
 from __future__ import annotations
 
 import ast
+import gc
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+DISK_FORMAT = 1
+# Below this many misses a pool costs more to start than it saves.
+PARALLEL_PARSE_MIN_FILES = 32
+# Upper bound on files per pool task, so a cancel waits for at most this many
+# files per worker to finish.
+PARALLEL_PARSE_MAX_CHUNK = 8
 
 
 # -------------------------
@@ -49,6 +70,10 @@ class _CacheKey:
     mtime_ns: int
     size: int
 
+    def header(self) -> bytes:
+        """Disk-entry header: the stat tuple plus interpreter tag (AST shapes differ across versions)."""
+        return json.dumps([DISK_FORMAT, sys.implementation.cache_tag, str(self.path), self.mtime_ns, self.size]).encode("utf-8") + b"\n"
+
 
 # -------------------------
 # Service
@@ -57,69 +82,264 @@ class _CacheKey:
 class AstParseCacheMS:
     """
     Usage:
-        cache = AstParseCacheMS()
+        cache = AstParseCacheMS(cache_dir=Path(".cache/ast"))
         res = cache.parse(path)
         if res.ok: use res.tree
         else: log res.error
+
+        results = cache.parse_many(paths)   # {path: AstParseResult}
+
+    Lookup order: memory -> disk (when cache_dir is set) -> parse. The disk
+    tier keeps one entry per source path; a changed stat tuple or another
+    Python version simply misses and overwrites it.
     """
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None, max_workers: Optional[int] = None):
         self._cache: Dict[_CacheKey, AstParseResult] = {}
         self._last_key_by_path: Dict[Path, _CacheKey] = {}
+        self.cache_dir: Optional[Path] = Path(cache_dir) if cache_dir else None
+        self.max_workers = max_workers
+        self.last_stats: Dict[str, int] = {}
 
     def parse(self, path: Path) -> AstParseResult:
         p = Path(path).resolve()
 
-        try:
-            st = p.stat()
-        except Exception as e:
-            err = AstParseError(path=p, message=f"stat_failed: {e}")
-            return AstParseResult(path=p, ok=False, error=err)
-
-        key = _CacheKey(path=p, mtime_ns=st.st_mtime_ns, size=st.st_size)
-
-        # If we previously cached a different version, remove it to keep cache small.
-        prev_key = self._last_key_by_path.get(p)
-        if prev_key is not None and prev_key != key:
-            self._cache.pop(prev_key, None)
-
-        self._last_key_by_path[p] = key
+        key, failure = self._stat_key(p)
+        if key is None:
+            return failure
 
-        cached = self._cache.get(key)
+        cached = self._lookup(key, {})
         if cached is not None:
             return cached
 
         result = self._parse_uncached(p)
-        self._cache[key] = result
+        self._store(key, result)
         return result
 
+    def parse_many(
+        self,
+        paths: Iterable[Path],
+        max_workers: Optional[int] = None,
+        cancel: Optional[Callable[[], bool]] = None,
+    ) -> Dict[Path, AstParseResult]:
+        """
+        Parse a batch. Returns {path_as_given: AstParseResult} in input order.
+        Misses are parsed in a spawn-based process pool when there are enough
+        of them; workers also write the disk entries.
+        cancel() is polled between files (between finished pool results in
+        parallel mode); once it returns True, pending work is dropped and
+        only the paths resolved so far are returned.
+        """
+        return self._parse_many(paths, max_workers, cancel or (lambda: False))
+
+    def _parse_many(
+        self, paths: Iterable[Path], max_workers: Optional[int], cancel: Callable[[], bool]
+    ) -> Dict[Path, AstParseResult]:
+        stats = {"memory_hits": 0, "disk_hits": 0, "parsed": 0, "workers": 1}
+        results: Dict[Path, Optional[AstParseResult]] = {}
+        misses: List[Tuple[Path, _CacheKey]] = []
+        for given in paths:
+            p = Path(given).resolve()
+            key, failure = self._stat_key(p)
+            if key is None:
+                results[given] = failure
+                continue
+            cached = self._lookup(key, stats)
+            if cached is not None:
+                results[given] = cached
+            else:
+                results[given] = None  # placeholder keeps input order
+                misses.append((given, key))
+
+        workers = max_workers or self.max_workers or os.cpu_count() or 1
+        parsed: Dict[_CacheKey, AstParseResult] = {}
+        if workers > 1 and len(misses) >= PARALLEL_PARSE_MIN_FILES and not cancel():
+            try:
+                self._parse_in_pool([key for _, key in misses], workers, cancel, parsed)
+                stats["workers"] = min(workers, len(misses))
+            except (OSError, BrokenProcessPool, RecursionError, pickle.PickleError):
+                # Whatever the pool finished is kept; the rest is parsed in-process below.
+                pass
+        for given, key in misses:
+            result = parsed.get(key)
+            if result is None:
+                if cancel():
+                    break
+                result = self._parse_uncached(key.path)
+                self._store(key, result)
+            else:
+                self._store(key, result, write_disk=False)
+            results[given] = result
+            stats["parsed"] += 1
+        self.last_stats = stats
+        return {given: result for given, result in results.items() if result is not None}
+
     def clear(self) -> None:
+        """Drops the in-memory tier; disk entries stay valid for the next run."""
         self._cache.clear()
         self._last_key_by_path.clear()
 
+    def clear_disk(self) -> None:
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return
+        for entry in self.cache_dir.glob("*.ast"):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
     # -------------------------
     # Internal
     # -------------------------
 
-    def _parse_uncached(self, path: Path) -> AstParseResult:
+    def _stat_key(self, p: Path) -> Tuple[Optional[_CacheKey], Optional[AstParseResult]]:
         try:
-            text = path.read_text(encoding="utf-8", errors="replace")
+            st = p.stat()
         except Exception as e:
-            err = AstParseError(path=path, message=f"read_failed: {e}")
-            return AstParseResult(path=path, ok=False, error=err)
+            err = AstParseError(path=p, message=f"stat_failed: {e}")
+            return None, AstParseResult(path=p, ok=False, error=err)
+        return _CacheKey(path=p, mtime_ns=st.st_mtime_ns, size=st.st_size), None
 
-        try:
-            tree = ast.parse(text, filename=str(path))
-            return AstParseResult(path=path, ok=True, tree=tree)
-        except SyntaxError as e:
-            err = AstParseError(
-                path=path,
-                message=f"syntax_error: {e.msg}",
-                lineno=getattr(e, "lineno", None),
-                col_offset=getattr(e, "offset", None),
-            )
-            return AstParseResult(path=path, ok=False, error=err)
-        except Exception as e:
-            err = AstParseError(path=path, message=f"parse_failed: {e}")
-            return AstParseResult(path=path, ok=False, error=err)
+    def _lookup(self, key: _CacheKey, stats: Dict[str, int]) -> Optional[AstParseResult]:
+        # If we previously cached a different version, remove it to keep cache small.
+        prev_key = self._last_key_by_path.get(key.path)
+        if prev_key is not None and prev_key != key:
+            self._cache.pop(prev_key, None)
+        self._last_key_by_path[key.path] = key
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            stats["memory_hits"] = stats.get("memory_hits", 0) + 1
+            return cached
+        if self.cache_dir is not None:
+            cached = _read_disk_entry(self.cache_dir, key)
+            if cached is not None:
+                self._cache[key] = cached
+                stats["disk_hits"] = stats.get("disk_hits", 0) + 1
+                return cached
+        return None
+
+    def _store(self, key: _CacheKey, result: AstParseResult, write_disk: bool = True) -> None:
+        self._cache[key] = result
+        if write_disk and self.cache_dir is not None:
+            blob = _pickle_result(result)
+            if blob is not None:
+                _write_disk_entry(self.cache_dir, key, blob)
+
+    def _parse_in_pool(
+        self,
+        keys: List[_CacheKey],
+        workers: int,
+        cancel: Callable[[], bool],
+        parsed: Dict[_CacheKey, AstParseResult],
+    ) -> None:
+        """Fills `parsed` as results arrive, so a failing pool keeps what it finished."""
+        cache_dir = str(self.cache_dir) if self.cache_dir is not None else None
+        chunksize = max(1, min(PARALLEL_PARSE_MAX_CHUNK, len(keys) // (workers * 4)))
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(keys)), mp_context=ctx) as pool:
+            blobs = pool.map(_parse_in_worker, keys, [cache_dir] * len(keys), chunksize=chunksize)
+            for key, blob in zip(keys, blobs):
+                if cancel():
+                    # Drop queued chunks; only the ones already running finish.
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
+                if blob is not None:
+                    parsed[key] = pickle.loads(blob)
+
+    def _parse_uncached(self, path: Path) -> AstParseResult:
+        return _parse_file(path)
+
+
+# -------------------------
+# Module-level helpers (importable by spawned pool workers)
+# -------------------------
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Building thousands of ASTs allocates millions of tracked objects, and the
+    cyclic collector rescanning them costs more than the parsing itself. AST
+    trees hold no reference cycles, so pool workers pause it. Only used in
+    worker processes: the caller's process (and its UI thread) keeps its GC.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
 
+
+def _parse_file(path: Path) -> AstParseResult:
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except Exception as e:
+        err = AstParseError(path=path, message=f"read_failed: {e}")
+        return AstParseResult(path=path, ok=False, error=err)
+
+    try:
+        tree = ast.parse(text, filename=str(path))
+        return AstParseResult(path=path, ok=True, tree=tree)
+    except SyntaxError as e:
+        err = AstParseError(
+            path=path,
+            message=f"syntax_error: {e.msg}",
+            lineno=getattr(e, "lineno", None),
+            col_offset=getattr(e, "offset", None),
+        )
+        return AstParseResult(path=path, ok=False, error=err)
+    except Exception as e:
+        err = AstParseError(path=path, message=f"parse_failed: {e}")
+        return AstParseResult(path=path, ok=False, error=err)
+
+
+def _pickle_result(result: AstParseResult) -> Optional[bytes]:
+    """
+    None when the tree cannot be pickled: very deep ASTs (e.g. a long chain of
+    binary operators) exceed the recursion limit. Such files skip the disk tier.
+    """
+    try:
+        return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except (RecursionError, pickle.PicklingError):
+        return None
+
+
+def _parse_in_worker(key: _CacheKey, cache_dir: Optional[str]) -> Optional[bytes]:
+    """Returns None when the result cannot be sent back; the caller then parses in-process."""
+    with _gc_paused():
+        blob = _pickle_result(_parse_file(key.path))
+    if blob is not None and cache_dir is not None:
+        _write_disk_entry(Path(cache_dir), key, blob)
+    return blob
+
+
+def _disk_entry_path(cache_dir: Path, path: Path) -> Path:
+    return cache_dir / (hashlib.sha1(str(path).encode("utf-8")).hexdigest() + ".ast")
+
+
+def _read_disk_entry(cache_dir: Path, key: _CacheKey) -> Optional[AstParseResult]:
+    try:
+        with open(_disk_entry_path(cache_dir, key.path), "rb") as fh:
+            if fh.readline() != key.header():
+                return None
+            return pickle.loads(fh.read())
+    except Exception:
+        return None
+
+
+def _write_disk_entry(cache_dir: Path, key: _CacheKey, blob: bytes) -> None:
+    target = _disk_entry_path(cache_dir, key.path)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as fh:
+            fh.write(key.header())
+            fh.write(blob)
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
@@ -18,6 +18,8 @@ Responsibilities:
     - def name(...)
     - methods: ClassName.method
 - Build intra-file call edges using conservative name/attr call extraction
+- Resolve names through suffix indexes built once per build (dict lookups,
+  not a scan of every symbol per call site)
 - Provide a simple graph model and unknowns list
 
 Non-goals:
@@ -85,14 +87,15 @@ class CallbackGraphBuilderMS:
     ) -> CallbackGraph:
         graph = CallbackGraph()
 
-        # 1) Index functions
+        # 1) Index functions (+ suffix indexes used by every resolution)
         func_index = self._index_functions(ast_by_path)
+        symbols = SymbolSuffixIndex(func_index)
 
         # 2) Add event->handler edges from ui_map
-        self._add_event_edges(ui_map, func_index, graph)
+        self._add_event_edges(ui_map, symbols, graph)
 
         # 3) Add function call edges by scanning bodies
-        self._add_call_edges(ast_by_path, func_index, graph)
+        self._add_call_edges(ast_by_path, symbols, graph)
 
         return graph
 
@@ -127,7 +130,7 @@ class CallbackGraphBuilderMS:
     # UI event edges
     # -------------------------
 
-    def _add_event_edges(self, ui_map: object, func_index: Dict[str, Tuple[Path, ast.AST]], graph: CallbackGraph) -> None:
+    def _add_event_edges(self, ui_map: object, func_index: "SymbolSuffixIndex", graph: CallbackGraph) -> None:
         """
         ui_map.widgets is expected to be a dict-like of widget objects:
             widget.widget_id
@@ -172,7 +175,7 @@ class CallbackGraphBuilderMS:
         *,
         event_key: str,
         handler_expr: str,
-        func_index: Dict[str, Tuple[Path, ast.AST]],
+        func_index: "SymbolSuffixIndex",
     ) -> None:
         ev_node = self._get_node(graph, "event", event_key)
 
@@ -189,7 +192,7 @@ class CallbackGraphBuilderMS:
     def _resolve_handler_expr(
         self,
         handler_expr: str,
-        func_index: Dict[str, Tuple[Path, ast.AST]],
+        func_index: "SymbolSuffixIndex",
     ) -> Optional[str]:
         s = handler_expr.strip()
 
@@ -198,25 +201,22 @@ class CallbackGraphBuilderMS:
 
         # If already looks like module-qualified symbol key, accept.
         if "::" in s:
-            return s if s in func_index else None
+            return s if s in func_index.symbols else None
 
         # Normalize "self.foo" -> try any "::Class.method" and "::foo"
         if s.startswith("self."):
             meth = s.split(".", 1)[1]
             # Try any method match ending with ".meth"
-            candidates = [k for k in func_index.keys() if k.endswith(f".{meth}")]
+            candidates = func_index.after_dot(meth)
             if len(candidates) == 1:
                 return candidates[0]
             if len(candidates) > 1:
                 return None
             # Try free function name
-            candidates = [k for k in func_index.keys() if k.endswith(f"::{meth}")]
-            if len(candidates) == 1:
-                return candidates[0]
-            return None
+            return func_index.unique(func_index.after_colons(meth))
 
         # Bare name: find unique match
-        candidates = [k for k in func_index.keys() if k.endswith(f"::{s}")]
+        candidates = func_index.after_colons(s)
         if len(candidates) == 1:
             return candidates[0]
         if len(candidates) > 1:
@@ -225,9 +225,7 @@ class CallbackGraphBuilderMS:
         # Attribute form "obj.fn"
         if "." in s:
             tail = s.split(".")[-1]
-            candidates = [k for k in func_index.keys() if k.endswith(f"::{tail}") or k.endswith(f".{tail}")]
-            if len(candidates) == 1:
-                return candidates[0]
+            return func_index.unique(func_index.after_colons_or_dot(tail))
 
         return None
 
@@ -235,25 +233,28 @@ class CallbackGraphBuilderMS:
     # Call edges
     # -------------------------
 
-    def _add_call_edges(self, ast_by_path: Dict[Path, ast.AST], func_index: Dict[str, Tuple[Path, ast.AST]], graph: CallbackGraph) -> None:
+    def _add_call_edges(self, ast_by_path: Dict[Path, ast.AST], func_index: "SymbolSuffixIndex", graph: CallbackGraph) -> None:
         """
         Build edges between functions based on ast.Call nodes inside each function body.
         """
-        for sym, (path, node) in func_index.items():
+        resolved: Dict[str, Optional[str]] = {}
+        for sym, (path, node) in func_index.symbols.items():
             fn_calls = _CallCollectorVisitor()
             fn_calls.visit(node)
 
             src = self._get_node(graph, "func", sym)
 
             for called in fn_calls.called_names:
-                dst_sym = self._resolve_called_name(called, func_index)
+                if called not in resolved:
+                    resolved[called] = self._resolve_called_name(called, func_index)
+                dst_sym = resolved[called]
                 if dst_sym is None:
                     # unknown external call; ignore quietly or record
                     continue
                 dst = self._get_node(graph, "func", dst_sym)
                 graph.edges.append(GraphEdge(src=src, dst=dst, kind="calls"))
 
-    def _resolve_called_name(self, called: str, func_index: Dict[str, Tuple[Path, ast.AST]]) -> Optional[str]:
+    def _resolve_called_name(self, called: str, func_index: "SymbolSuffixIndex") -> Optional[str]:
         """
         called may be:
             - foo
@@ -265,25 +266,15 @@ class CallbackGraphBuilderMS:
 
         if s.startswith("self."):
             tail = s.split(".", 1)[1]
-            candidates = [k for k in func_index.keys() if k.endswith(f".{tail}")]
-            if len(candidates) == 1:
-                return candidates[0]
-            return None
+            return func_index.unique(func_index.after_dot(tail))
 
         # bare function name
         if "." not in s:
-            candidates = [k for k in func_index.keys() if k.endswith(f"::{s}")]
-            if len(candidates) == 1:
-                return candidates[0]
-            return None
+            return func_index.unique(func_index.after_colons(s))
 
         # attribute call: mod.foo or obj.foo
         tail = s.split(".")[-1]
-        candidates = [k for k in func_index.keys() if k.endswith(f"::{tail}") or k.endswith(f".{tail}")]
-        if len(candidates) == 1:
-            return candidates[0]
-
-        return None
+        return func_index.unique(func_index.after_colons_or_dot(tail))
 
     # -------------------------
     # Graph helpers
@@ -298,6 +289,52 @@ class CallbackGraphBuilderMS:
         return node
 
 
+# -------------------------
+# Symbol suffix index
+# -------------------------
+
+class SymbolSuffixIndex:
+    """
+    Precomputed answers to "which symbol keys end with '.<t>' / '::<t>'".
+
+    Every key is filed under the text after each '.' and after each '::' it
+    contains, so `key.endswith("." + t)` holds exactly when the key is listed
+    under t in `by_dot` (likewise for '::'). Lookups are dict hits instead of
+    a scan over every symbol.
+    """
+
+    def __init__(self, func_index: Dict[str, Tuple[Path, ast.AST]]):
+        self.symbols = func_index
+        self.by_dot: Dict[str, List[str]] = {}
+        self.by_colons: Dict[str, List[str]] = {}
+        for key in func_index:
+            i = key.find(".")
+            while i != -1:
+                self.by_dot.setdefault(key[i + 1:], []).append(key)
+                i = key.find(".", i + 1)
+            i = key.find("::")
+            while i != -1:
+                self.by_colons.setdefault(key[i + 2:], []).append(key)
+                i = key.find("::", i + 1)
+
+    def after_dot(self, tail: str) -> List[str]:
+        return self.by_dot.get(tail, [])
+
+    def after_colons(self, tail: str) -> List[str]:
+        return self.by_colons.get(tail, [])
+
+    def after_colons_or_dot(self, tail: str) -> List[str]:
+        colons = self.by_colons.get(tail, [])
+        dots = self.by_dot.get(tail, [])
+        if not colons or not dots:
+            return colons or dots
+        return list(dict.fromkeys(colons + dots))
+
+    @staticmethod
+    def unique(candidates: List[str]) -> Optional[str]:
+        return candidates[0] if len(candidates) == 1 else None
+
+
 # -------------------------
 # Visitors
 # -------------------------
@@ -0,0 +1,66 @@
+"""
+bench_ast_parse_cache.py
+Times AstParseCacheMS.parse_many over a source tree: a cold run (every file
+parsed and written to the disk cache), a warm run in a fresh process-like
+instance (served from disk), and the serial vs process-pool cold parse.
+
+Usage:
+    python tools/bench_ast_parse_cache.py
+    python tools/bench_ast_parse_cache.py --root /path/to/project --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.microservices.AstParseCacheMS import AstParseCacheMS  # noqa: E402
+
+
+def timed_run(cache: AstParseCacheMS, files, workers: int):
+    started = time.perf_counter()
+    results = cache.parse_many(files, max_workers=workers)
+    return time.perf_counter() - started, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", type=Path, default=Path(sys.prefix) / "lib", help="tree of .py files to parse")
+    parser.add_argument("--limit", type=int, default=2000, help="parse at most this many files")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    files = sorted(args.root.rglob("*.py"))[: args.limit]
+    print(f"{len(files):,} files under {args.root}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "ast"
+        serial_s, baseline = timed_run(AstParseCacheMS(), files, workers=1)
+        pool_s, pooled = timed_run(AstParseCacheMS(), files, workers=args.workers)
+        cold_s, _ = timed_run(AstParseCacheMS(cache_dir=cache_dir), files, workers=args.workers)
+        warm_cache = AstParseCacheMS(cache_dir=cache_dir)
+        warm_s, warm = timed_run(warm_cache, files, workers=args.workers)
+
+        for path in files:
+            a, b, c = baseline[path], pooled[path], warm[path]
+            if not (a.ok == b.ok == c.ok) or (a.ok and not ast.dump(a.tree) == ast.dump(b.tree) == ast.dump(c.tree)):
+                print(f"MISMATCH {path}")
+                return 1
+
+        print(f"serial parse, no disk   {serial_s:7.2f}s")
+        print(f"pool x{args.workers} parse, no disk {pool_s:7.2f}s  x{serial_s / pool_s:.2f}")
+        print(f"cold run, disk write    {cold_s:7.2f}s")
+        print(f"warm run, disk read     {warm_s:7.2f}s  x{serial_s / warm_s:.2f}  {warm_cache.last_stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+"""
+bench_callback_graph.py
+Times CallbackGraphBuilderMS.build on a synthetic Tkinter-style project and
+checks that the suffix-indexed resolver produces exactly the same graph as
+the original linear-scan resolver.
+
+Usage:
+    python tools/bench_callback_graph.py
+    python tools/bench_callback_graph.py --functions 20000 --legacy-functions 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.microservices.CallbackGraphBuilderMS import CallbackGraphBuilderMS  # noqa: E402
+
+
+class LegacyCallbackGraphBuilder(CallbackGraphBuilderMS):
+    """The pre-index resolvers: one endswith() scan over every symbol per lookup."""
+
+    def _resolve_handler_expr(self, handler_expr, func_index):
+        keys = func_index.symbols.keys()
+        s = handler_expr.strip()
+        if s.startswith("lambda"):
+            return None
+        if "::" in s:
+            return s if s in func_index.symbols else None
+        if s.startswith("self."):
+            meth = s.split(".", 1)[1]
+            candidates = [k for k in keys if k.endswith(f".{meth}")]
+            if len(candidates) == 1:
+                return candidates[0]
+            if len(candidates) > 1:
+                return None
+            candidates = [k for k in keys if k.endswith(f"::{meth}")]
+            return candidates[0] if len(candidates) == 1 else None
+        candidates = [k for k in keys if k.endswith(f"::{s}")]
+        if len(candidates) == 1:
+            return candidates[0]
+        if len(candidates) > 1:
+            return None
+        if "." in s:
+            tail = s.split(".")[-1]
+            candidates = [k for k in keys if k.endswith(f"::{tail}") or k.endswith(f".{tail}")]
+            if len(candidates) == 1:
+                return candidates[0]
+        return None
+
+    def _resolve_called_name(self, called, func_index):
+        keys = func_index.symbols.keys()
+        s = called.strip()
+        if s.startswith("self."):
+            tail = s.split(".", 1)[1]
+            candidates = [k for k in keys if k.endswith(f".{tail}")]
+            return candidates[0] if len(candidates) == 1 else None
+        if "." not in s:
+            candidates = [k for k in keys if k.endswith(f"::{s}")]
+            return candidates[0] if len(candidates) == 1 else None
+        tail = s.split(".")[-1]
+        candidates = [k for k in keys if k.endswith(f"::{tail}") or k.endswith(f".{tail}")]
+        return candidates[0] if len(candidates) == 1 else None
+
+
+def make_project(functions: int, seed: int, per_module: int = 100):
+    rng = random.Random(seed)
+    shared = [f"helper_{i}" for i in range(max(10, functions // 50))]
+    ast_by_path = {}
+    widgets = {}
+    made = 0
+    module = 0
+    while made < functions:
+        lines = ["import tkinter as tk", ""]
+        count = min(per_module, functions - made)
+        methods = [f"on_{module}_{i}" for i in range(count // 2)]
+        lines.append(f"class Panel{module}:")
+        for name in methods:
+            calls = [f"self.{rng.choice(methods)}()", f"{rng.choice(shared)}()", f"tk.{rng.choice(['Button', 'Label'])}()",
+                     f"self.widget.{rng.choice(methods)}()", f"util.{rng.choice(shared)}()"]
+            lines.append(f"    def {name}(self, event=None):")
+            lines.extend(f"        {call}" for call in calls)
+        for i in range(count - len(methods)):
+            name = shared[(module * per_module + i) % len(shared)] if rng.random() < 0.3 else f"func_{module}_{i}"
+            lines.append(f"def {name}():")
+            lines.append(f"    return {rng.choice(shared)}() or {rng.choice(methods)}()")
+        path = Path(f"app/pkg{module // 20}/module_{module}.py")
+        ast_by_path[path] = ast.parse("\n".join(lines) + "\n")
+        for i, name in enumerate(methods[:10]):
+            widgets[f"w{module}_{i}"] = SimpleNamespace(
+                widget_id=f"w{module}_{i}",
+                command_targets=[f"self.{name}"],
+                bind_events=[f"<Button-1> -> {rng.choice(shared)}", "<Key> -> lambda e: None"],
+            )
+        made += count
+        module += 1
+    return ast_by_path, SimpleNamespace(widgets=widgets)
+
+
+def timed_build(builder, ast_by_path, ui_map):
+    started = time.perf_counter()
+    graph = builder.build(ast_by_path, ui_map)
+    return graph, time.perf_counter() - started
+
+
+def signature(graph):
+    return sorted(graph.nodes), [(e.src.key, e.dst.key, e.kind) for e in graph.edges], graph.unknowns
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--functions", type=int, default=20000)
+    parser.add_argument("--legacy-functions", type=int, default=2000, help="the linear resolver is compared at this size")
+    parser.add_argument("--seed", type=int, default=4)
+    args = parser.parse_args()
+
+    for size in sorted({args.legacy_functions, args.functions}):
+        ast_by_path, ui_map = make_project(size, args.seed)
+        graph, indexed_s = timed_build(CallbackGraphBuilderMS(), ast_by_path, ui_map)
+        line = f"{size:>7} functions  indexed {indexed_s:7.2f}s  edges {len(graph.edges):,}"
+        if size <= args.legacy_functions:
+            legacy_graph, legacy_s = timed_build(LegacyCallbackGraphBuilder(), ast_by_path, ui_map)
+            if signature(legacy_graph) != signature(graph):
+                print(f"MISMATCH at {size} functions")
+                return 1
+            line += f"  legacy {legacy_s:7.2f}s  x{legacy_s / indexed_s:.0f}  (identical graph)"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
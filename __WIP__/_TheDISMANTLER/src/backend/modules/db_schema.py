@@ -7,6 +7,20 @@ import os
 
 DB_FILENAME = "_dismantler_context.db"
 
+# FTS5 shadow indexes over chunks.content and chunks.name. Names get their
+# own table so a name search never walks content doclists. The trigram
+# tokenizer keeps the old LIKE '%term%' semantics (case-insensitive
+# substring) but cannot match terms shorter than three characters.
+FTS_TABLE = "chunks_fts"
+FTS_NAME_TABLE = "chunk_names_fts"
+FTS_MIN_TERM = 3
+SNIPPET_OPEN = "«"
+SNIPPET_CLOSE = "»"
+SNIPPET_TOKENS = 64  # trigram tokens are ~characters; 64 is the FTS5 maximum
+# BM25-ranking every hit of a very common term costs more than the LIKE scan
+# it replaces; above this many hits (or 10% of the chunks) searches scan.
+FTS_MAX_RANKED = 20000
+
 
 def get_db_path(project_root=None):
     """Resolve the database file path relative to the project root."""
@@ -37,6 +51,9 @@ def init_db(db_path=None):
                         call targets, raises, ref counts) for Scout triage
         context_log   – query history for the sliding window
         file_manifest – compact structural manifest per file (Surgeon-Agent)
+        chunks_fts, chunk_names_fts
+                      – FTS5 indexes over chunk content / names, kept in
+                        sync by triggers (skipped if SQLite lacks trigram)
     """
     conn = get_connection(db_path)
     cur = conn.cursor()
@@ -96,6 +113,96 @@ def init_db(db_path=None):
         CREATE INDEX IF NOT EXISTS idx_chunks_lines ON chunks(file_id, start_line, end_line);
         CREATE INDEX IF NOT EXISTS idx_manifest_file ON file_manifest(file_id);
     """)
+    _init_fts(cur)
 
     conn.commit()
     conn.close()
+
+
+def _init_fts(cur):
+    """
+    Create the external-content FTS5 indexes and the triggers that keep them
+    in sync with chunks. An existing database gets them built once from the
+    chunks table.
+    """
+    missing = [
+        t for t in (FTS_TABLE, FTS_NAME_TABLE)
+        if not cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (t,)
+        ).fetchone()
+    ]
+    try:
+        cur.executescript(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                content, content='chunks', content_rowid='chunk_id', tokenize='trigram'
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_NAME_TABLE} USING fts5(
+                name, content='chunks', content_rowid='chunk_id', tokenize='trigram'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_ai AFTER INSERT ON chunks BEGIN
+                INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.chunk_id, new.content);
+                INSERT INTO {FTS_NAME_TABLE}(rowid, name) VALUES (new.chunk_id, new.name);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_ad AFTER DELETE ON chunks BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content)
+                VALUES ('delete', old.chunk_id, old.content);
+                INSERT INTO {FTS_NAME_TABLE}({FTS_NAME_TABLE}, rowid, name)
+                VALUES ('delete', old.chunk_id, old.name);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_au AFTER UPDATE OF name, content ON chunks BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content)
+                VALUES ('delete', old.chunk_id, old.content);
+                INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.chunk_id, new.content);
+                INSERT INTO {FTS_NAME_TABLE}({FTS_NAME_TABLE}, rowid, name)
+                VALUES ('delete', old.chunk_id, old.name);
+                INSERT INTO {FTS_NAME_TABLE}(rowid, name) VALUES (new.chunk_id, new.name);
+            END;
+        """)
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5 or older than 3.34 (no trigram): searches fall back to LIKE
+        return
+    for table in missing:
+        cur.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
+def has_fts(conn, table=FTS_TABLE):
+    """True if the given FTS index exists in this database."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+    ).fetchone() is not None
+
+
+def fts_phrase(term):
+    """
+    Build an FTS5 MATCH expression that finds `term` as a literal substring.
+    Returns None when the trigram index cannot answer it (term shorter than
+    FTS_MIN_TERM, or a LIKE wildcard '%' that callers still expect to work),
+    so the caller should use LIKE.
+    """
+    if len(term) < FTS_MIN_TERM or "%" in term:
+        return None
+    return '"' + term.replace('"', '""') + '"'
+
+
+def fts_match(conn, term, table=FTS_TABLE):
+    """
+    MATCH expression for an FTS5 search of `term` in `table`, or None when a
+    LIKE scan is the better plan: no index, a term the index cannot answer,
+    or a term so common that ranking all its hits is slower than scanning.
+    The commonness probe stops counting at the cap, so it stays cheap.
+    """
+    if not has_fts(conn, table):
+        return None
+    match = fts_phrase(term)
+    if match is None:
+        return None
+    rows = conn.execute("SELECT MAX(chunk_id) FROM chunks").fetchone()[0] or 0
+    cap = min(FTS_MAX_RANKED, max(1000, rows // 10))
+    hits = conn.execute(
+        f"SELECT COUNT(*) FROM (SELECT rowid FROM {table} WHERE {table} MATCH ? LIMIT ?)",
+        (match, cap),
+    ).fetchone()[0]
+    return None if hits >= cap else match
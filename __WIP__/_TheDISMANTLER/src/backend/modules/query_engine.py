@@ -3,7 +3,10 @@ QueryEngine – Safe SQL query interface for the Dismantler's SQLite store.
 Acts as the boundary between the BackendEngine and db_schema.py.
 No UI dependencies. All errors returned as structured dicts.
 """
-from backend.modules.db_schema import get_connection
+from backend.modules.db_schema import (
+    FTS_NAME_TABLE, FTS_TABLE, SNIPPET_CLOSE, SNIPPET_OPEN, SNIPPET_TOKENS, fts_match,
+    get_connection,
+)
 
 
 class QueryEngine:
@@ -104,39 +107,95 @@ class QueryEngine:
     # ── search queries ──────────────────────────────────────
 
     def search_content(self, query, limit=20):
-        """LIKE-based content search across all chunks."""
+        """
+        Substring search across chunk content, best matches first.
+        Served by the FTS5 index (BM25 rank, highlighted snippet); terms the
+        index cannot answer, or that hit a large share of all chunks, fall
+        back to the LIKE scan ordered by token_est (rank/snippet are None).
+        """
         conn = get_connection(self.db_path)
-        rows = conn.execute(
-            """
-            SELECT c.chunk_id, c.name, c.chunk_type, c.start_line, c.end_line,
-                   c.content, c.token_est,
-                   sf.path, sf.name AS file_name
-            FROM chunks c
-            JOIN source_files sf ON c.file_id = sf.file_id
-            WHERE c.content LIKE ?
-            ORDER BY c.token_est ASC
-            LIMIT ?
-            """,
-            (f"%{query}%", limit),
-        ).fetchall()
+        match = fts_match(conn, query, FTS_TABLE)
+        if match is None:
+            rows = conn.execute(
+                """
+                SELECT c.chunk_id, c.name, c.chunk_type, c.start_line, c.end_line,
+                       c.content, c.token_est,
+                       sf.path, sf.name AS file_name,
+                       NULL AS rank, NULL AS snippet
+                FROM chunks c
+                JOIN source_files sf ON c.file_id = sf.file_id
+                WHERE c.content LIKE ?
+                ORDER BY c.token_est ASC
+                LIMIT ?
+                """,
+                (f"%{query}%", limit),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f"""
+                SELECT c.chunk_id, c.name, c.chunk_type, c.start_line, c.end_line,
+                       c.content, c.token_est,
+                       sf.path, sf.name AS file_name,
+                       m.rank, m.snippet
+                FROM (
+                    SELECT rowid, rank,
+                           snippet({FTS_TABLE}, 0, ?, ?, '…', {SNIPPET_TOKENS}) AS snippet
+                    FROM {FTS_TABLE}
+                    WHERE {FTS_TABLE} MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                ) m
+                JOIN chunks c ON c.chunk_id = m.rowid
+                JOIN source_files sf ON c.file_id = sf.file_id
+                ORDER BY m.rank, c.token_est
+                """,
+                (SNIPPET_OPEN, SNIPPET_CLOSE, match, limit),
+            ).fetchall()
         conn.close()
         return [dict(r) for r in rows]
 
     def search_by_name(self, name, limit=20):
-        """Search chunks by their definition name."""
+        """
+        Search chunks by their definition name, best matches first.
+        Uses the FTS5 name index when possible, the LIKE scan ordered by
+        name otherwise.
+        """
         conn = get_connection(self.db_path)
-        rows = conn.execute(
-            """
-            SELECT c.chunk_id, c.name, c.chunk_type, c.start_line, c.end_line,
-                   c.token_est, sf.path, sf.name AS file_name
-            FROM chunks c
-            JOIN source_files sf ON c.file_id = sf.file_id
-            WHERE c.name LIKE ?
-            ORDER BY c.name
-            LIMIT ?
-            """,
-            (f"%{name}%", limit),
-        ).fetchall()
+        match = fts_match(conn, name, FTS_NAME_TABLE)
+        if match is None:
+            rows = conn.execute(
+                """
+                SELECT c.chunk_id, c.name, c.chunk_type, c.start_line, c.end_line,
+                       c.token_est, sf.path, sf.name AS file_name,
+                       NULL AS rank, NULL AS snippet
+                FROM chunks c
+                JOIN source_files sf ON c.file_id = sf.file_id
+                WHERE c.name LIKE ?
+                ORDER BY c.name
+                LIMIT ?
+                """,
+                (f"%{name}%", limit),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f"""
+                SELECT c.chunk_id, c.name, c.chunk_type, c.start_line, c.end_line,
+                       c.token_est, sf.path, sf.name AS file_name,
+                       m.rank, m.snippet
+                FROM (
+                    SELECT rowid, rank,
+                           highlight({FTS_NAME_TABLE}, 0, ?, ?) AS snippet
+                    FROM {FTS_NAME_TABLE}
+                    WHERE {FTS_NAME_TABLE} MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                ) m
+                JOIN chunks c ON c.chunk_id = m.rowid
+                JOIN source_files sf ON c.file_id = sf.file_id
+                ORDER BY m.rank, c.name
+                """,
+                (SNIPPET_OPEN, SNIPPET_CLOSE, match, limit),
+            ).fetchall()
         conn.close()
         return [dict(r) for r in rows]
 
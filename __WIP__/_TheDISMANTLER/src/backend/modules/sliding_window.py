@@ -8,7 +8,9 @@ Extended with Surgeon-Agent capabilities:
   - get_context_for_query          — intent-driven chunk selection via ContextSelector
 """
 import hashlib
-from backend.modules.db_schema import get_connection, init_db
+from backend.modules.db_schema import (
+    FTS_TABLE, SNIPPET_CLOSE, SNIPPET_OPEN, SNIPPET_TOKENS, fts_match, get_connection, init_db,
+)
 from backend.modules.context_selector import ContextSelector, DEFAULT_BUDGET as _QUERY_BUDGET
 
 
@@ -323,19 +325,44 @@ class SlidingWindow:
         conn.close()
 
     def search_chunks(self, query, limit=10):
-        """Simple LIKE-based chunk search across all files."""
+        """
+        Chunk content search across all files, best matches first.
+        Uses the FTS5 index (BM25 rank plus a highlighted `snippet`) and
+        falls back to the LIKE scan for short or very common terms.
+        """
         conn = get_connection(self.db_path)
         cur = conn.cursor()
-        rows = cur.execute(
-            """
-            SELECT c.*, sf.path, sf.name as file_name
-            FROM chunks c
-            JOIN source_files sf ON c.file_id = sf.file_id
-            WHERE c.content LIKE ?
-            ORDER BY c.token_est ASC
-            LIMIT ?
-            """,
-            (f"%{query}%", limit),
-        ).fetchall()
+        match = fts_match(conn, query, FTS_TABLE)
+        if match is None:
+            rows = cur.execute(
+                """
+                SELECT c.*, sf.path, sf.name as file_name,
+                       NULL AS rank, NULL AS snippet
+                FROM chunks c
+                JOIN source_files sf ON c.file_id = sf.file_id
+                WHERE c.content LIKE ?
+                ORDER BY c.token_est ASC
+                LIMIT ?
+                """,
+                (f"%{query}%", limit),
+            ).fetchall()
+        else:
+            rows = cur.execute(
+                f"""
+                SELECT c.*, sf.path, sf.name as file_name, m.rank, m.snippet
+                FROM (
+                    SELECT rowid, rank,
+                           snippet({FTS_TABLE}, 0, ?, ?, '…', {SNIPPET_TOKENS}) AS snippet
+                    FROM {FTS_TABLE}
+                    WHERE {FTS_TABLE} MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                ) m
+                JOIN chunks c ON c.chunk_id = m.rowid
+                JOIN source_files sf ON c.file_id = sf.file_id
+                ORDER BY m.rank, c.token_est
+                """,
+                (SNIPPET_OPEN, SNIPPET_CLOSE, match, limit),
+            ).fetchall()
         conn.close()
         return [dict(r) for r in rows]
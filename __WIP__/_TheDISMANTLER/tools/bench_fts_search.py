@@ -0,0 +1,135 @@
+"""
+bench_fts_search.py
+Builds a synthetic chunk store through the normal schema (so the FTS5 index
+is filled by its triggers) and times chunk search with the previous
+LIKE '%term%' scan against the FTS5 path in QueryEngine.search_content,
+QueryEngine.search_by_name and SlidingWindow.search_chunks. Rare, medium and
+common terms are timed, and the FTS and LIKE result sets are checked to be
+equal.
+
+Usage:
+    python tools/bench_fts_search.py
+    python tools/bench_fts_search.py --chunks 500000 --repeat 5 --db /tmp/bench.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from backend.modules.db_schema import get_connection, init_db  # noqa: E402
+from backend.modules.query_engine import QueryEngine  # noqa: E402
+from backend.modules.sliding_window import SlidingWindow  # noqa: E402
+
+VOCAB = ["self", "return", "def", "class", "import", "value", "result", "config", "path", "items",
+         "index", "data", "None", "True", "False", "for", "in", "if", "else", "raise", "print"]
+TERMS = {"rare": "render_viewport_cache", "medium": "load_settings", "common": "return"}
+RARE_EVERY, MEDIUM_EVERY = 20000, 100
+
+
+def build_store(db_path: str, chunks: int, per_file: int = 50, seed: int = 5) -> None:
+    rng = random.Random(seed)
+    init_db(db_path)
+    conn = get_connection(db_path)
+    for f in range(chunks // per_file):
+        cur = conn.execute(
+            "INSERT INTO source_files (path, name, language, content_hash) VALUES (?, ?, 'python', 'x')",
+            (f"/proj/pkg{f // 100}/mod{f}.py", f"mod{f}.py"),
+        )
+        rows = []
+        for i in range(per_file):
+            n = f * per_file + i
+            words = [rng.choice(VOCAB) for _ in range(rng.randint(20, 120))]
+            if n % RARE_EVERY == 0:
+                words.insert(len(words) // 2, TERMS["rare"] + "()")
+            if n % MEDIUM_EVERY == 0:
+                words.insert(3, TERMS["medium"] + "(path)")
+            name = TERMS["medium"] if n % MEDIUM_EVERY == 0 else f"func_{n}"
+            content = f"def {name}(self):\n    " + " ".join(words)
+            rows.append((cur.lastrowid, "function", name, i * 20 + 1, i * 20 + 19, content, len(content) // 4))
+        conn.executemany(
+            "INSERT INTO chunks (file_id, chunk_type, name, start_line, end_line, content, token_est) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        if f % 200 == 0:
+            conn.commit()
+    conn.commit()
+    conn.close()
+
+
+def like_search(db_path: str, column: str, term: str, limit: int) -> list[int]:
+    """The previous query: LIKE scan over every chunk."""
+    conn = get_connection(db_path)
+    order = "c.name" if column == "name" else "c.token_est ASC"
+    rows = conn.execute(
+        f"""
+        SELECT c.chunk_id FROM chunks c JOIN source_files sf ON c.file_id = sf.file_id
+        WHERE c.{column} LIKE ? ORDER BY {order} LIMIT ?
+        """,
+        (f"%{term}%", limit),
+    ).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+
+def median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--db", help="reuse/keep this database instead of a temporary one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "bench_context.db")
+        if not os.path.exists(db_path):
+            started = time.perf_counter()
+            build_store(db_path, args.chunks)
+            print(f"built {args.chunks:,} chunks in {time.perf_counter() - started:.1f}s, "
+                  f"{os.path.getsize(db_path) / 1e6:.0f} MB")
+        qe, sw = QueryEngine(db_path), SlidingWindow(db_path)
+
+        print(f"{'query':<32} {'LIKE ms':>9} {'FTS5 ms':>9} {'speedup':>8}")
+        for kind, term in TERMS.items():
+            cases = [
+                ("search_content", "content", lambda t=term: qe.search_content(t, args.limit)),
+                ("search_chunks", "content", lambda t=term: sw.search_chunks(t, args.limit)),
+                ("search_by_name", "name", lambda t=term: qe.search_by_name(t, args.limit)),
+            ]
+            for label, column, fts_fn in cases:
+                like_ms = median_ms(lambda: like_search(db_path, column, term, args.limit), args.repeat)
+                fts_ms = median_ms(fts_fn, args.repeat)
+                print(f"{label + ' ' + kind:<32} {like_ms:9.1f} {fts_ms:9.1f} {like_ms / fts_ms:7.1f}x")
+
+        for column, search in (("content", qe.search_content), ("name", qe.search_by_name)):
+            for term in (TERMS["rare"], TERMS["medium"]):
+                everything = 10 ** 9
+                if set(like_search(db_path, column, term, everything)) != {r["chunk_id"] for r in search(term, everything)}:
+                    print(f"MISMATCH: {column} results for {term!r}")
+                    return 1
+        print("FTS5 and LIKE return the same chunks for the rare and medium terms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())